@@ -46,6 +46,7 @@ expectation values of diagonal operators from counts.
    :toctree: ../stubs/
 
    expectation_value
+   expectation_values
    expval_meas_mitigator_circuits
    ExpvalMeasMitigatorFitter
    CTMPExpvalMeasMitigator
@@ -58,6 +59,7 @@ from .measurement import (complete_meas_cal, tensored_meas_cal,
                           CompleteMeasFitter, TensoredMeasFitter)
 
 from .expval import (expectation_value,
+                     expectation_values,
                      expval_meas_mitigator_circuits,
                      ExpvalMeasMitigatorFitter,
                      CompleteExpvalMeasMitigator,
@@ -15,7 +15,7 @@
 Expectation value measurement error mitigation module
 """
 
-from .utils import expectation_value
+from .utils import expectation_value, expectation_values
 from .circuits import expval_meas_mitigator_circuits
 from .fitter import ExpvalMeasMitigatorFitter
 from .complete_mitigator import CompleteExpvalMeasMitigator
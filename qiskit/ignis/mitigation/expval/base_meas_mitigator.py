@@ -16,8 +16,11 @@ Full A-matrix measurement migitation generator.
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Tuple, Union
+from collections import OrderedDict, namedtuple
+from hashlib import sha1
+from typing import Optional, List, Dict, Tuple, Union, Callable, Hashable
 import numpy as np
+import scipy.sparse as sps
 
 try:
     import matplotlib.pyplot as plt
@@ -26,9 +29,58 @@ except ImportError:
     _HAS_MATPLOTLIB = False
 
 
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize',
+                                     'maxbytes', 'currbytes'])
+
+
 class BaseExpvalMeasMitigator(ABC):
     """Base measurement error mitigator class."""
 
+    def __init__(self,
+                 cache_maxsize: Optional[int] = 256,
+                 cache_maxbytes: Optional[int] = 2**30):
+        """Initialize the mitigator matrix cache.
+
+        Args:
+            cache_maxsize: Optional, the maximum number of cached matrices.
+                           If ``None`` the number of entries is unbounded.
+            cache_maxbytes: Optional, the memory budget in bytes for cached
+                            matrices. If ``None`` the memory is unbounded.
+        """
+        self._cache = _MatrixCache(maxsize=cache_maxsize, maxbytes=cache_maxbytes)
+
+    def cache_info(self) -> CacheInfo:
+        """Return statistics for the mitigator matrix cache.
+
+        The cache stores the reduced assignment and mitigation matrices,
+        mitigated diagonals and noise strengths computed for each qubit
+        subset. Least recently used entries are evicted when either the
+        number of entries or their total size in bytes exceeds the cache
+        limits.
+
+        Returns:
+            CacheInfo: a named tuple of the cache ``hits``, ``misses``,
+            ``maxsize``, ``currsize``, ``maxbytes`` and ``currbytes``.
+        """
+        return self._cache.info()
+
+    def clear_cache(self):
+        """Clear the mitigator matrix cache and reset its statistics."""
+        self._cache.clear()
+
+    def set_cache_limits(self,
+                         maxsize: Optional[int] = 256,
+                         maxbytes: Optional[int] = 2**30):
+        """Set the size limits of the mitigator matrix cache.
+
+        Args:
+            maxsize: Optional, the maximum number of cached matrices.
+                     If ``None`` the number of entries is unbounded.
+            maxbytes: Optional, the memory budget in bytes for cached
+                      matrices. If ``None`` the memory is unbounded.
+        """
+        self._cache.set_limits(maxsize=maxsize, maxbytes=maxbytes)
+
     @abstractmethod
     def expectation_value(self,
                           counts: Dict,
@@ -46,7 +98,9 @@ class BaseExpvalMeasMitigator(ABC):
         Args:
             counts: counts object
             diagonal: Optional, the vector of diagonal values for summing the
-                      expectation value. If ``None`` the the default value is
+                      expectation value, or a string label of the diagonal
+                      (see :func:`~qiskit.ignis.mitigation.expectation_value`).
+                      If ``None`` the the default value is
                       :math:`[1, -1]^\otimes n`.
             qubits: Optional, the measured physical qubits the count
                     bitstrings correspond to. If None qubits are assumed to be
@@ -68,6 +122,76 @@ class BaseExpvalMeasMitigator(ABC):
             ``circuit.measure(qubits, clbits)``.
         """
 
+    def expectation_values(self,
+                           counts: Dict,
+                           diagonals: Optional[List[np.ndarray]] = None,
+                           qubits: Optional[List[int]] = None,
+                           clbits: Optional[List[int]] = None,
+                           ) -> Tuple[np.ndarray, np.ndarray]:
+        r"""Compute mitigated expectation values of several diagonal observables.
+
+        This is the batched version of :meth:`expectation_value` for
+        evaluating many diagonal observables on the same counts.
+
+        Args:
+            counts: counts object
+            diagonals: Optional, a list of diagonal value vectors, one for
+                       each observable. If ``None`` a single observable with
+                       the default value :math:`[1, -1]^\otimes n` is used.
+            qubits: Optional, the measured physical qubits the count
+                    bitstrings correspond to. If None qubits are assumed to be
+                    :math:`[0, ..., n-1]`.
+            clbits: Optional, if not None marginalize counts to the specified bits.
+
+        Returns:
+            (np.ndarray, np.ndarray): the arrays of expectation values and
+            standard deviations for each diagonal.
+        """
+        if diagonals is None:
+            diagonals = [None]
+        expvals = []
+        stddevs = []
+        for diagonal in diagonals:
+            expval, stddev = self.expectation_value(
+                counts, diagonal=diagonal, qubits=qubits, clbits=clbits)
+            expvals.append(expval)
+            stddevs.append(stddev)
+        return np.array(expvals), np.array(stddevs)
+
+    def batch_expectation_values(self,
+                                 counts_list: List[Dict],
+                                 diagonals: Optional[List[np.ndarray]] = None,
+                                 qubits: Optional[List[int]] = None,
+                                 clbits: Optional[List[int]] = None,
+                                 ) -> Tuple[np.ndarray, np.ndarray]:
+        r"""Compute mitigated expectation values for a list of counts.
+
+        Each counts object is evaluated with :meth:`expectation_values` using
+        the same mitigation matrices for all counts.
+
+        Args:
+            counts_list: list of counts objects.
+            diagonals: Optional, a list of diagonal value vectors, one for
+                       each observable. If ``None`` a single observable with
+                       the default value :math:`[1, -1]^\otimes n` is used.
+            qubits: Optional, the measured physical qubits the count
+                    bitstrings correspond to. If None qubits are assumed to be
+                    :math:`[0, ..., n-1]`.
+            clbits: Optional, if not None marginalize counts to the specified bits.
+
+        Returns:
+            (np.ndarray, np.ndarray): the expectation values and standard
+            deviations as arrays of shape ``(len(counts_list), len(diagonals))``.
+        """
+        expvals = []
+        stddevs = []
+        for counts in counts_list:
+            expval, stddev = self.expectation_values(
+                counts, diagonals=diagonals, qubits=qubits, clbits=clbits)
+            expvals.append(expval)
+            stddevs.append(stddev)
+        return np.array(expvals), np.array(stddevs)
+
     @abstractmethod
     def mitigation_matrix(self, qubits: List[int] = None) -> np.ndarray:
         r"""Return the measurement mitigation matrix for the specified qubits.
@@ -269,3 +393,99 @@ class BaseExpvalMeasMitigator(ABC):
         ax.xaxis.set_label_position('top')
         ax.set_ylabel('Measured State')
         return ax
+
+
+class _MatrixCache:
+    """Bounded least recently used cache for mitigator matrices."""
+
+    def __init__(self,
+                 maxsize: Optional[int] = None,
+                 maxbytes: Optional[int] = None):
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._maxsize = maxsize
+        self._maxbytes = maxbytes
+        self._currbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, func: Optional[Callable] = None):
+        """Return a cached value, computing and caching it with func on a miss."""
+        if key in self._data:
+            self._hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+        self._misses += 1
+        if func is None:
+            return None
+        value = func()
+        self.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: any):
+        """Add or replace a cached value and evict entries over the limits."""
+        self.pop(key)
+        nbytes = self.nbytes(value)
+        if self._maxbytes is not None and nbytes > self._maxbytes:
+            # Values larger than the memory budget are never cached
+            return
+        self._data[key] = value
+        self._sizes[key] = nbytes
+        self._currbytes += nbytes
+        self._evict()
+
+    def pop(self, key: Hashable):
+        """Remove a cached value if present."""
+        if key in self._data:
+            del self._data[key]
+            self._currbytes -= self._sizes.pop(key)
+
+    def clear(self):
+        """Clear all cached values and statistics."""
+        self._data.clear()
+        self._sizes.clear()
+        self._currbytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def set_limits(self,
+                   maxsize: Optional[int] = None,
+                   maxbytes: Optional[int] = None):
+        """Set the cache limits and evict entries over the new limits."""
+        self._maxsize = maxsize
+        self._maxbytes = maxbytes
+        self._evict()
+
+    def info(self) -> CacheInfo:
+        """Return the cache statistics."""
+        return CacheInfo(self._hits, self._misses, self._maxsize,
+                         len(self._data), self._maxbytes, self._currbytes)
+
+    def _evict(self):
+        """Evict least recently used entries until within the limits."""
+        while self._data and (
+                (self._maxsize is not None and len(self._data) > self._maxsize) or
+                (self._maxbytes is not None and self._currbytes > self._maxbytes)):
+            key, _ = self._data.popitem(last=False)
+            self._currbytes -= self._sizes.pop(key)
+
+    @staticmethod
+    def nbytes(value: any) -> int:
+        """Return the approximate memory size of a cached value."""
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if sps.issparse(value):
+            value = value.tocsc(copy=False)
+            return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+        if isinstance(value, (tuple, list)):
+            return sum(_MatrixCache.nbytes(val) for val in value)
+        return 8
+
+    @staticmethod
+    def array_key(array: np.ndarray) -> Tuple:
+        """Return a hashable key for the contents of an array."""
+        array = np.ascontiguousarray(array)
+        return (array.shape, array.dtype.str, sha1(array.tobytes()).hexdigest())
@@ -15,9 +15,12 @@
 Expectation value measurement error migitation generator.
 """
 
-from typing import Optional, Tuple, List, Dict
+from itertools import islice
+from typing import Optional, Tuple, List, Dict, Iterator, Iterable
 
+import numpy as np
 from qiskit import QuantumCircuit
+from qiskit.circuit import ParameterVector
 from qiskit.exceptions import QiskitError
 
 
@@ -119,7 +122,15 @@ def expval_meas_mitigator_circuits(num_qubits: int,
 
 
 class ExpvalMeasMitigatorCircuits:
-    """Expecation value measurement error mitigator calibration circuits."""
+    """Expecation value measurement error mitigator calibration circuits.
+
+    Calibration circuits are only constructed when requested. The
+    :meth:`generate_circuits` method returns all circuits at once, while
+    :meth:`iter_circuits` yields them in chunks that can be executed one
+    job at a time. Alternatively a single parameterized
+    :meth:`template_circuit` can be executed with the parameter bindings
+    from :meth:`iter_parameter_binds`.
+    """
 
     # pylint: disable=arguments-differ
     def __init__(self,
@@ -134,19 +145,25 @@ class ExpvalMeasMitigatorCircuits:
             labels: custom labels to run for calibration.
         """
         self._num_qubits = num_qubits
-        self._circuits = []
-        self._metadata = []
+        self._method = method
+        self._labels = labels
         if labels is None:
-            labels = self._method_labels(method)
-        for label in labels:
-            self._metadata.append({
-                'experiment': 'meas_mit',
-                'cal': label,
-                'method': method,
-            })
-            self._circuits.append(self._calibration_circuit(num_qubits, label))
-
-    def _method_labels(self, method):
+            # Check method is valid
+            self._method_labels(method)
+        self._template = None
+
+    @property
+    def num_circuits(self) -> int:
+        """Return the number of calibration circuits."""
+        if self._labels is not None:
+            return len(self._labels)
+        if self._method == 'complete':
+            return 2 ** self._num_qubits
+        if self._method == 'tensored':
+            return 2
+        return self._num_qubits + 2
+
+    def _method_labels(self, method: str) -> Iterable[str]:
         """Generate labels for initializing via a standard method."""
 
         if method == 'tensored':
@@ -160,15 +177,26 @@ class ExpvalMeasMitigatorCircuits:
             return labels
 
         if method == 'complete':
-            labels = []
-            for i in range(2**self._num_qubits):
-                bits = bin(i)[2:]
-                label = (self._num_qubits - len(bits)) * '0' + bits
-                labels.append(label)
-            return labels
+            # Lazily generate the 2^n labels
+            fmt = '0{}b'.format(self._num_qubits)
+            return (format(i, fmt) for i in range(2**self._num_qubits))
 
         raise QiskitError("Unrecognized method {}".format(method))
 
+    def _iter_labels(self) -> Iterator[str]:
+        """Return an iterator over the calibration labels."""
+        if self._labels is not None:
+            return iter(self._labels)
+        return iter(self._method_labels(self._method))
+
+    def _label_metadata(self, label: str) -> Dict[str, any]:
+        """Return the fitter metadata for a calibration label."""
+        return {
+            'experiment': 'meas_mit',
+            'cal': label,
+            'method': self._method,
+        }
+
     def generate_circuits(self) -> Tuple[List[QuantumCircuit], List[dict]]:
         """Return experiment payload data.
 ​
@@ -178,7 +206,93 @@ class ExpvalMeasMitigatorCircuits:
         Returns:
             tuple: circuits, metadata
         """
-        return self._circuits, self._metadata
+        circuits = []
+        metadata = []
+        for chunk_circuits, chunk_metadata in self.iter_circuits():
+            circuits += chunk_circuits
+            metadata += chunk_metadata
+        return circuits, metadata
+
+    def iter_circuits(self, max_experiments: Optional[int] = None) -> Iterator[
+            Tuple[List[QuantumCircuit], List[Dict[str, any]]]]:
+        """Return an iterator over chunks of calibration circuits and metadata.
+
+        Only a single chunk of circuits is constructed at a time. Each chunk
+        can be executed as a separate job and the results added to a fitter
+        using :meth:`~qiskit.ignis.mitigation.ExpvalMeasMitigatorFitter.add_data`.
+
+        Args:
+            max_experiments: Optional, the maximum number of circuits in each
+                             chunk, for example the ``max_experiments`` value
+                             of a backend configuration. If None all circuits
+                             are returned in a single chunk.
+
+        Yields:
+            tuple: (circuits, metadata) for each chunk of calibration circuits.
+        """
+        for labels in self._iter_label_chunks(max_experiments):
+            yield ([self._calibration_circuit(self._num_qubits, label) for label in labels],
+                   [self._label_metadata(label) for label in labels])
+
+    def template_circuit(self) -> QuantumCircuit:
+        """Return a parameterized calibration circuit.
+
+        The template circuit consists of an RX gate with a parameter
+        :math:`\\theta_i` on each qubit followed by measurements of all
+        qubits. Binding the parameters returned by :meth:`iter_parameter_binds`
+        prepares each of the calibration basis states.
+
+        Returns:
+            QuantumCircuit: the parameterized calibration circuit.
+        """
+        if self._template is None:
+            params = ParameterVector('cal', self._num_qubits)
+            circ = QuantumCircuit(self._num_qubits, name='meas_mit_cal')
+            for i, param in enumerate(params):
+                circ.rx(param, i)
+            circ.measure_all()
+            self._template = (circ, params)
+        return self._template[0]
+
+    def iter_parameter_binds(self, max_experiments: Optional[int] = None) -> Iterator[
+            Tuple[List[Dict], List[Dict[str, any]]]]:
+        """Return an iterator over chunks of template parameter bindings and metadata.
+
+        Each chunk of parameter bindings can be passed as the
+        ``parameter_binds`` kwarg of :func:`qiskit.compiler.assemble` with the
+        :meth:`template_circuit` to assemble the calibration circuits of that
+        chunk, or the bindings can be applied using
+        :meth:`~qiskit.circuit.QuantumCircuit.bind_parameters`.
+
+        Args:
+            max_experiments: Optional, the maximum number of bindings in each
+                             chunk. If None all bindings are returned in a
+                             single chunk.
+
+        Yields:
+            tuple: (parameter_binds, metadata) for each chunk of calibration
+            circuits.
+        """
+        self.template_circuit()
+        params = self._template[1]
+        for labels in self._iter_label_chunks(max_experiments):
+            binds = []
+            for label in labels:
+                angles = np.pi * (np.array(list(reversed(label))) == '1')
+                binds.append(dict(zip(params, angles.tolist())))
+            yield binds, [self._label_metadata(label) for label in labels]
+
+    def _iter_label_chunks(self, max_experiments: Optional[int] = None) -> Iterator[
+            List[str]]:
+        """Return an iterator over chunks of calibration labels."""
+        if max_experiments is not None and max_experiments < 1:
+            raise QiskitError("max_experiments must be a positive integer.")
+        labels = self._iter_labels()
+        while True:
+            chunk = list(islice(labels, max_experiments))
+            if not chunk:
+                return
+            yield chunk
 
     @staticmethod
     def _calibration_circuit(num_qubits: int, label: str) -> QuantumCircuit:
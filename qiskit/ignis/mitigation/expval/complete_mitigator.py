@@ -18,8 +18,9 @@ from typing import Optional, List, Dict, Tuple
 import numpy as np
 
 from qiskit.exceptions import QiskitError
-from .utils import (counts_probability_vector, _expval_with_stddev)
-from .base_meas_mitigator import BaseExpvalMeasMitigator
+from .utils import (counts_probability_vector, _label_diagonal,
+                    _expvals_with_stddev)
+from .base_meas_mitigator import BaseExpvalMeasMitigator, _MatrixCache
 
 
 class CompleteExpvalMeasMitigator(BaseExpvalMeasMitigator):
@@ -44,9 +45,9 @@ class CompleteExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Args:
             amat (np.array): readout error assignment matrix.
         """
+        super().__init__()
         self._num_qubits = int(np.log2(amat.shape[0]))
         self._assignment_mat = amat
-        self._mitigation_mats = {}
 
     def expectation_value(self,
                           counts: Dict,
@@ -63,7 +64,9 @@ class CompleteExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Args:
             counts: counts object
             diagonal: Optional, the vector of diagonal values for summing the
-                      expectation value. If ``None`` the the default value is
+                      expectation value, or a string label of the diagonal
+                      (see :func:`~qiskit.ignis.mitigation.expectation_value`).
+                      If ``None`` the the default value is
                       :math:`[1, -1]^\otimes n`.
             qubits: Optional, the measured physical qubits the count
                     bitstrings correspond to. If None qubits are assumed to be
@@ -87,25 +90,95 @@ class CompleteExpvalMeasMitigator(BaseExpvalMeasMitigator):
             which physical qubits these bit-values correspond to as
             ``circuit.measure(qubits, clbits)``.
         """
-        # Get probability vector
-        probs, shots = counts_probability_vector(
-            counts, clbits=clbits, qubits=qubits, return_shots=True)
-        num_qubits = int(np.log2(probs.shape[0]))
+        if diagonal is not None:
+            diagonal = [diagonal]
+        expvals, stddevs = self.expectation_values(
+            counts, diagonals=diagonal, qubits=qubits, clbits=clbits)
+        return expvals[0], stddevs[0]
+
+    def expectation_values(self,
+                           counts: Dict,
+                           diagonals: Optional[List[np.ndarray]] = None,
+                           qubits: Optional[List[int]] = None,
+                           clbits: Optional[List[int]] = None,
+                           ) -> Tuple[np.ndarray, np.ndarray]:
+        r"""Compute mitigated expectation values of several diagonal observables.
+
+        The mitigation matrix is applied to all diagonals in a single
+        matrix product. See :meth:`expectation_value` for additional
+        information.
 
-        # Get qubit mitigation matrix and mitigate probs
-        if qubits is None:
-            qubits = tuple(range(num_qubits))
-        if len(qubits) != num_qubits:
-            raise QiskitError("Num qubits does not match number of clbits.")
-        mit_mat = self.mitigation_matrix(qubits)
+        Args:
+            counts: counts object
+            diagonals: Optional, a list of diagonal value vectors, one for
+                       each observable. If ``None`` a single observable with
+                       the default value :math:`[1, -1]^\otimes n` is used.
+            qubits: Optional, the measured physical qubits the count
+                    bitstrings correspond to. If None qubits are assumed to be
+                    :math:`[0, ..., n-1]`.
+            clbits: Optional, if not None marginalize counts to the specified bits.
 
-        # Get operator coeffs
-        if diagonal is None:
-            diagonal = self._z_diagonal(2 ** num_qubits)
-        # Apply transpose of mitigation matrix
-        coeffs = mit_mat.T.dot(diagonal)
+        Returns:
+            (np.ndarray, np.ndarray): the arrays of expectation values and
+            standard deviations for each diagonal.
 
-        return _expval_with_stddev(coeffs, probs, shots)
+        Raises:
+            QiskitError: if input arguments are invalid.
+        """
+        expvals, stddevs = self.batch_expectation_values(
+            [counts], diagonals=diagonals, qubits=qubits, clbits=clbits)
+        return expvals[0], stddevs[0]
+
+    def batch_expectation_values(self,
+                                 counts_list: List[Dict],
+                                 diagonals: Optional[List[np.ndarray]] = None,
+                                 qubits: Optional[List[int]] = None,
+                                 clbits: Optional[List[int]] = None,
+                                 ) -> Tuple[np.ndarray, np.ndarray]:
+        r"""Compute mitigated expectation values for a list of counts.
+
+        The mitigated diagonal coefficients are computed once and shared
+        by all counts objects.
+
+        Args:
+            counts_list: list of counts objects.
+            diagonals: Optional, a list of diagonal value vectors, one for
+                       each observable. If ``None`` a single observable with
+                       the default value :math:`[1, -1]^\otimes n` is used.
+            qubits: Optional, the measured physical qubits the count
+                    bitstrings correspond to. If None qubits are assumed to be
+                    :math:`[0, ..., n-1]`.
+            clbits: Optional, if not None marginalize counts to the specified bits.
+
+        Returns:
+            (np.ndarray, np.ndarray): the expectation values and standard
+            deviations as arrays of shape ``(len(counts_list), len(diagonals))``.
+
+        Raises:
+            QiskitError: if input arguments are invalid.
+        """
+        coeffs = None
+        expvals = []
+        stddevs = []
+        for counts in counts_list:
+            # Get probability vector
+            probs, shots = counts_probability_vector(
+                counts, clbits=clbits, qubits=qubits, return_shots=True)
+
+            if coeffs is None:
+                num_qubits = int(np.log2(probs.shape[0]))
+
+                # Get qubit mitigation matrix
+                if qubits is None:
+                    qubits = tuple(range(num_qubits))
+                if len(qubits) != num_qubits:
+                    raise QiskitError("Num qubits does not match number of clbits.")
+                coeffs = self._mitigated_diagonals(diagonals, qubits)
+
+            expval, stddev = _expvals_with_stddev(coeffs, probs, shots)
+            expvals.append(expval)
+            stddevs.append(stddev)
+        return np.array(expvals), np.array(stddevs)
 
     def mitigation_matrix(self, qubits: List[int] = None) -> np.ndarray:
         r"""Return the measurement mitigation matrix for the specified qubits.
@@ -119,23 +192,17 @@ class CompleteExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Returns:
             np.ndarray: the measurement error mitigation matrix :math:`A^{-1}`.
         """
-        if qubits is None:
-            qubits = tuple(range(self._num_qubits))
-        else:
-            qubits = tuple(sorted(qubits))
+        qubits = self._qubits_key(qubits)
 
-        # Check for cached mitigation matrix
-        # if not present compute
-        if qubits not in self._mitigation_mats:
+        def _mitigation_matrix():
             marginal_matrix = self.assignment_matrix(qubits)
             try:
-                mit_mat = np.linalg.inv(marginal_matrix)
+                return np.linalg.inv(marginal_matrix)
             except np.linalg.LinAlgError:
                 # Use pseudo-inverse if matrix is singular
-                mit_mat = np.linalg.pinv(marginal_matrix)
-            self._mitigation_mats[qubits] = mit_mat
+                return np.linalg.pinv(marginal_matrix)
 
-        return self._mitigation_mats[qubits]
+        return self._cache.get(('mitigation', qubits), _mitigation_matrix)
 
     def assignment_matrix(self, qubits: List[int] = None) -> np.ndarray:
         r"""Return the measurement assignment matrix for specified qubits.
@@ -150,12 +217,14 @@ class CompleteExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Returns:
             np.ndarray: the assignment matrix A.
         """
-        if qubits is None:
+        qubits = self._qubits_key(qubits)
+        if len(qubits) == self._num_qubits:
             return self._assignment_mat
+        return self._cache.get(('assignment', qubits),
+                               lambda: self._marginal_assignment_matrix(qubits))
 
-        if isinstance(qubits, int):
-            qubits = [qubits]
-
+    def _marginal_assignment_matrix(self, qubits: Tuple[int]) -> np.ndarray:
+        """Compute the marginal assignment matrix on a subset of qubits."""
         # Compute marginal matrix
         axis = tuple([self._num_qubits - 1 - i for i in set(
             range(self._num_qubits)).difference(qubits)])
@@ -167,6 +236,31 @@ class CompleteExpvalMeasMitigator(BaseExpvalMeasMitigator):
         new_amat = new_amat.T
         return new_amat
 
+    def _mitigated_diagonals(self,
+                             diagonals: Optional[List[np.ndarray]],
+                             qubits: Tuple[int]) -> np.ndarray:
+        """Apply the transpose of the mitigation matrix to a list of diagonals"""
+        qubits = self._qubits_key(qubits)
+
+        # Get operator coeffs
+        if diagonals is None:
+            diagonals = [self._z_diagonal(2 ** len(qubits))]
+        diagonals = np.atleast_2d([_label_diagonal(diag) if isinstance(diag, str)
+                                   else diag for diag in diagonals])
+
+        # Apply transpose of mitigation matrix
+        key = ('coeffs', qubits, _MatrixCache.array_key(diagonals))
+        return self._cache.get(
+            key, lambda: diagonals.dot(self.mitigation_matrix(qubits)))
+
+    def _qubits_key(self, qubits: Optional[List[int]] = None) -> Tuple[int]:
+        """Return the sorted qubit tuple used as a cache key"""
+        if qubits is None:
+            return tuple(range(self._num_qubits))
+        if isinstance(qubits, int):
+            return (qubits, )
+        return tuple(sorted(qubits))
+
     @staticmethod
     def _keep_indexes(qubits):
         indexes = [0]
@@ -176,5 +270,6 @@ class CompleteExpvalMeasMitigator(BaseExpvalMeasMitigator):
 
     def _compute_gamma(self, qubits=None):
         """Compute gamma for N-qubit mitigation"""
-        mitmat = self.mitigation_matrix(qubits=qubits)
-        return np.max(np.sum(np.abs(mitmat), axis=0))
+        qubits = self._qubits_key(qubits)
+        return self._cache.get(('gamma', qubits), lambda: np.max(np.sum(
+            np.abs(self.mitigation_matrix(qubits)), axis=0)))
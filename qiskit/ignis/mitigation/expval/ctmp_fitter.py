@@ -15,19 +15,23 @@
 Full-matrix measurement error mitigation generator.
 """
 import logging
-from typing import List, Dict
+from typing import List, Dict, Union
 import numpy as np
 import scipy.linalg as la
 
 from qiskit.exceptions import QiskitError
 from .ctmp_mitigator import CTMPExpvalMeasMitigator
 from .ctmp_generator_set import Generator, standard_generator_set
-from .utils import assignment_matrix
+from .utils import ExpvalCalibrationData
 
 logger = logging.getLogger(__name__)
 
+# Permutation of the two-qubit basis [00, 01, 10, 11] for swapping the qubits
+_SWAP_PERM = np.array([0, 2, 1, 3])
 
-def fit_ctmp_meas_mitigator(cal_data: Dict[int, Dict[int, int]],
+
+def fit_ctmp_meas_mitigator(cal_data: Union[Dict[int, Dict[int, int]],
+                                            ExpvalCalibrationData],
                             num_qubits: int,
                             generators: List[Generator] = None) -> CTMPExpvalMeasMitigator:
     """Return FullMeasureErrorMitigator from result data.
@@ -42,121 +46,141 @@ def fit_ctmp_meas_mitigator(cal_data: Dict[int, Dict[int, int]],
 
     Raises:
         QiskitError: if input arguments are invalid.
+
+    Additional Information:
+        The rates of all generators are computed together from the local
+        generator matrices :math:`G_{jk} = \\log(A_{jk})` of the two-qubit
+        assignment matrices on the qubit pairs of the generators. The
+        single-qubit rates on qubit :math:`j` are averaged over all generator
+        pairs containing :math:`j`, or computed from the single-qubit
+        assignment matrix if there are none.
     """
     if not isinstance(num_qubits, int):
         raise QiskitError('Number of qubits must be an int')
     if generators is None:
         generators = standard_generator_set(num_qubits)
+    if not isinstance(cal_data, ExpvalCalibrationData):
+        counts_data = cal_data
+        cal_data = ExpvalCalibrationData(num_qubits=num_qubits, method='CTMP')
+        for cal, counts in counts_data.items():
+            cal_data.add_counts(cal, counts)
 
-    gen_mat_dict = {}
-    for gen in generators + _supplementary_generators(generators):
-        if len(gen[2]) > 1:
-            mat = _local_g_matrix(gen, cal_data, num_qubits)
-            gen_mat_dict[gen] = mat
+    # Local generator matrices on sorted qubit pairs
+    pairs = sorted({tuple(sorted(gen[2])) for gen in generators if len(gen[2]) == 2})
+    pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    gmats = _local_g_matrices(cal_data.pair_assignment_matrices(pairs))
 
     # Compute rates for generators
-    rates = [_get_ctmp_error_rate(gen, gen_mat_dict, num_qubits) for gen in generators]
-    return CTMPExpvalMeasMitigator(generators, rates)
-
-
-# Utility functions used for fitting (Should be moved to Fitter class)
-
-def _ctmp_err_rate_1_q(a: str, b: str, j: int,
-                       g_mat_dict: Dict[Generator, np.array],
-                       num_qubits: int) -> float:
-    """Compute the 1q error rate for a given generator."""
-    # pylint: disable=invalid-name
-    rate_list = []
-    if a == '0' and b == '1':
-        g1 = ('00', '10')
-        g2 = ('01', '11')
-    elif a == '1' and b == '0':
-        g1 = ('10', '00')
-        g2 = ('11', '01')
-    else:
-        raise ValueError('Invalid a,b encountered...')
-    for k in range(num_qubits):
-        if k == j:
-            continue
-        c = (j, k)
-        for g_strs in [g1, g2]:
-            gen = g_strs + (c,)
-            r = _ctmp_err_rate_2_q(gen, g_mat_dict)
-            rate_list.append(r)
-    if len(rate_list) != 2 * (num_qubits - 1):
-        raise ValueError('Rate list has wrong number of elements')
-    rate = np.mean(rate_list)
-    return rate
-
-
-def _ctmp_err_rate_2_q(gen, g_mat_dict) -> float:
-    """Compute the 2 qubit error rate for a given generator."""
-    # pylint: disable=invalid-name
-    g_mat = g_mat_dict[gen]
-    b, a, _ = gen
-    r = g_mat[int(b, 2), int(a, 2)]
-    return r
-
-
-def _get_ctmp_error_rate(gen: Generator,
-                         g_mat_dict: Dict[Generator, np.array],
-                         num_qubits: int) -> float:
-    """Compute the error rate r_i for generator G_i.
-
-    Args:
-        gen (Generator): Generator to calibrate.
-        g_mat_dict (Dict[Generator, np.array]): Dictionary of local G(j,k) matrices.
-        num_qubits (int): number of qubits.
-
-    Returns:
-        float: The coefficient r_i for generator G_i.
-
-    Raises:
-        ValueError: The provided generator is not already in the set of generators.
-    """
-    # pylint: disable=invalid-name
-    b, a, c = gen
-    if len(b) == 1:
-        rate = _ctmp_err_rate_1_q(a, b, c[0], g_mat_dict, num_qubits)
-    elif len(b) == 2:
-        rate = _ctmp_err_rate_2_q(gen, g_mat_dict)
-    return rate
-
-
-def _local_g_matrix(gen: Generator,
-                    cal_data: Dict[int, Dict[int, int]],
-                    num_qubits: int) -> np.array:
-    """Computes the G(j,k) matrix in the basis [00, 01, 10, 11]."""
-    # pylint: disable=invalid-name
-    _, _, c = gen
-    j, k = c
-    a_mat = assignment_matrix(cal_data, num_qubits, [j, k])
-    g = la.logm(a_mat)
-    if np.linalg.norm(np.imag(g)) > 1e-3:
-        raise QiskitError('Encountered complex entries in G_i={}'.format(g))
-    g = np.real(g)
-    for i in range(4):
-        for j in range(4):
-            if i != j:
-                if g[i, j] < 0:
-                    g[i, j] = 0
-    return g
-
-
-def _supplementary_generators(gen_list: List[Generator]) -> List[Generator]:
-    """Supplementary generators needed to run 1q calibrations.
-
-    Args:
-        gen_list (List[Generator]): List of generators.
-
-    Returns:
-        List[Generator]: List of additional generators needed.
+    rates = np.zeros(len(generators), dtype=float)
+    one_q = np.array([len(gen[2]) == 1 for gen in generators], dtype=bool)
+    if np.any(~one_q):
+        rates[~one_q] = _ctmp_err_rates_2_q(
+            [gen for gen in generators if len(gen[2]) == 2], pairs, gmats)
+    if np.any(one_q):
+        rates[one_q] = _ctmp_err_rates_1_q(
+            [gen for gen in generators if len(gen[2]) == 1],
+            pairs, gmats, cal_data)
+    return CTMPExpvalMeasMitigator(generators, rates.tolist())
+
+
+def _ctmp_err_rates_1_q(generators: List[Generator],
+                        pairs: np.ndarray,
+                        gmats: np.ndarray,
+                        cal_data: ExpvalCalibrationData) -> np.ndarray:
+    """Compute the 1q error rates for a list of single-qubit generators."""
+    num_qubits = cal_data.num_qubits
+
+    # The rate of the ('1', '0', (j,)) generator is the mean of the
+    # G(j, k)['00', '10'] and G(j, k)['01', '11'] rates over pairs (j, k),
+    # and the ('0', '1', (j,)) generator of the G(j, k)['10', '00'] and
+    # G(j, k)['11', '01'] rates. For qubit k of a sorted pair (j, k) the
+    # bits of the G(j, k) basis are swapped.
+    rates_10 = np.zeros(num_qubits, dtype=float)
+    rates_01 = np.zeros(num_qubits, dtype=float)
+    num_pairs = np.zeros(num_qubits, dtype=int)
+    np.add.at(rates_10, pairs[:, 0], gmats[:, 0, 2] + gmats[:, 1, 3])
+    np.add.at(rates_10, pairs[:, 1], gmats[:, 0, 1] + gmats[:, 2, 3])
+    np.add.at(rates_01, pairs[:, 0], gmats[:, 2, 0] + gmats[:, 3, 1])
+    np.add.at(rates_01, pairs[:, 1], gmats[:, 1, 0] + gmats[:, 3, 2])
+    np.add.at(num_pairs, pairs.ravel(), 1)
+    paired = num_pairs > 0
+    rates_10[paired] /= 2 * num_pairs[paired]
+    rates_01[paired] /= 2 * num_pairs[paired]
+
+    # Qubits not in any pair use their single-qubit generator matrix
+    unpaired = np.flatnonzero(~paired)
+    if unpaired.size:
+        amats = np.array([cal_data.assignment_matrix([qubit]) for qubit in unpaired])
+        g1mats = _local_g_matrices(amats)
+        rates_10[unpaired] = g1mats[:, 0, 1]
+        rates_01[unpaired] = g1mats[:, 1, 0]
+
+    rates = np.zeros(len(generators), dtype=float)
+    for i, (b, a, qubits) in enumerate(generators):
+        # pylint: disable=invalid-name
+        if a == '0' and b == '1':
+            rates[i] = rates_10[qubits[0]]
+        elif a == '1' and b == '0':
+            rates[i] = rates_01[qubits[0]]
+        else:
+            raise ValueError('Invalid a,b encountered...')
+    return rates
+
+
+def _ctmp_err_rates_2_q(generators: List[Generator],
+                        pairs: np.ndarray,
+                        gmats: np.ndarray) -> np.ndarray:
+    """Compute the 2q error rates for a list of two-qubit generators."""
+    # Index of the sorted qubit pair and G(j, k) matrix entries for each generator
+    qubits = np.array([gen[2] for gen in generators], dtype=np.int64)
+    rows = np.array([int(gen[0], 2) for gen in generators], dtype=np.int64)
+    cols = np.array([int(gen[1], 2) for gen in generators], dtype=np.int64)
+    swap = qubits[:, 0] > qubits[:, 1]
+    rows[swap] = _SWAP_PERM[rows[swap]]
+    cols[swap] = _SWAP_PERM[cols[swap]]
+    qubits.sort(axis=1)
+
+    # Sorted pairs are in lexicographic order so can be searched by their
+    # integer encoding
+    base = pairs.max() + 1
+    pos = np.searchsorted(pairs[:, 0] * base + pairs[:, 1],
+                          qubits[:, 0] * base + qubits[:, 1])
+    return gmats[pos, rows, cols]
+
+
+def _local_g_matrices(amats: np.ndarray) -> np.ndarray:
+    """Computes the local G matrices from an array of local assignment matrices."""
+    gmats = _batch_logm(amats)
+    imag_norms = np.linalg.norm(np.imag(gmats), axis=(1, 2))
+    if np.any(imag_norms > 1e-3):
+        raise QiskitError('Encountered complex entries in G_i={}'.format(
+            gmats[np.argmax(imag_norms)]))
+    gmats = np.real(gmats)
+
+    # Clip negative off-diagonal rates
+    dim = gmats.shape[-1]
+    off_diag = ~np.eye(dim, dtype=bool)
+    gmats[:, off_diag] = np.maximum(gmats[:, off_diag], 0)
+    return gmats
+
+
+def _batch_logm(mats: np.ndarray, max_cond: float = 1e8) -> np.ndarray:
+    """Return the principal matrix logarithm of an array of square matrices.
+
+    The logarithms are computed together from the batched eigendecompositions
+    of the matrices. Matrices with an ill-conditioned eigenbasis fall back to
+    :func:`scipy.linalg.logm`.
     """
-    pairs = {tuple(gen[2]) for gen in gen_list}
-    supp_gens = []
-    for tup in pairs:
-        supp_gens.append(('10', '00', tup))
-        supp_gens.append(('00', '10', tup))
-        supp_gens.append(('11', '01', tup))
-        supp_gens.append(('01', '11', tup))
-    return supp_gens
+    logs = np.zeros(mats.shape, dtype=complex)
+    if mats.shape[0] == 0:
+        return logs
+    evals, evecs = np.linalg.eig(mats)
+    conds = np.linalg.cond(evecs)
+    diag = conds < max_cond
+    if np.any(diag):
+        logs[diag] = np.einsum('nij,nj,njk->nik', evecs[diag],
+                               np.log(evals[diag].astype(complex)),
+                               np.linalg.inv(evecs[diag]))
+    for i in np.flatnonzero(~diag):
+        logs[i] = la.logm(mats[i])
+    return logs
@@ -49,10 +49,12 @@ def standard_generator_set(num_qubits: int, pairs=None) -> List[Generator]:
     generators = []
     generators += single_qubit_bitstrings(num_qubits)
     if num_qubits > 1:
+        pairs = _sorted_pairs(num_qubits, pairs)
         generators += two_qubit_bitstrings_symmetric(num_qubits, pairs=pairs)
         generators += two_qubit_bitstrings_asymmetric(num_qubits, pairs=pairs)
-        if len(generators) != 2 * num_qubits ** 2:
-            raise ValueError('Incorrect length of generators. {} != 2n^2.'.format(len(generators)))
+        if len(generators) != 2 * num_qubits + 4 * len(pairs):
+            raise ValueError('Incorrect length of generators. {} != 2n + 4 * {}.'.format(
+                len(generators), len(pairs)))
     return generators
 
 
@@ -70,22 +72,33 @@ def single_qubit_bitstrings(num_qubits: int) -> List[Generator]:
 def two_qubit_bitstrings_symmetric(num_qubits: int, pairs=None) -> List[Generator]:
     """Return the 11->00 and 00->11 generators on a given number of qubits.
     """
-    if pairs is None:
-        pairs = list(combinations(range(num_qubits), r=2))
-    res = [('11', '00', (i, j)) for i, j in pairs if i < j]
-    res += [('00', '11', (i, j)) for i, j in pairs if i < j]
-    if len(res) != num_qubits * (num_qubits - 1):
-        raise ValueError('Should have gotten n(n-1) qubits, got {}'.format(len(res)))
+    pairs = _sorted_pairs(num_qubits, pairs)
+    res = [('11', '00', (i, j)) for i, j in pairs]
+    res += [('00', '11', (i, j)) for i, j in pairs]
+    if len(res) != 2 * len(pairs):
+        raise ValueError('Should have gotten 2 * {} qubits, got {}'.format(
+            len(pairs), len(res)))
     return res
 
 
 def two_qubit_bitstrings_asymmetric(num_qubits: int, pairs=None) -> List[Generator]:
     """Return the 01->10 generators on a given number of qubits.
     """
-    if pairs is None:
-        pairs = list(combinations(range(num_qubits), r=2))
+    pairs = _sorted_pairs(num_qubits, pairs)
     res = [('10', '01', (i, j)) for i, j in pairs]
     res += [('10', '01', (j, i)) for i, j in pairs]
-    if len(res) != num_qubits * (num_qubits - 1):
-        raise ValueError('Should have gotten n(n-1) qubits, got {}'.format(len(res)))
+    if len(res) != 2 * len(pairs):
+        raise ValueError('Should have gotten 2 * {} qubits, got {}'.format(
+            len(pairs), len(res)))
     return res
+
+
+def _sorted_pairs(num_qubits: int, pairs=None) -> List[Tuple[int, int]]:
+    """Return the list of unique sorted qubit pairs.
+
+    If pairs is None all pairs of qubits are returned. Pairs such as
+    the edges of a directed coupling map are sorted and de-duplicated.
+    """
+    if pairs is None:
+        return list(combinations(range(num_qubits), r=2))
+    return sorted({tuple(sorted(pair)) for pair in pairs if pair[0] != pair[1]})
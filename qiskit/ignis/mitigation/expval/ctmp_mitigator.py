@@ -25,7 +25,7 @@ from qiskit.exceptions import QiskitError
 from qiskit.ignis.numba import jit_fallback
 
 from .base_meas_mitigator import BaseExpvalMeasMitigator
-from .utils import counts_probability_vector
+from .utils import counts_probability_vector, _label_diagonal
 from .ctmp_generator_set import Generator
 
 logger = logging.getLogger(__name__)
@@ -52,6 +52,7 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
                  num_qubits: Optional[int] = None,
                  seed: Optional = None):
         """Initialize a TensorMeasurementMitigator"""
+        super().__init__()
         if num_qubits is None:
             self._num_qubits = 1 + max([max([max(gen[2]) for gen in generators])])
         else:
@@ -67,11 +68,6 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
         self._generators = nz_generators
         self._rates = np.array(nz_rates, dtype=float)
 
-        # Parameters to be initialized from generators and rates
-        self._generator_mats = {}
-        self._noise_strengths = {}
-        self._sampling_mats = {}
-
         # RNG for CTMP sampling
         self._rng = None
         self.seed(seed)
@@ -91,7 +87,9 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Args:
             counts: counts object
             diagonal: Optional, the vector of diagonal values for summing the
-                      expectation value. If ``None`` the the default value is
+                      expectation value, or a string label of the diagonal
+                      (see :func:`~qiskit.ignis.mitigation.expectation_value`).
+                      If ``None`` the the default value is
                       :math:`[1, -1]^\otimes n`.
             qubits: Optional, the measured physical qubits the count
                     bitstrings correspond to. If None qubits are assumed to be
@@ -112,6 +110,38 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
             which physical qubits these bit-values correspond to as
             ``circuit.measure(qubits, clbits)``.
         """
+        if diagonal is not None:
+            diagonal = [diagonal]
+        expvals, stddevs = self.expectation_values(
+            counts, diagonals=diagonal, qubits=qubits, clbits=clbits)
+        return expvals[0], stddevs[0]
+
+    def expectation_values(self,
+                           counts: Dict,
+                           diagonals: Optional[List[np.ndarray]] = None,
+                           qubits: Optional[List[int]] = None,
+                           clbits: Optional[List[int]] = None,
+                           ) -> Tuple[np.ndarray, np.ndarray]:
+        r"""Compute mitigated expectation values of several diagonal observables.
+
+        The CTMP samples only depend on the counts, so they are drawn once
+        and used to evaluate all diagonals. See :meth:`expectation_value` for
+        additional information.
+
+        Args:
+            counts: counts object
+            diagonals: Optional, a list of diagonal value vectors, one for
+                       each observable. If ``None`` a single observable with
+                       the default value :math:`[1, -1]^\otimes n` is used.
+            qubits: Optional, the measured physical qubits the count
+                    bitstrings correspond to. If None qubits are assumed to be
+                    :math:`[0, ..., n-1]`.
+            clbits: Optional, if not None marginalize counts to the specified bits.
+
+        Returns:
+            (np.ndarray, np.ndarray): the arrays of expectation values and
+            standard deviations for each diagonal.
+        """
         if qubits is None:
             qubits = list(range(self._num_qubits))
 
@@ -120,17 +150,18 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
             counts, clbits=clbits, qubits=qubits,
             num_qubits=len(qubits), return_shots=True)
 
-        # Ensure diagonal is a numpy vector so we can use fancy indexing
-        if diagonal is None:
-            diagonal = self._z_diagonal(2**len(qubits))
-        diagonal = np.asarray(diagonal, dtype=probs.dtype)
+        # Ensure diagonals is a 2D numpy array so we can use fancy indexing
+        if diagonals is None:
+            diagonals = [self._z_diagonal(2**len(qubits))]
+        diagonals = [_label_diagonal(diag) if isinstance(diag, str) else diag
+                     for diag in diagonals]
+        diagonals = np.atleast_2d(np.asarray(diagonals, dtype=probs.dtype))
 
         # Get arrays from CSC sparse matrix format
         # TODO: To use qubits kwarg we should compute the B-matrix and gamma
         # for the specified qubit subsystem
         gamma = self.noise_strength(qubits)
-        bmat = self._sampling_matrix(qubits)
-        values = bmat.data
+        bmat, cumprobs = self._sampling_matrix(qubits, np.flatnonzero(probs))
         indices = np.asarray(bmat.indices, dtype=np.int)
         indptrs = np.asarray(bmat.indptr, dtype=np.int)
 
@@ -142,28 +173,30 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
 
         # Break total number of samples up into steps of a max number
         # of samples
-        expval = 0
+        expvals = np.zeros(diagonals.shape[0], dtype=diagonals.dtype)
         batch_size = 50000
         samples_set = (num_samples // batch_size) * [batch_size] + [
             num_samples % batch_size]
         for sample_shots in samples_set:
             # Apply sampling
             samples, sample_signs = self._ctmp_inverse(
-                sample_shots, probs, gamma, values, indices, indptrs, self._rng)
+                sample_shots, probs, gamma, cumprobs, indices, indptrs, self._rng)
 
-            # Compute expectation value
-            expval += diagonal[samples[sample_signs == 0]].sum()
-            expval -= diagonal[samples[sample_signs == 1]].sum()
+            # Compute expectation values for all diagonals
+            expvals += diagonals[:, samples[sample_signs == 0]].sum(axis=1)
+            expvals -= diagonals[:, samples[sample_signs == 1]].sum(axis=1)
 
-        expval = (np.exp(2 * gamma) / num_samples) * expval
+        expvals = (np.exp(2 * gamma) / num_samples) * expvals
 
         # TODO: calculate exact standard deviation
         # For now we return the upper bound: stddev <= Gamma / sqrt(shots)
         # using Gamma ~ exp(2 * gamma)
-        stddev = np.exp(2 * gamma) / np.sqrt(shots)
-        return expval, stddev
+        stddevs = np.full(expvals.size, np.exp(2 * gamma) / np.sqrt(shots))
+        return expvals, stddevs
 
-    def generator_matrix(self, qubits: List[int] = None) -> sps.coo_matrix:
+    def generator_matrix(self,
+                         qubits: List[int] = None,
+                         outcomes: Optional[List[int]] = None) -> sps.csc_matrix:
         r"""Return the generator matrix on the specified qubits.
 
         The generator matrix :math:`G` is given by :math:`\sum_i r_i G_i`
@@ -172,27 +205,22 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
 
         Args:
             qubits: Optional, qubit subset for the generators.
+            outcomes: Optional, if specified only the columns of :math:`G`
+                      for basis states reachable from these integer
+                      outcomes are constructed.
 
         Returns:
-            sps.coo_matrix: the generator matrix :math:`G`.
+            sps.csc_matrix: the generator matrix :math:`G`.
         """
-        if qubits is None:
-            qubits = tuple(range(self._num_qubits))
-        else:
-            qubits = tuple(sorted(qubits))
+        qubits = self._qubits_key(qubits)
 
-        if qubits not in self._generator_mats:
-            # Construct G from subset generators
-            qubits_set = set(qubits)
-            g_mat = sps.coo_matrix(2 * (2**len(qubits),), dtype=np.float)
-            for gen, rate in zip(self._generators, self._rates):
-                if qubits_set.issuperset(gen[2]):
-                    # Keep generator
-                    g_mat += rate * self._generator_to_coo_matrix(gen, qubits)
+        if outcomes is not None:
+            states = np.flatnonzero(self._reachable_states(qubits, outcomes))
+            return self._generator_csc_matrix(qubits, states)
 
-            # Add generator matrix to cache
-            self._generator_mats[qubits] = sps.coo_matrix(g_mat)
-        return self._generator_mats[qubits]
+        # Construct G from subset generators and add to cache
+        return self._cache.get(('generator', qubits),
+                               lambda: self._generator_csc_matrix(qubits))
 
     def mitigation_matrix(self, qubits: List[int] = None) -> np.ndarray:
         r"""Return the measurement mitigation matrix for the specified qubits.
@@ -206,12 +234,9 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Returns:
             np.ndarray: the measurement error mitigation matrix :math:`A^{-1}`.
         """
-        # NOTE: the matrix definition of G is somehow flipped in both row and
-        # columns compared to the canonical ordering for the A-matrix used
-        # in the Complete and Tensored methods
-        gmat = self.generator_matrix(qubits)
-        gmat = np.flip(gmat.todense())
-        return la.expm(-gmat)
+        qubits = self._qubits_key(qubits)
+        return self._cache.get(('mitigation', qubits),
+                               lambda: self._expm_generator(qubits, -1))
 
     def assignment_matrix(self, qubits: List[int] = None) -> np.ndarray:
         r"""Return the measurement assignment matrix for specified qubits.
@@ -226,33 +251,15 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Returns:
             np.ndarray: the assignment matrix A.
         """
-        # NOTE: the matrix definition of G is somehow flipped in both row and
-        # columns compared to the canonical ordering for the A-matrix used
-        # in the Complete and Tensored methods
-        gmat = self.generator_matrix(qubits)
-        gmat = np.flip(gmat.todense())
-        return la.expm(gmat)
+        qubits = self._qubits_key(qubits)
+        return self._cache.get(('assignment', qubits),
+                               lambda: self._expm_generator(qubits, 1))
 
     def noise_strength(self, qubits: Optional[int] = None) -> float:
         """Return the noise strength :math:`gamma` on the specified qubits"""
-        if qubits is None:
-            qubits = tuple(range(self._num_qubits))
-        else:
-            qubits = tuple(sorted(qubits))
-
-        if qubits not in self._noise_strengths:
-            # Compute gamma and cache
-            g_mat = self.generator_matrix(qubits)
-            # Check ideal case
-            if g_mat.row.size == 0:
-                gamma = 0
-            else:
-                gamma = np.max(-g_mat.data[g_mat.row == g_mat.col])
-            if gamma < 0:
-                raise QiskitError(
-                    'gamma should be non-negative, found gamma={}'.format(gamma))
-            self._noise_strengths[qubits] = gamma
-        return self._noise_strengths[qubits]
+        qubits = self._qubits_key(qubits)
+        return self._cache.get(('gamma', qubits),
+                               lambda: self._escape_rate(qubits))
 
     def seed(self, value=None):
         """Set the seed for the quantum state RNG."""
@@ -269,12 +276,42 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
         gamma = self.noise_strength(qubits)
         return np.exp(2 * gamma)
 
+    def _qubits_key(self, qubits: Optional[List[int]] = None) -> Tuple[int]:
+        """Return the sorted qubit tuple used as a cache key"""
+        if qubits is None:
+            return tuple(range(self._num_qubits))
+        if isinstance(qubits, int):
+            return (qubits, )
+        return tuple(sorted(qubits))
+
+    def _expm_generator(self, qubits: Tuple[int], sign: int) -> np.ndarray:
+        """Return the matrix exponential of the signed generator matrix"""
+        # NOTE: the matrix definition of G is somehow flipped in both row and
+        # columns compared to the canonical ordering for the A-matrix used
+        # in the Complete and Tensored methods
+        gmat = self.generator_matrix(qubits)
+        gmat = np.flip(gmat.todense())
+        return la.expm(sign * gmat)
+
+    def _escape_rate(self, qubits: Tuple[int]) -> float:
+        """Compute the maximum escape rate from the diagonal of G"""
+        masks, a_vals, _, rates = self._generator_arrays(qubits)
+        states = np.arange(2**len(qubits), dtype=np.int64)
+        escape_rates = np.zeros(states.size, dtype=float)
+        for mask, a_val, rate in zip(masks, a_vals, rates):
+            escape_rates[(states & mask) == a_val] += rate
+        gamma = np.max(escape_rates)
+        if gamma < 0:
+            raise QiskitError(
+                'gamma should be non-negative, found gamma={}'.format(gamma))
+        return gamma
+
     @staticmethod
     def _ctmp_inverse(
             n_samples: int,
             probs: np.ndarray,
             gamma: float,
-            csc_data: np.ndarray,
+            csc_cumprobs: np.ndarray,
             csc_indices: np.ndarray,
             csc_indptrs: np.ndarray,
             rng: np.random.Generator) -> Tuple[Tuple[int], Tuple[int]]:
@@ -286,7 +323,8 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
             n_samples: Number of times to sample in CTMP algorithm.
             probs: probability vector constructed from counts.
             gamma: noise strength parameter
-            csc_data: Sparse CSC matrix data array (`csc_matrix.data`).
+            csc_cumprobs: Column-wise cumulative sums of the sparse CSC
+                          matrix data array (see :func:`_csc_cumulative`).
             csc_indices: Sparse CSC matrix indices array (`csc_matrix.indices`).
             csc_indptrs: Sparse CSC matrix indices array (`csc_matrix.indptrs`).
             rng: RNG generator object.
@@ -302,104 +340,219 @@ class CTMPExpvalMeasMitigator(BaseExpvalMeasMitigator):
         # Apply CTMP sampling
         r_vals = rng.random(size=alphas.sum())
         y_vals = np.zeros(x_vals.size, dtype=np.int)
-        _markov_chain_compiled(y_vals, x_vals, r_vals, alphas, csc_data, csc_indices,
-                               csc_indptrs)
+        _markov_chain_cumulative(y_vals, x_vals, r_vals, alphas, csc_cumprobs,
+                                 csc_indices, csc_indptrs)
 
         return y_vals, signs
 
-    def _sampling_matrix(self, qubits: Optional[int] = None) -> sps.csc_matrix:
-        """Compute the B matrix for CTMP sampling"""
-        if qubits is None:
-            qubits = tuple(range(self._num_qubits))
+    def _sampling_matrix(self,
+                         qubits: Optional[int] = None,
+                         outcomes: Optional[np.ndarray] = None) -> Tuple[
+                             sps.csc_matrix, np.ndarray]:
+        """Compute the B matrix and its column cumulative probabilities for CTMP sampling.
+
+        If ``outcomes`` is specified only the columns of B for basis states
+        reachable from these outcomes are constructed. The cached matrix is
+        extended when it does not cover later outcomes.
+        """
+        qubits = self._qubits_key(qubits)
+
+        reachable = None
+        key = ('sampling', qubits)
+        if key in self._cache:
+            bmat, cumprobs, reachable = self._cache.get(key)
+            if reachable is None or (
+                    outcomes is not None and np.all(reachable[outcomes])):
+                return bmat, cumprobs
+
+        # Compute matrix columns for reachable states and cache
+        if outcomes is not None:
+            reachable = self._reachable_states(qubits, outcomes, reachable)
+            if np.all(reachable):
+                reachable = None
         else:
-            qubits = tuple(sorted(qubits))
+            reachable = None
+        states = None if reachable is None else np.flatnonzero(reachable)
+        rows, cols, vals = self._generator_entries(qubits, states)
+        gamma = self.noise_strength(qubits)
+        if gamma != 0:
+            vals = vals / gamma
+        if states is None:
+            states = np.arange(2**len(qubits), dtype=np.int64)
+
+        # B = I + G / gamma
+        dim = 2**len(qubits)
+        bmat = sps.csc_matrix(
+            (np.concatenate([np.ones(states.size), vals]),
+             (np.concatenate([states, rows]), np.concatenate([states, cols]))),
+            shape=(dim, dim))
+        bmat.sum_duplicates()
+        bmat.eliminate_zeros()
+
+        # Cache the per-column cumulative distributions so that each
+        # Markov step is a binary search rather than a cumsum + scan
+        cumprobs = _csc_cumulative(bmat.data, bmat.indptr)
+        self._cache.set(key, (bmat, cumprobs, reachable))
+        return bmat, cumprobs
+
+    def _generator_arrays(self, qubits: Tuple[int]) -> Tuple[
+            np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return integer bit-mask arrays for generators on a qubit subset.
 
-        if qubits not in self._sampling_mats:
-            # Compute matrix and cache
-            gmat = self.generator_matrix(qubits)
-            gamma = self.noise_strength(qubits)
-            bmat = sps.eye(2**len(qubits))
-            if gamma != 0:
-                bmat = bmat + gmat / gamma
-            self._sampling_mats[qubits] = bmat.tocsc()
+        Generators are uniquely determined by two bitstrings,
+        and a list of qubits on which the bitstrings act. For instance,
+        the generator `|b^i><a^i| - |a^i><a^i|` acting on the (ordered)
+        set `C_i` is represented by `g = (b_i, a_i, qubits)`. Each generator
+        acting on the qubit subset is encoded by the bit-mask of the subset
+        indices of `C_i` and the integer values of `a_i` and `b_i` on
+        these bits.
 
-        return self._sampling_mats[qubits]
+        Args:
+            qubits: Qubit subset for the generators.
 
-    @staticmethod
-    def _tensor_list(parts: List[np.ndarray]) -> np.ndarray:
-        """Compute sparse tensor product of all matrices in list"""
-        res = parts[0]
-        for mat in parts[1:]:
-            res = sps.kron(res, mat)
-        return res
+        Returns:
+            tuple: (masks, a_vals, b_vals, rates) arrays for the generators.
+        """
+        qubits_set = set(qubits)
+        masks, a_vals, b_vals, rates = [], [], [], []
+        for (s_b, s_a, gen_qubits), rate in zip(self._generators, self._rates):
+            if s_a == s_b or not qubits_set.issuperset(gen_qubits):
+                continue
+            mask, a_val, b_val = 0, 0, 0
+            for qubit, bit_b, bit_a in zip(gen_qubits, s_b, s_a):
+                shift = qubits.index(qubit)
+                mask |= 1 << shift
+                a_val |= int(bit_a) << shift
+                b_val |= int(bit_b) << shift
+            masks.append(mask)
+            a_vals.append(a_val)
+            b_vals.append(b_val)
+            rates.append(rate)
+        return (np.array(masks, dtype=np.int64),
+                np.array(a_vals, dtype=np.int64),
+                np.array(b_vals, dtype=np.int64),
+                np.array(rates, dtype=float))
+
+    def _generator_entries(self,
+                           qubits: Tuple[int],
+                           states: Optional[np.ndarray] = None) -> Tuple[
+                               np.ndarray, np.ndarray, np.ndarray]:
+        """Return the COO entries of the generator matrix columns.
 
-    def _generator_to_coo_matrix(self, gen: Generator, qubits: Tuple[int]) -> sps.coo_matrix:
-        """Compute the matrix form of a generator.
+        Args:
+            qubits: Qubit subset for the generators.
+            states: Optional, the integer basis states of the columns to
+                    construct. If None all columns are constructed.
 
-        Generators are uniquely determined by two bitstrings,
-        and a list of qubits on which the bitstrings act. For instance,
-        the generator `|b^i><a^i| - |a^i><a^i|` acting on the (ordered)
-        set `C_i` is represented by `g = (b_i, a_i, qubits)`
+        Returns:
+            tuple: (rows, cols, vals) arrays of the (unsummed) entries.
+        """
+        masks, a_vals, b_vals, rates = self._generator_arrays(qubits)
+        if states is None:
+            states = np.arange(2**len(qubits), dtype=np.int64)
+        diag = np.zeros(states.size, dtype=float)
+        rows, cols, vals = [states], [states], [diag]
+        for mask, a_val, b_val, rate in zip(masks, a_vals, b_vals, rates):
+            # The generator maps states with bits a on its mask to b
+            inds = (states & mask) == a_val
+            diag[inds] -= rate
+            col = states[inds]
+            rows.append((col & ~mask) | b_val)
+            cols.append(col)
+            vals.append(np.full(col.size, rate))
+        return np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)
+
+    def _generator_csc_matrix(self,
+                              qubits: Tuple[int],
+                              states: Optional[np.ndarray] = None) -> sps.csc_matrix:
+        """Construct the sparse generator matrix on a qubit subset."""
+        dim = 2**len(qubits)
+        rows, cols, vals = self._generator_entries(qubits, states)
+        g_mat = sps.csc_matrix((vals, (rows, cols)), shape=(dim, dim))
+        g_mat.sum_duplicates()
+        g_mat.eliminate_zeros()
+        return g_mat
+
+    def _reachable_states(self,
+                          qubits: Tuple[int],
+                          outcomes: np.ndarray,
+                          reachable: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return a boolean mask of the basis states reachable from outcomes.
 
         Args:
-            gen: Generator to use.
-            qubits: Qubit subset for generator matrix
+            qubits: Qubit subset for the generators.
+            outcomes: integer basis states to start from.
+            reachable: Optional, a boolean mask of states already known to be
+                       closed under the generators.
 
         Returns:
-            sps.coo_matrix: Sparse representation of generator.
+            np.ndarray: boolean mask of reachable basis states.
         """
-        ket_bra_dict = {
-            '00': np.array([[1, 0], [0, 0]]),
-            '01': np.array([[0, 1], [0, 0]]),
-            '10': np.array([[0, 0], [1, 0]]),
-            '11': np.array([[0, 0], [0, 1]])
-        }
-        s_b, s_a, gen_qubits = gen
-        num_qubits = len(qubits)
-        # pylint: disable=unnecessary-lambda
-        ba_strings = list(map(lambda x: ''.join(x), list(zip(*[s_b, s_a]))))
-        aa_strings = list(map(lambda x: ''.join(x), list(zip(*[s_a, s_a]))))
-        ba_mats = [sps.eye(2, 2).tocoo()] * num_qubits
-        aa_mats = [sps.eye(2, 2).tocoo()] * num_qubits
-        for qubit, s_ba, s_aa in zip(gen_qubits, ba_strings, aa_strings):
-            idx = qubits.index(qubit)
-            ba_mats[idx] = ket_bra_dict[s_ba]
-            aa_mats[idx] = ket_bra_dict[s_aa]
-
-        res = sps.coo_matrix(2 * (2**num_qubits, ), dtype=float)
-        res = res + self._tensor_list(ba_mats[::-1]) - self._tensor_list(aa_mats[::-1])
-        return res
+        masks, a_vals, b_vals, _ = self._generator_arrays(qubits)
+        if reachable is None:
+            reachable = np.zeros(2**len(qubits), dtype=bool)
+        else:
+            reachable = reachable.copy()
+        frontier = np.unique(np.asarray(outcomes, dtype=np.int64))
+        frontier = frontier[~reachable[frontier]]
+        reachable[frontier] = True
+        while frontier.size and masks.size:
+            targets = [(frontier[(frontier & mask) == a_val] & ~mask) | b_val
+                       for mask, a_val, b_val in zip(masks, a_vals, b_vals)]
+            frontier = np.unique(np.concatenate(targets))
+            frontier = frontier[~reachable[frontier]]
+            reachable[frontier] = True
+        return reachable
 
 
 @jit_fallback
-def _choice(inds: np.ndarray, probs: np.ndarray, r_val: float) -> int:
+def _csc_cumulative(csc_vals: np.ndarray, csc_indptrs: np.ndarray) -> np.ndarray:
+    """Return the cumulative sum of each column of a CSC matrix data array.
+
+    Args:
+        csc_vals: Sparse CSC matrix data array (`csc_matrix.data`).
+        csc_indptrs: Sparse CSC matrix indices array (`csc_matrix.indptrs`).
+
+    Returns:
+        np.ndarray: array of column cumulative probabilities with the same
+        layout as ``csc_vals``.
+    """
+    cumprobs = np.empty(csc_vals.size, dtype=np.float64)
+    for col in range(csc_indptrs.size - 1):
+        total = 0.0
+        for pos in range(csc_indptrs[col], csc_indptrs[col + 1]):
+            total += csc_vals[pos]
+            cumprobs[pos] = total
+    return cumprobs
+
+
+@jit_fallback
+def _choice(inds: np.ndarray, cumprobs: np.ndarray, r_val: float) -> int:
     """Choise a random array element from specified distribution.
 
-    Given a list and associated probabilities for each element of the list,
-    return a random choice. This function is required since Numpy
+    Given a list and associated cumulative probabilities for each element of
+    the list, return a random choice. This function is required since Numpy
     random.choice cannot be compiled with Numba.
 
     Args:
         inds (List[int]): List of indices to choose from.
-        probs (List[float]): List of probabilities for indices.
+        cumprobs (List[float]): List of cumulative probabilities for indices.
         r_val: float: pre-generated random number in [0, 1).
 
     Returns:
         int: Randomly sampled index from list.
     """
-    probs = np.cumsum(probs)
-    n_probs = len(probs)
-    for i in range(n_probs):
-        if r_val < probs[i]:
-            return inds[i]
+    pos = np.searchsorted(cumprobs, r_val, side='right')
+    if pos < len(inds):
+        return inds[pos]
     return inds[-1]
 
 
 @jit_fallback
-def _markov_chain_compiled(y_vals: np.ndarray, x_vals: np.ndarray,
-                           r_vals: np.ndarray, alpha_vals: np.ndarray,
-                           csc_vals: np.ndarray, csc_indices: np.ndarray,
-                           csc_indptrs: np.ndarray):
+def _markov_chain_cumulative(y_vals: np.ndarray, x_vals: np.ndarray,
+                             r_vals: np.ndarray, alpha_vals: np.ndarray,
+                             csc_cumprobs: np.ndarray, csc_indices: np.ndarray,
+                             csc_indptrs: np.ndarray):
     """Simulate the Markov process for a CSC transition matrix.
 
     Args:
@@ -407,7 +560,7 @@ def _markov_chain_compiled(y_vals: np.ndarray, x_vals: np.ndarray,
         x_vals: array of initial state values.
         r_vals: pre-generated array of random numbers [0, 1) to use in sampling.
         alpha_vals: array of Markov step values for sampling.
-        csc_vals: Sparse CSC matrix data array (`csc_matrix.data`).
+        csc_cumprobs: Column-wise cumulative sums of the CSC matrix data array.
         csc_indices: Sparse CSC matrix indices array (`csc_matrix.indices`).
         csc_indptrs: Sparse CSC matrix indices array (`csc_matrix.indptrs`).
     """
@@ -418,8 +571,29 @@ def _markov_chain_compiled(y_vals: np.ndarray, x_vals: np.ndarray,
         for _ in range(alpha_vals[i]):
             begin_slice = csc_indptrs[y]
             end_slice = csc_indptrs[y + 1]
-            probs = csc_vals[begin_slice:end_slice]
+            cumprobs = csc_cumprobs[begin_slice:end_slice]
             inds = csc_indices[begin_slice:end_slice]
-            y = _choice(inds, probs, r_vals[r_pos])
+            y = _choice(inds, cumprobs, r_vals[r_pos])
             r_pos += 1
         y_vals[i] = y
+
+
+@jit_fallback
+def _markov_chain_compiled(y_vals: np.ndarray, x_vals: np.ndarray,
+                           r_vals: np.ndarray, alpha_vals: np.ndarray,
+                           csc_vals: np.ndarray, csc_indices: np.ndarray,
+                           csc_indptrs: np.ndarray):
+    """Simulate the Markov process for a CSC transition matrix.
+
+    Args:
+        y_vals: array to store sampled values.
+        x_vals: array of initial state values.
+        r_vals: pre-generated array of random numbers [0, 1) to use in sampling.
+        alpha_vals: array of Markov step values for sampling.
+        csc_vals: Sparse CSC matrix data array (`csc_matrix.data`).
+        csc_indices: Sparse CSC matrix indices array (`csc_matrix.indices`).
+        csc_indptrs: Sparse CSC matrix indices array (`csc_matrix.indptrs`).
+    """
+    csc_cumprobs = _csc_cumulative(csc_vals, csc_indptrs)
+    _markov_chain_cumulative(y_vals, x_vals, r_vals, alpha_vals, csc_cumprobs,
+                             csc_indices, csc_indptrs)
@@ -20,7 +20,7 @@ from typing import Optional, Dict, List, Union
 from qiskit.result import Result
 from qiskit.exceptions import QiskitError
 
-from .utils import calibration_data, assignment_matrix
+from .utils import ExpvalCalibrationData
 from .complete_mitigator import CompleteExpvalMeasMitigator
 from .tensored_mitigator import TensoredExpvalMeasMitigator
 from .ctmp_mitigator import CTMPExpvalMeasMitigator
@@ -37,18 +37,34 @@ class ExpvalMeasMitigatorFitter:
 
     def __init__(self,
                  result: Result,
-                 metadata: List[Dict[str, any]]):
+                 metadata: List[Dict[str, any]],
+                 parallel: bool = False):
         """Fit a measurement error mitigator object from experiment data.
 
+        Args:
+            result: Qiskit result object.
+            metadata: mitigation generator metadata.
+            parallel: Optional, use Numba parallel kernels for accumulating
+                      calibration data if Numba is installed.
+        """
+        self._mitigator = None
+        self._cal_data = ExpvalCalibrationData(parallel=parallel)
+        self.add_data(result, metadata)
+
+    def add_data(self,
+                 result: Result,
+                 metadata: List[Dict[str, any]]):
+        """Add calibration data from an additional experiment result.
+
+        The calibration counts are accumulated with the existing data,
+        and :meth:`fit` must be called again to update the mitigator.
+
         Args:
             result: Qiskit result object.
             metadata: mitigation generator metadata.
         """
-        self._num_qubits = None
-        self._cal_data = None
+        self._cal_data.add_result(result, metadata)
         self._mitigator = None
-        self._cal_data, self._num_qubits, self._method = calibration_data(
-            result, metadata)
 
     @property
     def mitigator(self):
@@ -65,24 +81,25 @@ class ExpvalMeasMitigatorFitter:
         """Fit and return the Mitigator object from the calibration data."""
 
         if method is None:
-            method = self._method
+            method = self._cal_data.method
+        num_qubits = self._cal_data.num_qubits
 
         if method == 'complete':
             # Construct A-matrix from calibration data
-            amat = assignment_matrix(self._cal_data, self._num_qubits)
+            amat = self._cal_data.assignment_matrix()
             self._mitigator = CompleteExpvalMeasMitigator(amat)
 
         elif method == 'tensored':
             # Construct single-qubit A-matrices from calibration data
             amats = []
-            for qubit in range(self._num_qubits):
-                amat = assignment_matrix(self._cal_data, self._num_qubits, [qubit])
+            for qubit in range(num_qubits):
+                amat = self._cal_data.assignment_matrix([qubit])
                 amats.append(amat)
             self._mitigator = TensoredExpvalMeasMitigator(amats)
 
         elif method in ['CTMP', 'ctmp']:
             self._mitigator = fit_ctmp_meas_mitigator(
-                self._cal_data, self._num_qubits, generators)
+                self._cal_data, num_qubits, generators)
         else:
             raise QiskitError(
                 "Invalid expval measurement error mitigation method {}".format(method))
@@ -17,8 +17,9 @@ Single-qubit tensor-product measurement error mitigation generator.
 from typing import Optional, List, Dict, Tuple
 import numpy as np
 
-from .utils import (counts_probability_vector, _expval_with_stddev)
-from .base_meas_mitigator import BaseExpvalMeasMitigator
+from .utils import (counts_probability_vector, counts_outcomes,
+                    _diagonal_coeffs, _label_diagonal, _expvals_with_stddev)
+from .base_meas_mitigator import BaseExpvalMeasMitigator, _MatrixCache
 
 
 class TensoredExpvalMeasMitigator(BaseExpvalMeasMitigator):
@@ -43,6 +44,7 @@ class TensoredExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Args:
             amats: list of single-qubit readout error assignment matrices.
         """
+        super().__init__()
         self._num_qubits = len(amats)
         self._assignment_mats = amats
         self._mitigation_mats = np.zeros([self._num_qubits, 2, 2], dtype=float)
@@ -76,7 +78,9 @@ class TensoredExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Args:
             counts: counts object
             diagonal: Optional, the vector of diagonal values for summing the
-                      expectation value. If ``None`` the the default value is
+                      expectation value, or a string label of the diagonal
+                      (see :func:`~qiskit.ignis.mitigation.expectation_value`).
+                      If ``None`` the the default value is
                       :math:`[1, -1]^\otimes n`.
             qubits: Optional, the measured physical qubits the count
                     bitstrings correspond to. If None qubits are assumed to be
@@ -97,28 +101,87 @@ class TensoredExpvalMeasMitigator(BaseExpvalMeasMitigator):
             which physical qubits these bit-values correspond to as
             ``circuit.measure(qubits, clbits)``.
         """
-        # Get expectation value on specified qubits
-        probs, shots = counts_probability_vector(
-            counts, clbits=clbits, return_shots=True)
-        num_qubits = int(np.log2(probs.shape[0]))
+        if diagonal is not None:
+            diagonal = [diagonal]
+        expvals, stddevs = self.expectation_values(
+            counts, diagonals=diagonal, qubits=qubits, clbits=clbits)
+        return expvals[0], stddevs[0]
 
-        if qubits is not None:
-            ainvs = self._mitigation_mats[list(qubits)]
-        else:
-            ainvs = self._mitigation_mats
+    def expectation_values(self,
+                           counts: Dict,
+                           diagonals: Optional[List[np.ndarray]] = None,
+                           qubits: Optional[List[int]] = None,
+                           clbits: Optional[List[int]] = None,
+                           ) -> Tuple[np.ndarray, np.ndarray]:
+        r"""Compute mitigated expectation values of several diagonal observables.
 
-        # Get operator coeffs
-        if diagonal is None:
-            diagonal = self._z_diagonal(2 ** num_qubits)
-        # Apply transpose of mitigation matrix
-        coeffs = np.reshape(diagonal, num_qubits * [2])
-        einsum_args = [coeffs, list(range(num_qubits))]
-        for i, ainv in enumerate(reversed(ainvs)):
-            einsum_args += [ainv.T, [num_qubits + i, i]]
-        einsum_args += [list(range(num_qubits, 2 * num_qubits))]
-        coeffs = np.einsum(*einsum_args).ravel()
+        The single-qubit mitigation matrices are applied to all diagonals
+        in a single tensor contraction. See :meth:`expectation_value` for
+        additional information.
+
+        Args:
+            counts: counts object
+            diagonals: Optional, a list of diagonal value vectors, one for
+                       each observable. If ``None`` a single observable with
+                       the default value :math:`[1, -1]^\otimes n` is used.
+            qubits: Optional, the measured physical qubits the count
+                    bitstrings correspond to. If None qubits are assumed to be
+                    :math:`[0, ..., n-1]`.
+            clbits: Optional, if not None marginalize counts to the specified bits.
+
+        Returns:
+            (np.ndarray, np.ndarray): the arrays of expectation values and
+            standard deviations for each diagonal.
+        """
+        expvals, stddevs = self.batch_expectation_values(
+            [counts], diagonals=diagonals, qubits=qubits, clbits=clbits)
+        return expvals[0], stddevs[0]
+
+    def batch_expectation_values(self,
+                                 counts_list: List[Dict],
+                                 diagonals: Optional[List[np.ndarray]] = None,
+                                 qubits: Optional[List[int]] = None,
+                                 clbits: Optional[List[int]] = None,
+                                 ) -> Tuple[np.ndarray, np.ndarray]:
+        r"""Compute mitigated expectation values for a list of counts.
 
-        return _expval_with_stddev(coeffs, probs, shots)
+        The mitigated diagonal coefficients are computed once and shared
+        by all counts objects.
+
+        Args:
+            counts_list: list of counts objects.
+            diagonals: Optional, a list of diagonal value vectors, one for
+                       each observable. If ``None`` a single observable with
+                       the default value :math:`[1, -1]^\otimes n` is used.
+            qubits: Optional, the measured physical qubits the count
+                    bitstrings correspond to. If None qubits are assumed to be
+                    :math:`[0, ..., n-1]`.
+            clbits: Optional, if not None marginalize counts to the specified bits.
+
+        Returns:
+            (np.ndarray, np.ndarray): the expectation values and standard
+            deviations as arrays of shape ``(len(counts_list), len(diagonals))``.
+        """
+        if diagonals is None or all(isinstance(diag, str) for diag in diagonals):
+            return self._label_expectation_values(
+                counts_list, diagonals=diagonals, qubits=qubits, clbits=clbits)
+
+        coeffs = None
+        expvals = []
+        stddevs = []
+        for counts in counts_list:
+            # Get expectation value on specified qubits
+            probs, shots = counts_probability_vector(
+                counts, clbits=clbits, return_shots=True)
+
+            if coeffs is None:
+                num_qubits = int(np.log2(probs.shape[0]))
+                coeffs = self._mitigated_diagonals(diagonals, num_qubits, qubits)
+
+            expval, stddev = _expvals_with_stddev(coeffs, probs, shots)
+            expvals.append(expval)
+            stddevs.append(stddev)
+        return np.array(expvals), np.array(stddevs)
 
     def mitigation_matrix(self, qubits: List[int] = None) -> np.ndarray:
         r"""Return the measurement mitigation matrix for the specified qubits.
@@ -132,14 +195,9 @@ class TensoredExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Returns:
             np.ndarray: the measurement error mitigation matrix :math:`A^{-1}`.
         """
-        if qubits is None:
-            qubits = list(range(self._num_qubits))
-        if isinstance(qubits, int):
-            qubits = [qubits]
-        mat = self._mitigation_mats[qubits[0]]
-        for i in qubits[1:]:
-            mat = np.kron(self._mitigation_mats[qubits[i]], mat)
-        return mat
+        qubits = self._qubits_key(qubits)
+        return self._cache.get(('mitigation', qubits),
+                               lambda: self._kron(self._mitigation_mats, qubits))
 
     def assignment_matrix(self, qubits: List[int] = None) -> np.ndarray:
         r"""Return the measurement assignment matrix for specified qubits.
@@ -154,14 +212,9 @@ class TensoredExpvalMeasMitigator(BaseExpvalMeasMitigator):
         Returns:
             np.ndarray: the assignment matrix A.
         """
-        if qubits is None:
-            qubits = list(range(self._num_qubits))
-        if isinstance(qubits, int):
-            qubits = [qubits]
-        mat = self._assignment_mats[qubits[0]]
-        for i in qubits[1:]:
-            mat = np.kron(self._assignment_mats[qubits[i]], mat)
-        return mat
+        qubits = self._qubits_key(qubits)
+        return self._cache.get(('assignment', qubits),
+                               lambda: self._kron(self._assignment_mats, qubits))
 
     def assignment_fidelity(self, qubits: Optional[List[int]] = None) -> float:
         r"""Return the measurement assignment fidelity on the specified qubits.
@@ -186,10 +239,94 @@ class TensoredExpvalMeasMitigator(BaseExpvalMeasMitigator):
             fid *= np.mean(self._assignment_mats[i].diagonal())
         return fid
 
+    def _label_expectation_values(self,
+                                  counts_list: List[Dict],
+                                  diagonals: Optional[List[str]] = None,
+                                  qubits: Optional[List[int]] = None,
+                                  clbits: Optional[List[int]] = None,
+                                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute mitigated expectation values of string label diagonals.
+
+        The single-qubit mitigation matrices are applied as local factors
+        to the count outcomes, so this does not require any :math:`2^n`
+        vectors.
+        """
+        expvals = []
+        stddevs = []
+        for counts in counts_list:
+            outcomes, probs, num_bits = counts_outcomes(counts, clbits=clbits)
+            shots = probs.sum()
+            probs = probs / shots
+            if qubits is None:
+                ainvs = self._mitigation_mats[:num_bits]
+            else:
+                ainvs = self._mitigation_mats[list(qubits)]
+            labels = [None] if diagonals is None else diagonals
+            coeffs = np.array([_diagonal_coeffs(label, outcomes, num_bits, ainvs)
+                               for label in labels])
+            expval, stddev = _expvals_with_stddev(coeffs, probs, shots)
+            expvals.append(expval)
+            stddevs.append(stddev)
+        return np.array(expvals), np.array(stddevs)
+
+    def _mitigated_diagonals(self,
+                             diagonals: Optional[List[np.ndarray]],
+                             num_qubits: int,
+                             qubits: Optional[List[int]] = None) -> np.ndarray:
+        """Apply the transpose of the mitigation matrix to a list of diagonals"""
+        if qubits is None:
+            qubits = tuple(range(num_qubits))
+        qubits = self._qubits_key(qubits)
+
+        # Get operator coeffs
+        if diagonals is None:
+            diagonals = [self._z_diagonal(2 ** num_qubits)]
+        diagonals = np.atleast_2d([_label_diagonal(diag) if isinstance(diag, str)
+                                   else diag for diag in diagonals])
+        key = ('coeffs', qubits, _MatrixCache.array_key(diagonals))
+        return self._cache.get(
+            key, lambda: self._einsum_diagonals(diagonals, num_qubits, qubits))
+
+    def _einsum_diagonals(self,
+                          diagonals: np.ndarray,
+                          num_qubits: int,
+                          qubits: Tuple[int]) -> np.ndarray:
+        """Contract the single-qubit mitigation matrices with the diagonals"""
+        ainvs = self._mitigation_mats[list(qubits)]
+        num_diagonals = diagonals.shape[0]
+
+        # Apply transpose of mitigation matrix to each diagonal, using
+        # the last einsum index to label the diagonals
+        batch = 2 * num_qubits
+        coeffs = np.reshape(diagonals, [num_diagonals] + num_qubits * [2])
+        einsum_args = [coeffs, [batch] + list(range(num_qubits))]
+        for i, ainv in enumerate(reversed(ainvs)):
+            einsum_args += [ainv.T, [num_qubits + i, i]]
+        einsum_args += [[batch] + list(range(num_qubits, 2 * num_qubits))]
+        return np.reshape(np.einsum(*einsum_args), (num_diagonals, 2 ** num_qubits))
+
     def _compute_gamma(self, qubits=None):
         """Compute gamma for N-qubit mitigation"""
+        qubits = self._qubits_key(qubits)
+        return self._cache.get(('gamma', qubits),
+                               lambda: np.product(self._gammas[list(qubits)]))
+
+    def _qubits_key(self, qubits: Optional[List[int]] = None) -> Tuple[int]:
+        """Return the qubit tuple used as a cache key.
+
+        The qubit order is preserved since it determines the order of
+        the tensor product factors.
+        """
         if qubits is None:
-            gammas = self._gammas
-        else:
-            gammas = self._gammas[list(qubits)]
-        return np.product(gammas)
+            return tuple(range(self._num_qubits))
+        if isinstance(qubits, int):
+            return (qubits, )
+        return tuple(qubits)
+
+    @staticmethod
+    def _kron(mats: List[np.ndarray], qubits: Tuple[int]) -> np.ndarray:
+        """Return the tensor product of single-qubit matrices"""
+        mat = mats[qubits[0]]
+        for i in qubits[1:]:
+            mat = np.kron(mats[i], mat)
+        return mat
@@ -17,19 +17,20 @@ Measurement error mitigation utility functions.
 
 import logging
 from functools import partial
-from typing import Optional, List, Dict, Tuple
+from itertools import combinations
+from typing import Optional, List, Dict, Tuple, Union
 import numpy as np
 
 from qiskit.exceptions import QiskitError
 from qiskit.result import Counts, Result
-from qiskit.ignis.verification.tomography import marginal_counts, combine_counts
-from qiskit.ignis.numba import jit_fallback
+from qiskit.ignis.verification.tomography import combine_counts
+from qiskit.ignis.numba import jit_fallback, prange
 
 logger = logging.getLogger(__name__)
 
 
 def expectation_value(counts: Counts,
-                      diagonal: Optional[np.ndarray] = None,
+                      diagonal: Optional[Union[np.ndarray, str]] = None,
                       qubits: Optional[List[int]] = None,
                       clbits: Optional[List[int]] = None,
                       meas_mitigator: Optional = None,
@@ -44,7 +45,8 @@ def expectation_value(counts: Counts,
     Args:
         counts: counts object
         diagonal: Optional, the vector of diagonal values for summing the
-                    expectation value. If ``None`` the the default value is
+                    expectation value, or a string label of the diagonal.
+                    If ``None`` the the default value is
                     :math:`[1, -1]^\otimes n`.
         qubits: Optional, the measured physical qubits the count
                 bitstrings correspond to. If None qubits are assumed to be
@@ -61,6 +63,15 @@ def expectation_value(counts: Counts,
         no diagonal is specified the diagonal of the Pauli operator
         :math:`O = \mbox{diag}(Z^{\otimes n}) = [1, -1]^{\otimes n}` is used.
 
+        The diagonal may also be specified by a string label of ``'I'``,
+        ``'Z'``, ``'0'`` and ``'1'`` characters for the tensor product of the
+        identity, Pauli-Z, and the :math:`|0\rangle\!\langle 0|` and
+        :math:`|1\rangle\!\langle 1|` projectors, with the right-most
+        character acting on the first bit. For example ``'ZIZ'`` is the
+        Pauli :math:`Z_2 Z_0` observable. String labels are evaluated
+        directly from the count outcomes without constructing the
+        :math:`2^n` diagonal vector.
+
         The ``clbits`` kwarg is used to marginalize the input counts dictionary
         over the specified bit-values, and the ``qubits`` kwarg is used to specify
         which physical qubits these bit-values correspond to as
@@ -77,27 +88,99 @@ def expectation_value(counts: Counts,
             counts, diagonal=diagonal, clbits=clbits,
             qubits=qubits)
 
-    # Marginalize counts
-    if clbits is not None:
-        counts = marginal_counts(counts, meas_qubits=clbits)
-
-    # Get counts shots and probabilities
-    probs = np.array(list(counts.values()))
+    # Get marginal counts outcomes, shots and probabilities
+    outcomes, probs, num_bits = counts_outcomes(counts, clbits=clbits)
     shots = probs.sum()
     probs = probs / shots
 
     # Get diagonal operator coefficients
-    if diagonal is None:
-        coeffs = np.array([(-1) ** (key.count('1') % 2)
-                           for key in counts.keys()], dtype=probs.dtype)
-    else:
-        diagonal = np.asarray(diagonal)
-        keys = [int(key, 2) for key in counts.keys()]
-        coeffs = np.asarray(diagonal[keys], dtype=probs.dtype)
+    coeffs = _diagonal_coeffs(diagonal, outcomes, num_bits)
 
     return _expval_with_stddev(coeffs, probs, shots)
 
 
+def expectation_values(counts: Counts,
+                       diagonals: Optional[List[Union[np.ndarray, str]]] = None,
+                       qubits: Optional[List[int]] = None,
+                       clbits: Optional[List[int]] = None,
+                       meas_mitigator: Optional = None,
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+    r"""Compute the expectation values of several diagonal operators from counts.
+
+    This is the batched version of :func:`expectation_value`. The counts are
+    only processed once, and all observables are evaluated together as a single
+    matrix product.
+
+    Args:
+        counts: counts object
+        diagonals: Optional, a list of diagonal value vectors or string
+                   labels, one for each observable. If ``None`` a single
+                   observable with the default value
+                   :math:`[1, -1]^\otimes n` is used.
+        qubits: Optional, the measured physical qubits the count
+                bitstrings correspond to. If None qubits are assumed to be
+                :math:`[0, ..., n-1]`.
+        clbits: Optional, if not None marginalize counts to the specified bits.
+        meas_mitigator: Optional, a measurement mitigator to apply mitigation.
+
+    Returns:
+        (np.ndarray, np.ndarray): the arrays of expectation values and
+        standard deviations for each diagonal.
+    """
+    if meas_mitigator is not None:
+        # Use mitigator expectation values method
+        return meas_mitigator.expectation_values(
+            counts, diagonals=diagonals, clbits=clbits,
+            qubits=qubits)
+
+    # Get marginal counts outcomes, shots and probabilities
+    outcomes, probs, num_bits = counts_outcomes(counts, clbits=clbits)
+    shots = probs.sum()
+    probs = probs / shots
+
+    # Get diagonal operator coefficients
+    if diagonals is None:
+        diagonals = [None]
+    coeffs = np.array([_diagonal_coeffs(diagonal, outcomes, num_bits)
+                       for diagonal in diagonals])
+
+    return _expvals_with_stddev(coeffs, probs, shots)
+
+
+def counts_outcomes(counts: Counts,
+                    clbits: Optional[List[int]] = None) -> Tuple[
+                        np.ndarray, np.ndarray, int]:
+    """Return the integer outcomes and their counts for a counts object.
+
+    Unlike :func:`counts_probability_vector` this does not construct a
+    :math:`2^n` vector, and marginalization is done using integer bit
+    operations on the observed outcomes.
+
+    Args:
+        counts: counts object
+        clbits: Optional, marginalize counts to just these bits.
+
+    Returns:
+        tuple: (outcomes, values, num_bits) the integer outcomes, the
+               count value for each outcome, and the number of bits.
+    """
+    keys = [key.replace(' ', '') for key in counts.keys()]
+    num_bits = len(keys[0])
+    outcomes = np.array([int(key, 2) for key in keys], dtype=np.int64)
+    values = np.array(list(counts.values()))
+
+    # Marginalize counts
+    if clbits is not None:
+        # Marginal bits are kept in ascending clbit order
+        marginal = np.zeros_like(outcomes)
+        for i, clbit in enumerate(sorted(clbits)):
+            marginal |= ((outcomes >> clbit) & 1) << i
+        outcomes, inverse = np.unique(marginal, return_inverse=True)
+        values = np.bincount(inverse, weights=values)
+        num_bits = len(clbits)
+    return outcomes, values, num_bits
+
+
 def counts_probability_vector(
         counts: Counts,
         qubits: Optional[List[int]] = None,
@@ -120,19 +203,16 @@ def counts_probability_vector(
         np.ndarray: a probability vector for all count outcomes.
     """
     # Marginalize counts
-    if clbits is not None:
-        counts = marginal_counts(counts, meas_qubits=clbits)
+    outcomes, values, num_bits = counts_outcomes(counts, clbits=clbits)
 
     # Get total number of qubits
     if num_qubits is None:
-        num_qubits = len(next(iter(counts)))
+        num_qubits = num_bits
 
     # Get vector
     vec = np.zeros(2**num_qubits, dtype=float)
-    shots = 0
-    for key, val in counts.items():
-        shots += val
-        vec[int(key, 2)] = val
+    shots = values.sum()
+    vec[outcomes] = values
     vec /= shots
 
     # Remap qubits
@@ -178,7 +258,202 @@ def calibration_data(result: Result,
     return cal_data, num_qubits, method
 
 
-def assignment_matrix(cal_data: Dict[int, Dict[int, int]],
+class ExpvalCalibrationData:
+    """Streaming accumulator for expval measurement calibration data.
+
+    Calibration counts are accumulated directly into unnormalized
+    assignment matrix statistics rather than stored as counts dictionaries.
+    These are the single-qubit local statistics for all qubits, the two-qubit
+    local statistics for all qubit pairs for the CTMP method, and the full
+    N-qubit statistics for the complete method. Calibration results can
+    be added one at a time using :meth:`add_result`.
+    """
+
+    def __init__(self,
+                 result: Optional[Result] = None,
+                 metadata: Optional[List[Dict[str, any]]] = None,
+                 parallel: bool = False,
+                 num_qubits: Optional[int] = None,
+                 method: Optional[str] = None):
+        """Initialize calibration data.
+
+        Args:
+            result: Optional, Qiskit result object to add.
+            metadata: Optional, mitigation generator metadata for result.
+            parallel: Optional, use Numba parallel kernels for accumulating
+                      the calibration statistics if Numba is installed.
+            num_qubits: Optional, the number of calibrated qubits. If ``None``
+                        this is set from the first added result.
+            method: Optional, the calibration method if ``num_qubits`` is
+                    specified.
+        """
+        self._parallel = parallel
+        self._num_qubits = None
+        self._method = None
+        self._qubit_stats = None
+        self._pair_stats = None
+        self._pair_indices = None
+        self._full_stats = None
+        if num_qubits is not None:
+            self._initialize(num_qubits, method)
+        if result is not None:
+            self.add_result(result, metadata)
+
+    @property
+    def num_qubits(self) -> int:
+        """Return the number of calibrated qubits."""
+        return self._num_qubits
+
+    @property
+    def method(self) -> str:
+        """Return the calibration method."""
+        return self._method
+
+    def add_result(self, result: Result, metadata: List[Dict[str, any]]):
+        """Add calibration counts from a result.
+
+        Args:
+            result: Qiskit result object.
+            metadata: mitigation generator metadata.
+
+        Raises:
+            QiskitError: if the result does not match the calibrated qubits.
+        """
+        for i, meta in enumerate(metadata):
+            if meta.get('experiment') == 'meas_mit':
+                if self._num_qubits is None:
+                    self._initialize(len(meta['cal']), meta.get('method', None))
+                elif len(meta['cal']) != self._num_qubits:
+                    raise QiskitError(
+                        'Calibration label {} does not match the number of'
+                        ' calibrated qubits {}.'.format(meta['cal'], self._num_qubits))
+                counts = result.get_counts(i).int_outcomes()
+                self.add_counts(int(meta['cal'], 2), counts)
+
+    def add_counts(self, cal: int, counts: Dict[int, int]):
+        """Add calibration counts for a prepared basis state.
+
+        Args:
+            cal: the integer label of the prepared basis state.
+            counts: integer outcome counts dictionary.
+
+        Raises:
+            QiskitError: if the calibration data has not been initialized.
+        """
+        if self._num_qubits is None:
+            raise QiskitError('Calibration data number of qubits is not set.')
+        bit_count, accum_full, accum_qubits, accum_pairs = _CAL_KERNELS[self._parallel]
+        outcomes = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=float, count=len(counts))
+        if self._full_stats is not None:
+            accum_full(self._full_stats, cal, outcomes, values)
+
+        # Only outcomes with at most 2 errors contribute to local statistics
+        num_errors = bit_count(outcomes ^ cal)
+        keep = num_errors <= 2
+        outcomes = outcomes[keep]
+        values = values[keep]
+        accum_qubits(self._qubit_stats, cal, outcomes, values)
+        if self._pair_stats is not None:
+            accum_pairs(self._pair_stats, self._pair_indices,
+                        cal, outcomes, values)
+
+    def assignment_matrix(self, qubits: Optional[List[int]] = None) -> np.ndarray:
+        """Computes the assignment matrix for specified qubits.
+
+        Args:
+            qubits: Optional, the qubit subset to construct the matrix on.
+
+        Returns:
+            np.ndarray: the constructed A-matrix.
+
+        Raises:
+            QiskitError: if the calibration data is not sufficient for
+                         reconstruction on the specified qubits.
+        """
+        if qubits is not None and len(qubits) == 1:
+            amat = self._qubit_stats[qubits[0]].copy()
+        elif (qubits is not None and len(qubits) == 2
+              and self._pair_stats is not None):
+            if qubits[0] < qubits[1]:
+                pos = self._pair_index(qubits[0], qubits[1])
+                amat = self._pair_stats[pos].copy()
+            else:
+                # Swap the bit order of the sorted pair matrix
+                pos = self._pair_index(qubits[1], qubits[0])
+                amat = self._pair_stats[pos][[0, 2, 1, 3]][:, [0, 2, 1, 3]]
+        elif self._full_stats is None:
+            raise QiskitError(
+                'Insufficient calibration data to fit assignment matrix'
+                ' on qubits {}'.format(qubits))
+        elif qubits is None:
+            amat = self._full_stats.copy()
+        else:
+            qubits = np.asarray(qubits)
+            mask = _amat_mask(qubits, self._num_qubits)
+            amat = np.zeros(2 * [1 << qubits.size], dtype=float)
+            for cal in np.flatnonzero(self._full_stats.sum(axis=0)):
+                outcomes = np.flatnonzero(self._full_stats[:, cal])
+                _amat_accum_local(qubits, mask, amat, cal, outcomes,
+                                  self._full_stats[outcomes, cal])
+
+        renorm = amat.sum(axis=0, keepdims=True)
+        if np.any(renorm == 0):
+            raise QiskitError(
+                'Insufficient calibration data to fit assignment matrix'
+                ' on qubits {}'.format(
+                    list(range(self._num_qubits)) if qubits is None else list(qubits)))
+        return amat / renorm
+
+    def pair_assignment_matrices(self, pairs: np.ndarray) -> np.ndarray:
+        """Return the two-qubit assignment matrices for a list of qubit pairs.
+
+        Args:
+            pairs: array of sorted qubit pairs of shape ``(num_pairs, 2)``.
+
+        Returns:
+            np.ndarray: the array of assignment matrices of shape
+            ``(num_pairs, 4, 4)``.
+
+        Raises:
+            QiskitError: if the calibration data is not sufficient for
+                         reconstruction on the specified qubits.
+        """
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        if self._pair_stats is None:
+            return np.array([self.assignment_matrix(pair) for pair in pairs],
+                            dtype=float).reshape(-1, 4, 4)
+        amats = self._pair_stats[self._pair_index(pairs[:, 0], pairs[:, 1])]
+        renorm = amats.sum(axis=1, keepdims=True)
+        if np.any(renorm == 0):
+            pos = np.flatnonzero(np.any(renorm == 0, axis=(1, 2)))[0]
+            raise QiskitError(
+                'Insufficient calibration data to fit assignment matrix'
+                ' on qubits {}'.format(pairs[pos].tolist()))
+        return amats / renorm
+
+    def _initialize(self, num_qubits: int, method: Optional[str] = None):
+        """Allocate the assignment matrix statistics."""
+        self._num_qubits = num_qubits
+        self._method = method
+        self._qubit_stats = np.zeros((num_qubits, 2, 2), dtype=float)
+        if method in ['CTMP', 'ctmp']:
+            self._pair_indices = np.array(
+                list(combinations(range(num_qubits), 2)),
+                dtype=np.int64).reshape(-1, 2)
+            self._pair_stats = np.zeros((len(self._pair_indices), 4, 4), dtype=float)
+        if method == 'complete':
+            self._full_stats = np.zeros(2 * [1 << num_qubits], dtype=float)
+
+    def _pair_index(self,
+                    qubit0: Union[int, np.ndarray],
+                    qubit1: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """Return the position of a sorted qubit pair in the pair statistics."""
+        # Pairs are ordered as itertools.combinations(range(num_qubits), 2)
+        return (qubit0 * (2 * self._num_qubits - qubit0 - 1)) // 2 + qubit1 - qubit0 - 1
+
+
+def assignment_matrix(cal_data: Union[Dict[int, Dict[int, int]], ExpvalCalibrationData],
                       num_qubits: int,
                       qubits: Optional[List[int]] = None) -> np.array:
     """Computes the assignment matrix for specified qubits.
@@ -195,6 +470,9 @@ def assignment_matrix(cal_data: Dict[int, Dict[int, int]],
         QiskitError: if the calibration data is not sufficient for
                      reconstruction on the specified qubits.
     """
+    if isinstance(cal_data, ExpvalCalibrationData):
+        return cal_data.assignment_matrix(qubits)
+
     # If qubits is None construct full A-matrix from calibration data
     # Otherwise we compute the local A-matrix on specified
     # qubits subset. This involves filtering the cal data
@@ -225,6 +503,71 @@ def assignment_matrix(cal_data: Dict[int, Dict[int, int]],
     return amat / renorm
 
 
+_LABEL_DIAGONALS = {
+    'Z': np.array([1, -1], dtype=float),
+    '0': np.array([1, 0], dtype=float),
+    '1': np.array([0, 1], dtype=float),
+}
+
+
+def _diagonal_coeffs(diagonal: Optional[Union[np.ndarray, str]],
+                     outcomes: np.ndarray,
+                     num_bits: int,
+                     mitigation_mats: Optional[np.ndarray] = None) -> np.ndarray:
+    r"""Return the diagonal operator coefficients for integer outcomes.
+
+    Args:
+        diagonal: the diagonal vector or string label. If None the
+                  :math:`Z^{\otimes n}` diagonal is used.
+        outcomes: integer count outcomes.
+        num_bits: the number of bits of the count outcomes.
+        mitigation_mats: Optional, single-qubit mitigation matrices for
+                         each bit to apply to a string label diagonal.
+
+    Returns:
+        np.ndarray: the coefficient for each outcome.
+
+    Raises:
+        QiskitError: if the diagonal label is not valid.
+    """
+    if diagonal is None:
+        diagonal = num_bits * 'Z'
+    if not isinstance(diagonal, str):
+        return np.asarray(np.asarray(diagonal)[outcomes], dtype=float)
+
+    if len(diagonal) != num_bits:
+        raise QiskitError(
+            'Diagonal label "{}" does not match the number of bits ({}).'.format(
+                diagonal, num_bits))
+    coeffs = np.ones(outcomes.size, dtype=float)
+    for bit, char in enumerate(reversed(diagonal)):
+        # Identity factors are trivial since the columns of the
+        # (mitigation) matrices sum to 1
+        if char == 'I':
+            continue
+        if char not in _LABEL_DIAGONALS:
+            raise QiskitError('Invalid diagonal label "{}".'.format(diagonal))
+        local_diag = _LABEL_DIAGONALS[char]
+        if mitigation_mats is not None:
+            local_diag = mitigation_mats[bit].T.dot(local_diag)
+        coeffs *= local_diag[(outcomes >> bit) & 1]
+    return coeffs
+
+
+def _label_diagonal(label: str) -> np.ndarray:
+    """Return the :math:`2^n` diagonal vector of a diagonal string label."""
+    diagonal = np.ones(1, dtype=float)
+    for char in label:
+        if char == 'I':
+            local_diag = np.ones(2, dtype=float)
+        elif char in _LABEL_DIAGONALS:
+            local_diag = _LABEL_DIAGONALS[char]
+        else:
+            raise QiskitError('Invalid diagonal label "{}".'.format(label))
+        diagonal = np.kron(diagonal, local_diag)
+    return diagonal
+
+
 def _expval_with_stddev(coeffs: np.ndarray,
                         probs: np.ndarray,
                         shots: int) -> Tuple[float, float]:
@@ -238,20 +581,40 @@ def _expval_with_stddev(coeffs: np.ndarray,
     Returns:
         tuple: (expval, stddev) expectation value and standard deviation.
     """
-    # Compute expval
-    expval = coeffs.dot(probs)
+    expvals, stddevs = _expvals_with_stddev(np.atleast_2d(coeffs), probs, shots)
+    return expvals[0], stddevs[0]
+
+
+def _expvals_with_stddev(coeffs: np.ndarray,
+                         probs: np.ndarray,
+                         shots: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute expectation values and standard deviations for several operators.
+
+    Args:
+        coeffs: 2D array of diagonal operator coefficients, one row per operator.
+        probs: array of measurement probabilities.
+        shots: total number of shots to obtain probabilities.
+
+    Returns:
+        tuple: (expvals, stddevs) arrays of expectation values and
+               standard deviations.
+    """
+    # Compute expvals
+    expvals = coeffs.dot(probs)
 
-    # Compute variance
-    sq_expval = (coeffs ** 2).dot(probs)
-    variance = (sq_expval - expval ** 2) / shots
+    # Compute variances
+    sq_expvals = (coeffs ** 2).dot(probs)
+    variances = np.real(sq_expvals - expvals ** 2) / shots
 
-    # Compute standard deviation
-    if variance < 0 and not np.isclose(variance, 0):
+    # Compute standard deviations
+    negative = (variances < 0) & ~np.isclose(variances, 0)
+    if np.any(negative):
         logger.warning(
             'Encountered a negative variance in expectation value calculation.'
-            '(%f). Setting standard deviation of result to 0.', variance)
-    stddev = np.sqrt(variance) if variance > 0 else 0.0
-    return expval, stddev
+            '(%f). Setting standard deviation of result to 0.',
+            np.min(variances[negative]))
+    stddevs = np.sqrt(np.where(variances > 0, variances, 0.0))
+    return expvals, stddevs
 
 
 @jit_fallback
@@ -290,3 +653,53 @@ def _amat_accum_full(mat, cal, counts_keys, counts_values):
     """Accumulate calibration data on the specified matrix"""
     for i in range(counts_keys.size):
         mat[counts_keys[i], cal] += counts_values[i]
+
+
+def _bit_count(vals):
+    """Return the number of set bits of each integer in an array."""
+    counts = np.zeros(vals.size, dtype=np.int64)
+    for i in prange(vals.size):
+        val = vals[i]
+        while val:
+            val &= val - 1
+            counts[i] += 1
+    return counts
+
+
+def _cal_accum_full(mat, cal, outcomes, values):
+    """Accumulate calibration data on the full assignment matrix"""
+    # Outcomes are unique so each row is only updated once
+    for i in prange(outcomes.size):
+        mat[outcomes[i], cal] += values[i]
+
+
+def _cal_accum_qubits(mats, cal, outcomes, values):
+    """Accumulate calibration data on all single-qubit local matrices"""
+    for qubit in prange(mats.shape[0]):
+        mask = ~(1 << qubit)
+        x_ind = (cal >> qubit) & 1
+        for i in range(outcomes.size):
+            if ((outcomes[i] ^ cal) & mask) == 0:
+                y_ind = (outcomes[i] >> qubit) & 1
+                mats[qubit, y_ind, x_ind] += values[i]
+
+
+def _cal_accum_pairs(mats, pairs, cal, outcomes, values):
+    """Accumulate calibration data on all two-qubit local matrices"""
+    for pos in prange(pairs.shape[0]):
+        qubit0 = pairs[pos, 0]
+        qubit1 = pairs[pos, 1]
+        mask = ~((1 << qubit0) | (1 << qubit1))
+        x_ind = (((cal >> qubit0) & 1) << 1) | ((cal >> qubit1) & 1)
+        for i in range(outcomes.size):
+            if ((outcomes[i] ^ cal) & mask) == 0:
+                y_ind = (((outcomes[i] >> qubit0) & 1) << 1) | ((outcomes[i] >> qubit1) & 1)
+                mats[pos, y_ind, x_ind] += values[i]
+
+
+# Serial and Numba parallel versions of the calibration accumulation kernels
+_CAL_KERNELS = {
+    parallel: tuple(jit_fallback(kernel, parallel=parallel) for kernel in [
+        _bit_count, _cal_accum_full, _cal_accum_qubits, _cal_accum_pairs])
+    for parallel in [False, True]
+}
@@ -15,6 +15,7 @@
 """Optional support for Numba just-in-time compilation."""
 
 import logging
+from functools import partial
 logger = logging.getLogger(__name__)
 
 try:
@@ -27,9 +28,27 @@ except ImportError:
                 'https://pypi.org/project/numba/')
 
 
-def jit_fallback(func):
-    """Decorator to try to apply numba JIT compilation."""
+def jit_fallback(func=None, parallel=False):
+    """Decorator to try to apply numba JIT compilation.
+
+    Args:
+        func (callable): the function to compile.
+        parallel (bool): enable Numba parallelization of :data:`prange` loops.
+
+    Returns:
+        callable: the compiled function, or the original function if Numba
+        is not installed.
+    """
+    if func is None:
+        return partial(jit_fallback, parallel=parallel)
     if _HAS_NUMBA:
-        return numba.jit(nopython=True)(func)
+        return numba.jit(nopython=True, parallel=parallel)(func)
     else:
         return func
+
+
+# Parallel range for loops in parallel JIT compiled functions
+if _HAS_NUMBA:
+    prange = numba.prange
+else:
+    prange = range
@@ -39,13 +39,21 @@ as well as performing interleaved RB, purity RB and RB on the non-Clifford CNOT-
    :toctree: ../stubs/
 
    randomized_benchmarking_seq
+   iter_randomized_benchmarking_seq
+   device_randomized_benchmarking_seq
+   plan_rb_layers
    RBFitter
    InterleavedRBFitter
    PurityRBFitter
    CNOTDihedralRBFitter
    CNOTDihedral
+   CNOTDihedralTable
+   cnotdihedral_table
+   CliffordTable
+   clifford_table
    count_gates
    gates_per_clifford
+   gates_per_clifford_from_group
    calculate_1q_epg
    calculate_2q_epg
    calculate_1q_epc
@@ -116,10 +124,16 @@ Accreditation
 """
 from .quantum_volume import qv_circuits, QVFitter
 from .randomized_benchmarking import (CNOTDihedral,
+                                      CNOTDihedralTable, cnotdihedral_table,
+                                      CliffordTable, clifford_table,
                                       randomized_benchmarking_seq,
+                                      iter_randomized_benchmarking_seq,
+                                      device_randomized_benchmarking_seq,
+                                      plan_rb_layers,
                                       RBFitter, InterleavedRBFitter,
                                       PurityRBFitter, CNOTDihedralRBFitter,
                                       count_gates, gates_per_clifford,
+                                      gates_per_clifford_from_group,
                                       coherence_limit, twoQ_clifford_error,
                                       calculate_1q_epg, calculate_2q_epg,
                                       calculate_1q_epc, calculate_2q_epc)
@@ -19,12 +19,15 @@ Based on Cross et al. "Validating quantum computers using
 randomized model circuits", arXiv:1811.12926
 """
 
+import hashlib
 import math
+import os
 import warnings
 import numpy as np
 from qiskit import QiskitError
+from qiskit.extensions import UnitaryGate
+from qiskit.tools import parallel_map
 from qiskit.visualization import plot_histogram
-from ...utils import build_counts_dict_from_list
 
 try:
     from matplotlib import get_backend
@@ -60,7 +63,15 @@ class QVFitter:
         self._heavy_output_prob_ideal = {}
         self._heavy_output_prob_exp = {}
         self._ydata = []
-        self._heavy_outputs = {}
+        self._heavy_output_indices = {}
+        # running sums of the heavy output counts, shots and ideal heavy
+        # output probabilities, and the number of trials of each depth
+        self._depth_indices = {depth: depthidx for depthidx, depth
+                               in reversed(list(enumerate(self._depths)))}
+        self._depth_heavy_counts = np.zeros(len(self._depths))
+        self._depth_shots = np.zeros(len(self._depths))
+        self._depth_ideal_probs = np.zeros(len(self._depths))
+        self._depth_trials = np.zeros(len(self._depths), dtype=int)
         self.add_statevectors(statevector_result)
         self.add_data(backend_result)
 
@@ -82,7 +93,14 @@ class QVFitter:
     @property
     def heavy_outputs(self):
         """Return the ideal heavy outputs dictionary."""
-        return self._heavy_outputs
+        return {circ_name: self._heavy_strings(circ_name)
+                for circ_name in self._heavy_output_indices}
+
+    @property
+    def heavy_output_indices(self):
+        """Return the sorted arrays of the integer values of the ideal heavy
+        outputs of each circuit."""
+        return self._heavy_output_indices
 
     @property
     def heavy_output_counts(self):
@@ -123,35 +141,92 @@ class QVFitter:
 
                 circ_name = qvcirc.header.name
 
-                # get the depth/width from the circuit name
-                # qv_depth_%d_trial_%d
-                depth = int(circ_name.split('_')[2])
+                # convert the result into an array of probabilities,
+                # indexed by the integer value of the output strings
+                qstate = np.asarray(result.get_statevector(circ_name))
+                self._add_ideal_probabilities(
+                    circ_name, np.real(qstate * qstate.conjugate()))
+
+    def add_ideal_circuits(self, circuits, num_processes=1, cache_dir=None):
+        """
+        Compute the ideal outputs of the circuits and convert to the heavy
+        outputs.
 
-                if circ_name in self._heavy_outputs:
-                    raise QiskitError("Already added the ideal result "
-                                      "for circuit %s" % circ_name)
+        This replaces running the ``circuits_nomeas`` of
+        :func:`~qiskit.ignis.verification.qv_circuits` on a statevector
+        simulator and calling :meth:`add_statevectors`. The output
+        probabilities are computed by a numpy statevector kernel applying
+        the two-qubit unitaries of the quantum volume layers.
 
-                # convert the result into probability dictionary
-                qstate = result.get_statevector(circ_name)
-                pvector = np.multiply(qstate, qstate.conjugate())
-                format_spec = "{0:0%db}" % depth
-                self._all_output_prob_ideal[circ_name] = \
-                    {format_spec.format(b): float(np.real(pvector[b])) for b in range(2**depth)}
+        Args:
+            circuits (list): the circuits without measurements, as a list of
+                circuits or a list of lists of circuits (one for each trial).
+            num_processes (int): the number of processes for simulating the
+                circuits in parallel (default is 1, i.e. serial simulation).
+            cache_dir (str): optional directory of cached output
+                probabilities. The probabilities of a circuit are stored in
+                the directory keyed by a hash of the unitaries of the
+                circuit, and later calls with the same circuits (e.g. from
+                the same seeds) load them without simulation.
 
-                median_prob = self._median_probabilities([self._all_output_prob_ideal[circ_name]])
-                self._heavy_outputs[circ_name] = \
-                    self._heavy_strings(self._all_output_prob_ideal[circ_name], median_prob[0])
+        Raises:
+            QiskitError: If the result has already been added for the
+                circuit, or a circuit has non-unitary instructions.
+        """
+        circuits = [circ for circs in circuits
+                    for circ in (circs if isinstance(circs, list)
+                                 else [circs])]
+        for circ in circuits:
+            if circ.name in self._heavy_output_indices:
+                raise QiskitError("Already added the ideal result "
+                                  "for circuit %s" % circ.name)
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        all_probs = parallel_map(_ideal_probabilities_task, circuits,
+                                 task_args=(cache_dir,),
+                                 num_processes=num_processes)
+        for circ, probs in zip(circuits, all_probs):
+            self._add_ideal_probabilities(circ.name, probs)
+
+    def _add_ideal_probabilities(self, circ_name, probs):
+        """
+        Add the ideal output probabilities of a circuit and convert to the
+        heavy outputs.
 
-                # calculate the heavy output probability
-                self._heavy_output_prob_ideal[circ_name] = \
-                    self._subset_probability(
-                        self._heavy_outputs[circ_name],
-                        self._all_output_prob_ideal[circ_name])
+        Args:
+            circ_name (str): the circuit name.
+            probs (np.ndarray): the probabilities of the outputs, indexed by
+                the integer value of the output strings.
+
+        Raises:
+            QiskitError: If the result has already been added for the circuit
+        """
+        if circ_name in self._heavy_output_indices:
+            raise QiskitError("Already added the ideal result "
+                              "for circuit %s" % circ_name)
+
+        self._all_output_prob_ideal[circ_name] = probs
+
+        # the heavy outputs are the sorted indices of the outputs
+        # with a probability above the median
+        median_prob = self._median_probabilities([probs])[0]
+        heavy_indices = np.flatnonzero(probs > median_prob)
+        self._heavy_output_indices[circ_name] = heavy_indices
+
+        # calculate the heavy output probability
+        self._heavy_output_prob_ideal[circ_name] = \
+            float(np.sum(probs[heavy_indices]))
 
     def add_data(self, new_backend_result, rerun_fit=True):
         """
         Add a new result. Re calculate fit
 
+        Only the experiments of the new results are processed: their counts
+        are added to the counts of their circuits, and the running sums of
+        the heavy output counts, shots and ideal heavy output probabilities
+        of each depth are updated.
+
         Args:
             new_backend_result (list): list of qv results
             rerun_fit (bool): re calculate the means and fit the result
@@ -171,21 +246,16 @@ class QVFitter:
             new_backend_result = [new_backend_result]
 
         for result in new_backend_result:
-            self._result_list.append(result)
-
-            # update the number of trials *if* new ones
-            # added.
             for qvcirc in result.results:
-                ntrials_circ = int(qvcirc.header.name.split('_')[-1])
-                if (ntrials_circ+1) > self._ntrials:
-                    self._ntrials = ntrials_circ+1
-
                 if qvcirc.header.name not in self._heavy_output_prob_ideal:
                     raise QiskitError('Ideal distribution '
                                       'must be loaded first')
 
+        for result in new_backend_result:
+            self._result_list.append(result)
+            self._process_result(result)
+
         if rerun_fit:
-            self.calc_data()
             self.calc_statistics()
 
     def calc_data(self):
@@ -194,80 +264,94 @@ class QVFitter:
 
         Calculate the heavy output probability.
 
+        The counts of all the results are processed again from scratch.
+        :meth:`add_data` already processes the counts of each new result.
+
         Additional information:
             Assumes that 'result' was executed is
             the output of circuits generated by qv_circuits,
         """
 
-        for trialidx in range(self._ntrials):
-            for _, depth in enumerate(self._depths):
-                circ_name = 'qv_depth_%d_trial_%d' % (depth, trialidx)
-
-                # get the counts form ALL executed circuits
-                count_list = []
-                for result in self._result_list:
-                    try:
-                        count_list.append(result.get_counts(circ_name))
-                    except (QiskitError, KeyError):
-                        pass
-
-                self._circ_counts[circ_name] = \
-                    build_counts_dict_from_list(count_list)
+        self._ntrials = 0
+        self._circ_counts = {}
+        self._circ_shots = {}
+        self._heavy_output_counts = {}
+        self._heavy_output_prob_exp = {}
+        self._depth_heavy_counts = np.zeros(len(self._depths))
+        self._depth_shots = np.zeros(len(self._depths))
+        self._depth_ideal_probs = np.zeros(len(self._depths))
+        self._depth_trials = np.zeros(len(self._depths), dtype=int)
 
-                self._circ_shots[circ_name] = \
-                    sum(self._circ_counts[circ_name].values())
+        for result in self._result_list:
+            self._process_result(result)
 
-                # calculate the experimental heavy output counts
-                self._heavy_output_counts[circ_name] = \
-                    self._subset_probability(
-                        self._heavy_outputs[circ_name],
-                        self._circ_counts[circ_name])
+    def _process_result(self, result):
+        """
+        Add the counts of the experiments of a result to the counts of their
+        circuits and to the running sums of their depths.
 
-                # calculate the experimental heavy output probability
-                self._heavy_output_prob_exp[circ_name] = \
-                    self._heavy_output_counts[circ_name]/self._circ_shots[circ_name]
+        Args:
+            result (Result): a qv result.
+        """
+        for expidx, qvcirc in enumerate(result.results):
+            circ_name = qvcirc.header.name
+            # qv_depth_%d_trial_%d
+            _, _, depth, _, trialidx = circ_name.split('_')
+            depthidx = self._depth_indices[int(depth)]
 
-                # calculate the experimental heavy output probability
-                self._heavy_output_prob_exp[circ_name] = \
-                    self._heavy_output_counts[circ_name] / self._circ_shots[circ_name]
+            # update the number of trials *if* new ones
+            # added.
+            self._ntrials = max(self._ntrials, int(trialidx) + 1)
+
+            counts = result.get_counts(expidx)
+            heavy_counts = self._subset_probability(
+                self._heavy_output_indices[circ_name], counts)
+            shots = sum(counts.values())
+
+            if circ_name not in self._circ_counts:
+                self._circ_counts[circ_name] = {}
+                self._circ_shots[circ_name] = 0
+                self._heavy_output_counts[circ_name] = 0
+                self._depth_ideal_probs[depthidx] += \
+                    self._heavy_output_prob_ideal[circ_name]
+                self._depth_trials[depthidx] += 1
+            circ_counts = self._circ_counts[circ_name]
+            for key, val in counts.items():
+                circ_counts[key] = circ_counts.get(key, 0) + val
+            self._circ_shots[circ_name] += shots
+            self._heavy_output_counts[circ_name] += heavy_counts
+            self._depth_heavy_counts[depthidx] += heavy_counts
+            self._depth_shots[depthidx] += shots
+
+            # calculate the experimental heavy output probability
+            self._heavy_output_prob_exp[circ_name] = \
+                self._heavy_output_counts[circ_name] / self._circ_shots[circ_name]
 
     def calc_statistics(self):
         """
         Convert the heavy outputs in the different trials into mean and error
         for plotting.
 
+        The means are computed from the running sums of each depth, which are
+        updated by :meth:`add_data`.
+
         Here we assume the error is due to a binomial distribution.
         Error (standard deviation) for binomial distribution is sqrt(np(1-p)),
-        where n is the number of trials (self._ntrials) and
-        p is the success probability (self._ydata[0][depthidx]/self._ntrials).
+        where n is the number of trials of the depth with added results and
+        p is the success probability (self._ydata[0][depthidx]).
         """
 
         self._ydata = np.zeros([4, len(self._depths)], dtype=float)
 
-        exp_vals = np.zeros(self._ntrials, dtype=float)
-        ideal_vals = np.zeros(self._ntrials, dtype=float)
-
-        for depthidx, depth in enumerate(self._depths):
+        # Calculate mean and error for experimental data
+        self._ydata[0] = self._depth_heavy_counts / self._depth_shots
+        self._ydata[1] = (self._ydata[0] * (1.0 - self._ydata[0])
+                          / self._depth_trials)**0.5
 
-            exp_shots = 0
-
-            for trialidx in range(self._ntrials):
-                cname = 'qv_depth_%d_trial_%d' % (depth, trialidx)
-                exp_vals[trialidx] = self._heavy_output_counts[cname]
-                exp_shots += self._circ_shots[cname]
-                ideal_vals[trialidx] = self._heavy_output_prob_ideal[cname]
-
-            # Calculate mean and error for experimental data
-            self._ydata[0][depthidx] = np.sum(exp_vals)/np.sum(exp_shots)
-            self._ydata[1][depthidx] = (self._ydata[0][depthidx] *
-                                        (1.0-self._ydata[0][depthidx])
-                                        / self._ntrials)**0.5
-
-            # Calculate mean and error for ideal data
-            self._ydata[2][depthidx] = np.mean(ideal_vals)
-            self._ydata[3][depthidx] = (self._ydata[2][depthidx] *
-                                        (1.0-self._ydata[2][depthidx])
-                                        / self._ntrials)**0.5
+        # Calculate mean and error for ideal data
+        self._ydata[2] = self._depth_ideal_probs / self._depth_trials
+        self._ydata[3] = (self._ydata[2] * (1.0 - self._ydata[2])
+                          / self._depth_trials)**0.5
 
     def plot_qv_data(self, ax=None, show_plt=True, figsize=(7, 5), set_title=True, title=None):
         """Plot the qv data as a function of depth
@@ -356,7 +440,10 @@ class QVFitter:
                 A figure for histogram of ideal and experiment probabilities.
         """
         circ_name = f"qv_depth_{depth}_trial_{trial_index}"
-        ideal_data = self._all_output_prob_ideal[circ_name]
+        probs = self._all_output_prob_ideal[circ_name]
+        format_spec = "{0:0%db}" % depth
+        ideal_data = {format_spec.format(b): float(prob)
+                      for b, prob in enumerate(probs)}
         exp_data = self._circ_counts[circ_name]
 
         if ax is None:
@@ -381,7 +468,7 @@ class QVFitter:
         ax.plot([], [], ' ', label=f'HOP~{self._heavy_output_prob_exp[circ_name]:.3f}')
 
         # plot median probability
-        median_prob = self._median_probabilities([self._all_output_prob_ideal[circ_name]])
+        median_prob = self._median_probabilities([probs])[0]
         ax.axhline(median_prob, color='r', linestyle='dashed', linewidth=1, label='Median')
         ax.legend()
         ax.set_title(f'Quantum Volume {2**depth}, Trial #{trial_index}', fontsize=14)
@@ -538,50 +625,191 @@ class QVFitter:
 
         return qv_list
 
-    def _heavy_strings(self, ideal_distribution, ideal_median):
-        """Return the set of heavy output strings.
+    def _heavy_strings(self, circ_name):
+        """Return the list of heavy output strings of a circuit.
 
         Args:
-            ideal_distribution (dict): dict of ideal output distribution
-                where keys are bit strings (as strings) and values are
-                probabilities of observing those strings
-            ideal_median (float): median probability across all outputs
+            circ_name (str): the circuit name.
 
         Returns:
             list: list the set of heavy output strings, i.e. those strings
                 whose ideal probability of occurrence exceeds the median.
         """
-        return list(filter(lambda x: ideal_distribution[x] > ideal_median,
-                           list(ideal_distribution.keys())))
+        depth = int(circ_name.split('_')[2])
+        format_spec = "{0:0%db}" % depth
+        return [format_spec.format(b)
+                for b in self._heavy_output_indices[circ_name].tolist()]
 
     def _median_probabilities(self, distributions):
         """Return a list of median probabilities.
 
+        The medians are found by partial sorting with ``np.partition``.
+
         Args:
-            distributions (list): list of dicts mapping binary strings
-                (as strings) to probabilities.
+            distributions (list): list of arrays of probabilities, or of
+                dicts mapping binary strings (as strings) to probabilities.
 
         Returns:
             list: a list of median probabilities.
         """
         medians = []
         for dist in distributions:
-            values = np.array(list(dist.values()))
-            medians.append(float(np.real(np.median(values))))
+            if isinstance(dist, dict):
+                dist = list(dist.values())
+            values = np.real(np.asarray(dist))
+            half = len(values) // 2
+            if len(values) % 2:
+                medians.append(float(np.partition(values, half)[half]))
+            else:
+                part = np.partition(values, [half - 1, half])
+                medians.append(float((part[half - 1] + part[half]) / 2))
 
         return medians
 
-    def _subset_probability(self, strings, distribution):
+    def _subset_probability(self, indices, distribution):
         """Return the probability of a subset of outcomes.
 
         Args:
-            strings (list): list of bit strings (as strings)
+            indices (np.ndarray): sorted array of the integer values of the
+                outcomes.
             distribution (dict): dict where keys are bit strings (as strings)
                 and values are probabilities of observing those strings
 
         Returns:
-            float: the probability of the subset of strings, i.e. the sum
-                of the probabilities of each string as given by the
+            float: the probability of the subset of outcomes, i.e. the sum
+                of the probabilities of each outcome as given by the
                 distribution.
         """
-        return sum([distribution.get(value, 0) for value in strings])
+        if not distribution or len(indices) == 0:
+            return 0
+        keys = np.fromiter((int(key.replace(' ', ''), 2)
+                            for key in distribution), dtype=np.int64,
+                           count=len(distribution))
+        values = np.array(list(distribution.values()))
+        pos = np.minimum(np.searchsorted(indices, keys), len(indices) - 1)
+        return values[indices[pos] == keys].sum().item()
+
+
+def _ideal_probabilities_task(circuit, cache_dir=None):
+    """Return the output probabilities of a circuit, using the disk cache.
+
+    Args:
+        circuit (QuantumCircuit): the circuit without measurements.
+        cache_dir (str): optional directory of cached probabilities.
+
+    Returns:
+        np.ndarray: the probabilities of the outputs.
+    """
+    num_qubits = circuit.num_qubits
+    unitaries = list(_circuit_unitaries(circuit, range(num_qubits)))
+    filename = None
+    if cache_dir is not None:
+        key = _circuit_key(num_qubits, unitaries)
+        filename = os.path.join(cache_dir, key + '.npy')
+        if os.path.exists(filename):
+            return np.load(filename)
+
+    probs = _ideal_probabilities(num_qubits, unitaries)
+
+    if filename is not None:
+        # write to a temporary file first, so that concurrent campaigns
+        # never read a partially written file
+        tmp_filename = '%s.%d.tmp' % (filename, os.getpid())
+        with open(tmp_filename, 'wb') as file:
+            np.save(file, probs)
+        os.replace(tmp_filename, filename)
+    return probs
+
+
+def _circuit_key(num_qubits, unitaries):
+    """Return the cache key of the content of a circuit.
+
+    Args:
+        num_qubits (int): the number of qubits of the circuit.
+        unitaries (list): the unitary matrices and their qubit indices,
+            as returned by :func:`_circuit_unitaries`.
+
+    Returns:
+        str: the key of the number of qubits and a hash of the unitaries.
+    """
+    digest = hashlib.sha256()
+    for mat, qubits in unitaries:
+        digest.update(np.asarray(qubits, dtype=np.int64).tobytes())
+        digest.update(np.ascontiguousarray(mat, dtype=complex).tobytes())
+    return 'qv_%d_%s' % (num_qubits, digest.hexdigest())
+
+
+def _ideal_probabilities(num_qubits, unitaries):
+    """Return the output probabilities of a circuit without measurements.
+
+    Args:
+        num_qubits (int): the number of qubits of the circuit.
+        unitaries (list): the unitary matrices and their qubit indices,
+            as returned by :func:`_circuit_unitaries`.
+
+    Returns:
+        np.ndarray: the probabilities of the outputs, indexed by the integer
+        value of the output strings.
+    """
+    state = np.zeros(2 ** num_qubits, dtype=complex)
+    state[0] = 1
+    # axis k of the state tensor is qubit num_qubits - 1 - k
+    state = state.reshape((2,) * num_qubits)
+    for mat, qubits in unitaries:
+        state = _apply_unitary(state, mat, qubits)
+    probs = np.abs(state.reshape(-1)) ** 2
+    return probs
+
+
+def _circuit_unitaries(circuit, qubits):
+    """Iterate over the unitary matrices of the instructions of a circuit.
+
+    The definitions of the instructions are expanded until the unitary
+    gates of the quantum volume layers, or gates with a matrix.
+
+    Args:
+        circuit (QuantumCircuit): the circuit.
+        qubits (list): the qubit indices of the circuit qubits.
+
+    Yields:
+        tuple: the unitary matrix and the list of its qubit indices.
+
+    Raises:
+        QiskitError: if the circuit has non-unitary instructions.
+    """
+    qubit_indices = {bit: qubits[idx]
+                     for idx, bit in enumerate(circuit.qubits)}
+    for inst, qargs, _ in circuit.data:
+        inst_qubits = [qubit_indices[qarg] for qarg in qargs]
+        if inst.name == 'barrier':
+            continue
+        if isinstance(inst, UnitaryGate):
+            yield inst.to_matrix(), inst_qubits
+        elif inst.definition is not None:
+            yield from _circuit_unitaries(inst.definition, inst_qubits)
+        elif hasattr(inst, 'to_matrix'):
+            yield inst.to_matrix(), inst_qubits
+        else:
+            raise QiskitError("Cannot compute the ideal output of the "
+                              "instruction %s" % inst.name)
+
+
+def _apply_unitary(state, mat, qubits):
+    """Apply a unitary matrix to qubits of a statevector tensor.
+
+    Args:
+        state (np.ndarray): the state tensor, where axis k is the qubit
+            ``num_qubits - 1 - k``.
+        mat (np.ndarray): the unitary matrix.
+        qubits (list): the qubit indices of the matrix, the first qubit is
+            the least significant.
+
+    Returns:
+        np.ndarray: the new state tensor.
+    """
+    num_qubits = state.ndim
+    size = len(qubits)
+    axes = [num_qubits - 1 - qubit for qubit in reversed(qubits)]
+    mat = np.reshape(mat, (2,) * (2 * size))
+    state = np.tensordot(mat, state, axes=(list(range(size, 2 * size)), axes))
+    return np.moveaxis(state, list(range(size)), axes)
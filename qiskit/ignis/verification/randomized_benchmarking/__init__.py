@@ -18,11 +18,15 @@ Randomized Benchmarking module
 """
 
 # Randomized Benchmarking functions
-from .circuits import randomized_benchmarking_seq
-from .dihedral import (CNOTDihedral, decompose_cnotdihedral, random_cnotdihedral)
+from .circuits import (randomized_benchmarking_seq, iter_randomized_benchmarking_seq,
+                       device_randomized_benchmarking_seq, plan_rb_layers)
+from .dihedral import (CNOTDihedral, decompose_cnotdihedral, random_cnotdihedral,
+                       compose_cnotdihedral_batch, CNOTDihedralTable,
+                       cnotdihedral_table)
 from .fitters import (RBFitter, InterleavedRBFitter, PurityRBFitter,
                       CNOTDihedralRBFitter)
-from .rb_utils import (count_gates, gates_per_clifford,
+from .rb_utils import (count_gates, gates_per_clifford, gates_per_clifford_from_group,
                        coherence_limit, twoQ_clifford_error,
                        calculate_1q_epg, calculate_2q_epg, calculate_1q_epc, calculate_2q_epc)
 from .rb_groups import RBgroup
+from .clifford_tables import CliffordTable, clifford_table
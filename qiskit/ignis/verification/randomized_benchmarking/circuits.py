@@ -20,16 +20,24 @@ Generates randomized benchmarking sequences
 """
 
 import copy
-from typing import List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from warnings import warn
 import numpy as np
 from numpy.random import RandomState
 import qiskit
 from qiskit.circuit import QuantumCircuit, Instruction
+from qiskit.circuit.barrier import Barrier
+from qiskit.tools import parallel_map
+from qiskit.transpiler import CouplingMap
 
 
 from .rb_groups import RBgroup
-from .dihedral import CNOTDihedral
+from .clifford_tables import TableElement
+from .dihedral import CNOTDihedral, compose_cnotdihedral_batch
+
+# Families of RB circuits
+RB_FAMILIES = ('rb', 'interleaved', 'cnotdihedral',
+               'cnotdihedral_interleaved', 'purity')
 
 
 def handle_length_multiplier(length_multiplier, len_pattern,
@@ -204,7 +212,10 @@ def randomized_benchmarking_seq(nseeds: int = 1,
                                           List[CNOTDihedral]]] = None,
                                 is_purity: bool = False,
                                 group_gates: Optional[str] = None,
-                                rand_seed: Optional[Union[int, RandomState]] = None) -> \
+                                rand_seed: Optional[Union[int, RandomState,
+                                                          np.random.Generator]] = None,
+                                basis_gates: Optional[List[str]] = None,
+                                num_processes: int = 1) -> \
         (List[List[QuantumCircuit]], List[List[int]],
          Optional[List[List[QuantumCircuit]]],
          Optional[List[List[List[QuantumCircuit]]]],
@@ -285,6 +296,24 @@ def randomized_benchmarking_seq(nseeds: int = 1,
             or ``group_gates='Non-Clifford'`` -- CNOT-Dihedral group.
 
         rand_seed: Optional. Set a fixed seed or generator for RNG.
+            The group elements of each seed are sampled from a separate
+            generator, spawned from a ``numpy.random.SeedSequence`` of
+            ``rand_seed`` with the seed index as spawn key. Hence with a
+            fixed integer ``rand_seed`` the circuits of each seed do not
+            depend on ``num_processes``, and a run with ``seed_offset``
+            reproduces the corresponding seeds of a single larger run.
+
+        basis_gates: Optional. A list of basis gate names, e.g.
+            ``['rz', 'sx', 'x', 'cx']``. If given, the group elements,
+            the inverses and the interleaved elements are emitted as
+            circuits already translated to these basis gates and optimized.
+            The translated circuit of each group element is computed once
+            and cached, so that the output circuits need little or no
+            further transpilation. The additional gates of purity RB
+            and CNOT-Dihedral RB circuits are not translated.
+
+        num_processes: The number of processes for generating the
+            seeds in parallel (default is 1, i.e. serial generation).
 
     Returns:
         A tuple of different fields depending on the inputs.
@@ -378,6 +407,328 @@ def randomized_benchmarking_seq(nseeds: int = 1,
              "Please use the `interleaved_elem` kwarg that supersedes it.",
              category=DeprecationWarning)
 
+    settings, xdata = _rb_settings(length_vector, rb_pattern,
+                                   length_multiplier, align_cliffs,
+                                   interleaved_elem, is_purity, group_gates,
+                                   basis_gates)
+    families = settings['families']
+    npurity = settings['npurity']
+
+    # The circuits of each seed are generated from an independent random
+    # generator spawned from a common root, so that the seeds can be
+    # generated in parallel, and adding seeds with seed_offset reproduces
+    # the circuits of a single run with more seeds
+    entropy = _seed_entropy(rand_seed)
+    seed_circuits = parallel_map(
+        _seed_circuits, list(range(seed_offset, seed_offset + nseeds)),
+        task_args=(entropy, settings), num_processes=num_processes)
+    outputs = {family: [circs[family] for circs in seed_circuits]
+               for family in families}
+
+    # output of purity rb
+    if 'purity' in families:
+        # purity circuits of each seed are ordered by the purity index
+        circuits_purity = [[list(circs) for circs in zip(*seed_purity)]
+                           if seed_purity else [[] for _ in range(npurity)]
+                           for seed_purity in outputs['purity']]
+        return circuits_purity, xdata, npurity
+    # output of non-clifford cnot-dihedral interleaved rb
+    if 'cnotdihedral_interleaved' in families:
+        return outputs['rb'], xdata, outputs['cnotdihedral'], \
+               outputs['interleaved'], outputs['cnotdihedral_interleaved']
+    # output of interleaved rb
+    if 'interleaved' in families:
+        return outputs['rb'], xdata, outputs['interleaved']
+    # output of Non-Clifford cnot-dihedral rb
+    if 'cnotdihedral' in families:
+        return outputs['rb'], xdata, outputs['cnotdihedral']
+    # output of standard (simultaneous) rb
+    return outputs['rb'], xdata
+
+
+def iter_randomized_benchmarking_seq(
+        nseeds: int = 1,
+        length_vector: Optional[List[int]] = None,
+        rb_pattern: Optional[List[List[int]]] = None,
+        length_multiplier: Optional[List[int]] = 1,
+        seed_offset: int = 0,
+        align_cliffs: bool = False,
+        interleaved_elem:
+        Optional[
+            Union[List[QuantumCircuit], List[Instruction],
+                  List[qiskit.quantum_info.operators.symplectic.Clifford],
+                  List[CNOTDihedral]]] = None,
+        is_purity: bool = False,
+        group_gates: Optional[str] = None,
+        rand_seed: Optional[Union[int, RandomState, np.random.Generator]] = None,
+        basis_gates: Optional[List[str]] = None,
+        families: Optional[List[str]] = None) -> \
+        Iterator[Tuple[int, int, Dict[str, Union[QuantumCircuit,
+                                                 List[QuantumCircuit]]]]]:
+    """Iterate over randomized benchmarking (RB) circuits as they are generated.
+
+    This is a streaming version of :func:`randomized_benchmarking_seq`
+    with the same arguments, that yields the circuits of each seed and
+    sequence length as soon as they are completed, and only constructs
+    the requested families of circuits. The circuits are identical to
+    the circuits of :func:`randomized_benchmarking_seq`, so that long
+    sweeps can be executed in batches without holding all circuits
+    in memory.
+
+    Args:
+        nseeds: The number of seeds.
+        length_vector: Length vector of the RB sequence lengths.
+        rb_pattern: A list of the lists of qubits indexes.
+        length_multiplier: An array that scales each RB sequence by
+            the multiplier.
+        seed_offset: What to start the seeds at.
+        align_cliffs: If ``True`` adds a barrier across all qubits in
+            the pattern after each set of group elements.
+        interleaved_elem: A list of QuantumCircuits or gate objects or
+            group elements that will be interleaved.
+        is_purity: ``True`` only for purity randomized benchmarking.
+        group_gates: On which group (or set of gates) we perform RB.
+        rand_seed: Optional. Set a fixed seed or generator for RNG.
+        basis_gates: Optional. A list of basis gate names for the
+            group elements.
+        families: Optional. The families of circuits to construct, a subset
+            of ``'rb'``, ``'interleaved'``, ``'cnotdihedral'``,
+            ``'cnotdihedral_interleaved'`` and ``'purity'``. The default
+            are the families returned by :func:`randomized_benchmarking_seq`.
+
+    Yields:
+        A tuple ``(seed, length_index, circuits)``, where ``circuits`` is a
+        dict of the circuit of each requested family for the sequence
+        length ``length_vector[length_index]`` of the seed. For the
+        ``'purity'`` family the value is the list of the :math:`3^n`
+        purity circuits.
+
+    Raises:
+        ValueError: if the arguments are not valid, see
+            :func:`randomized_benchmarking_seq`.
+        ValueError: if a family is unknown or not available for the
+            arguments.
+
+    Example:
+
+        .. code-block::
+
+            for seed, length_index, circs in iter_randomized_benchmarking_seq(
+                    nseeds=5, length_vector=[1, 100, 200, 500],
+                    rb_pattern=[[0, 1]], families=['rb']):
+                job_circuits.append(circs['rb'])
+    """
+    settings, _ = _rb_settings(length_vector, rb_pattern, length_multiplier,
+                               align_cliffs, interleaved_elem, is_purity,
+                               group_gates, basis_gates, families)
+    entropy = _seed_entropy(rand_seed)
+    for seed in range(seed_offset, seed_offset + nseeds):
+        for length_index, circuits in _iter_seed_circuits(seed, entropy,
+                                                          settings):
+            yield seed, length_index, circuits
+
+
+def plan_rb_layers(coupling_map: Union[List[List[int]], CouplingMap],
+                   pattern_size: int = 2,
+                   qubits: Optional[List[int]] = None,
+                   isolated: bool = False) -> List[List[List[int]]]:
+    """Plan layers of simultaneous RB patterns on a device.
+
+    The patterns are the qubits (``pattern_size=1``) or the coupled pairs
+    of qubits (``pattern_size=2``) of the coupling map. They are greedily
+    colored into layers of non-conflicting patterns, starting from the
+    most constrained patterns, so that each layer is a valid ``rb_pattern``
+    of :func:`randomized_benchmarking_seq` and of
+    :func:`device_randomized_benchmarking_seq`, and all the patterns are
+    benchmarked by running each of the layers.
+
+    Args:
+        coupling_map: The coupling map of the device, as a list of
+            pairs of coupled qubits or a ``CouplingMap``. The direction
+            of the couplings is ignored.
+        pattern_size: The number of qubits of each pattern, 1 or 2.
+        qubits: Optional. The qubits to benchmark (the default are all
+            the qubits of the coupling map).
+        isolated: If ``True`` the patterns of a layer are also not coupled
+            to each other, i.e. no qubit of a pattern is coupled to a qubit
+            of another pattern of the layer, which reduces the crosstalk
+            between the simultaneous sequences at the cost of more layers.
+
+    Returns:
+        The list of layers, each layer is a list of patterns.
+
+    Raises:
+        ValueError: if ``pattern_size`` is not 1 or 2.
+        ValueError: if there are no patterns to benchmark.
+
+    Example:
+
+        .. code-block::
+
+            layers = plan_rb_layers(backend.configuration().coupling_map)
+            for rb_pattern in layers:
+                rb_circs, xdata = device_randomized_benchmarking_seq(
+                    nseeds=5, length_vector=[1, 10, 20, 50],
+                    rb_pattern=rb_pattern)
+    """
+    if hasattr(coupling_map, 'get_edges'):
+        coupling_map = coupling_map.get_edges()
+    edges = sorted({tuple(sorted((int(edge[0]), int(edge[1]))))
+                    for edge in coupling_map if edge[0] != edge[1]})
+    if qubits is None:
+        qubits = sorted({qubit for edge in edges for qubit in edge})
+    else:
+        qubits = sorted(set(int(qubit) for qubit in qubits))
+        edges = [edge for edge in edges
+                 if edge[0] in qubits and edge[1] in qubits]
+
+    if pattern_size == 1:
+        patterns = [(qubit,) for qubit in qubits]
+    elif pattern_size == 2:
+        patterns = edges
+    else:
+        raise ValueError("The pattern size of the RB layers should be "
+                         "1 or 2.")
+    if not patterns:
+        raise ValueError("There are no RB patterns in the coupling map.")
+
+    neighbors = {qubit: set() for qubit in qubits}
+    for qubit0, qubit1 in edges:
+        neighbors[qubit0].add(qubit1)
+        neighbors[qubit1].add(qubit0)
+    # the qubits that the other patterns of a layer may not use
+    blocked = []
+    for pat in patterns:
+        pat_blocked = set(pat)
+        if isolated:
+            for qubit in pat:
+                pat_blocked.update(neighbors[qubit])
+        blocked.append(pat_blocked)
+
+    # the number of conflicting patterns of each pattern
+    qubit_patterns = {qubit: [] for qubit in qubits}
+    for index, pat in enumerate(patterns):
+        for qubit in pat:
+            qubit_patterns[qubit].append(index)
+    conflicts = [len({other for qubit in pat_blocked
+                      for other in qubit_patterns[qubit]}) - 1
+                 for pat_blocked in blocked]
+
+    layers = []
+    layer_qubits = []
+    for index in sorted(range(len(patterns)),
+                        key=lambda index: (-conflicts[index], patterns[index])):
+        for layer, used in zip(layers, layer_qubits):
+            if not blocked[index] & used:
+                break
+        else:
+            layer = []
+            used = set()
+            layers.append(layer)
+            layer_qubits.append(used)
+        layer.append(list(patterns[index]))
+        used.update(patterns[index])
+    return [sorted(layer) for layer in layers]
+
+
+def device_randomized_benchmarking_seq(
+        nseeds: int = 1,
+        length_vector: Optional[List[int]] = None,
+        rb_pattern: Optional[List[List[int]]] = None,
+        length_multiplier: Optional[List[int]] = 1,
+        seed_offset: int = 0,
+        align_cliffs: bool = False,
+        group_gates: Optional[str] = None,
+        rand_seed: Optional[Union[int, RandomState, np.random.Generator]] = None,
+        basis_gates: Optional[List[str]] = None,
+        num_processes: int = 1) -> \
+        (List[List[QuantumCircuit]], List[List[int]],
+         Optional[List[List[QuantumCircuit]]]):
+    """Generate simultaneous randomized benchmarking (RB) sequences at device scale.
+
+    This is a version of :func:`randomized_benchmarking_seq` for standard
+    (simultaneous) RB with many patterns, e.g. a layer of
+    :func:`plan_rb_layers`. The group elements of all the patterns with
+    the same number of qubits and length multiplier are sampled together
+    as arrays of indices of the group tables, and the sequences of these
+    patterns are composed together in one pass per element. The
+    instruction list of each sequence is built once from cached
+    instructions of the group elements on the pattern qubits, and each
+    output circuit is constructed from it in one pass.
+
+    The circuits have the same structure and names as the circuits of
+    :func:`randomized_benchmarking_seq`, so that they can be analyzed with
+    the same fitters, but the group elements are sampled in a different
+    order, hence the circuits for a fixed ``rand_seed`` differ.
+
+    Args:
+        nseeds: The number of seeds.
+        length_vector: Length vector of the RB sequence lengths.
+        rb_pattern: A list of the lists of qubits indexes.
+        length_multiplier: An array that scales each RB sequence by
+            the multiplier.
+        seed_offset: What to start the seeds at.
+        align_cliffs: If ``True`` adds a barrier across all qubits in
+            the pattern after each set of group elements.
+        group_gates: On which group (or set of gates) we perform RB.
+        rand_seed: Optional. Set a fixed seed or generator for RNG.
+            As in :func:`randomized_benchmarking_seq`, the circuits of each
+            seed only depend on ``rand_seed`` and on the seed index.
+        basis_gates: Optional. A list of basis gate names for the
+            group elements.
+        num_processes: The number of processes for generating the
+            seeds in parallel (default is 1, i.e. serial generation).
+
+    Returns:
+        A tuple of the ``circuits`` and the ``xdata`` of the RB sequences,
+        as returned by :func:`randomized_benchmarking_seq`. For the
+        CNOT-Dihedral group the tuple also includes the
+        ``circuits_cnotdihedral`` of the sequences.
+
+    Raises:
+        ValueError: if the arguments are not valid, see
+            :func:`randomized_benchmarking_seq`.
+    """
+    settings, xdata = _rb_settings(length_vector, rb_pattern,
+                                   length_multiplier, align_cliffs, None,
+                                   False, group_gates, basis_gates)
+    families = settings['families']
+    entropy = _seed_entropy(rand_seed)
+    seed_circuits = parallel_map(
+        _device_seed_circuits, list(range(seed_offset, seed_offset + nseeds)),
+        task_args=(entropy, settings), num_processes=num_processes)
+    outputs = {family: [circs[family] for circs in seed_circuits]
+               for family in families}
+    if 'cnotdihedral' in families:
+        return outputs['rb'], xdata, outputs['cnotdihedral']
+    return outputs['rb'], xdata
+
+
+def _rb_settings(length_vector, rb_pattern, length_multiplier, align_cliffs,
+                 interleaved_elem, is_purity, group_gates, basis_gates,
+                 families=None):
+    """
+    Check the RB arguments and derive the settings of the seed generation.
+
+    Args:
+        length_vector (list): length vector of the RB sequence lengths.
+        rb_pattern (list): the lists of qubit indexes.
+        length_multiplier (list): the length multiplier.
+        align_cliffs (bool): if the group elements are aligned.
+        interleaved_elem (list): the interleaved elements or None.
+        is_purity (bool): True only for purity rb.
+        group_gates (str): the group of the RB.
+        basis_gates (list): the basis gates of the group elements or None.
+        families (list): the families of circuits or None for the
+            families returned by :func:`randomized_benchmarking_seq`.
+
+    Returns:
+        tuple: the settings dict and the ``xdata`` of the sequence lengths.
+
+    Raises:
+        ValueError: if a family is unknown or not available for the
+            arguments.
+    """
     if rb_pattern is None:
         rb_pattern = [[0]]
     if length_vector is None:
@@ -393,243 +744,503 @@ def randomized_benchmarking_seq(nseeds: int = 1,
 
     xdata = calc_xdata(length_vector, length_multiplier)
 
-    pattern_sizes = [len(pat) for pat in rb_pattern]
-
     # Set the RBgroup class for RB (default is Clifford)
-    rb_group = RBgroup(group_gates)
+    rb_group = RBgroup(group_gates, use_tables=True)
     group_gates_type = rb_group.group_gates_type()
-    rb_circ_type = rb_group.rb_circ_type()
 
     # Handle various types of the interleaved element
     interleaved_elem = handle_interleaved_elem(interleaved_elem, rb_group)
 
-    # initialization: rb sequences
-    circuits = [[] for e in range(nseeds)]
-    # initialization: interleaved rb sequences
-    circuits_interleaved = [[] for e in range(nseeds)]
-    # initialization: non-clifford cnot-dihedral
-    # rb sequences
-    circuits_cnotdihedral = [[] for e in range(nseeds)]
-    # initialization: non-clifford cnot-dihedral
-    # interleaved rb sequences
-    circuits_cnotdihedral_interleaved = [[] for e in range(nseeds)]
-    # initialization: purity rb sequences
-    circuits_purity = [[[] for d in range(npurity)]
-                       for e in range(nseeds)]
-
-    # go through for each seed
-    for seed in range(nseeds):
-        qr = qiskit.QuantumRegister(n_q_max+1, 'qr')
-        cr = qiskit.ClassicalRegister(len(qlist_flat), 'cr')
-        general_circ = QuantumCircuit(qr, cr)
-        interleaved_circ = QuantumCircuit(qr, cr)
-
-        # make sequences for each of the separate sequences in
-        # rb_pattern
-        Elmnts = []
-        for rb_q_num in pattern_sizes:
-            Elmnts.append(rb_group.iden(rb_q_num))
-        # Sequences for interleaved rb sequences
-        Elmnts_interleaved = []
-        for rb_q_num in pattern_sizes:
-            Elmnts_interleaved.append(rb_group.iden(rb_q_num))
-
-        # go through and add elements to RB sequences
-        length_index = 0
-        for elmnts_index in range(length_vector[-1]):
-            for (rb_pattern_index, rb_q_num) in enumerate(pattern_sizes):
+    # Families of circuits that can be constructed
+    available = ['rb']
+    if interleaved_elem is not None:
+        available.append('interleaved')
+    if group_gates_type == 1:
+        available.append('cnotdihedral')
+        if interleaved_elem is not None:
+            available.append('cnotdihedral_interleaved')
+    if is_purity:
+        available = ['rb', 'purity']
+    if families is None:
+        families = ['purity'] if is_purity else available
+    for family in families:
+        if family not in RB_FAMILIES:
+            raise ValueError("Unknown family of RB circuits: %s." % family)
+        if family not in available:
+            raise ValueError("Family of RB circuits %s is not available "
+                             "for the RB arguments." % family)
+
+    settings = {'rb_pattern': rb_pattern,
+                'pattern_sizes': [len(pat) for pat in rb_pattern],
+                'length_vector': length_vector,
+                'length_multiplier': length_multiplier,
+                'align_cliffs': align_cliffs,
+                'interleaved_elem': interleaved_elem,
+                'npurity': npurity,
+                'max_dim': max_dim,
+                'qlist_flat': qlist_flat,
+                'n_q_max': n_q_max,
+                'group_gates': group_gates,
+                'basis_gates': basis_gates,
+                'families': tuple(families)}
+    return settings, xdata
+
+
+def _seed_circuits(seed, entropy, settings):
+    """
+    Generate the RB circuits of a single seed.
+
+    Args:
+        seed (int): the seed index, including the seed offset.
+        entropy (int): the entropy of the root ``SeedSequence``.
+        settings (dict): the settings returned by :func:`_rb_settings`.
+
+    Returns:
+        dict: the list of circuits of each sequence length for each family.
+    """
+    seed_circuits = {family: [] for family in settings['families']}
+    for _, circuits in _iter_seed_circuits(seed, entropy, settings):
+        for family, circ in circuits.items():
+            seed_circuits[family].append(circ)
+    return seed_circuits
+
+
+def _iter_seed_circuits(seed, entropy, settings):
+    """
+    Iterate over the RB circuits of a single seed.
+
+    The group elements of the seed are sampled from a random generator
+    that only depends on ``entropy`` and on ``seed``, so that the circuits
+    of a seed do not depend on the other seeds.
+
+    Args:
+        seed (int): the seed index, including the seed offset.
+        entropy (int): the entropy of the root ``SeedSequence``.
+        settings (dict): the settings returned by :func:`_rb_settings`.
 
-                for _ in range(length_multiplier[rb_pattern_index]):
-                    # make the seed unique for each element
-                    if rand_seed:
-                        rand_seed += (seed + 1)
-                    new_elmnt = rb_group.random(rb_q_num, rand_seed)
+    Yields:
+        tuple: the length index and the dict of the circuits of each family.
+    """
+    # the cached circuits of the group elements are shared, and only
+    # their instructions are appended to the output circuits
+    # pylint: disable=protected-access
+    rb_pattern = settings['rb_pattern']
+    pattern_sizes = settings['pattern_sizes']
+    length_vector = settings['length_vector']
+    length_multiplier = settings['length_multiplier']
+    align_cliffs = settings['align_cliffs']
+    interleaved_elem = settings['interleaved_elem']
+    qlist_flat = settings['qlist_flat']
+    basis_gates = settings['basis_gates']
+    families = settings['families']
+
+    rb_group = RBgroup(settings['group_gates'], use_tables=True)
+    rb_circ_type = rb_group.rb_circ_type()
+    # The rb circuits of cnot-dihedral rb measure the |0...0> state
+    z_suffix = '_Z' if rb_group.group_gates_type() == 1 else ''
+    rng = np.random.default_rng(
+        np.random.SeedSequence(entropy, spawn_key=(seed,)))
+
+    # Only the sequences of the requested families are constructed
+    is_general = bool({'rb', 'cnotdihedral', 'purity'}.intersection(families))
+    is_interleaved = bool({'interleaved', 'cnotdihedral_interleaved'}
+                          .intersection(families))
+
+    qr = qiskit.QuantumRegister(settings['n_q_max']+1, 'qr')
+    cr = qiskit.ClassicalRegister(len(qlist_flat), 'cr')
+    # The sequences are stored as lists of instructions that are shared
+    # by all output circuits of the seed, so that each output circuit is
+    # constructed once from the instructions of its sequence
+    general_ops = []
+    interleaved_ops = []
+    pattern_barriers = [_barrier_op([qr[x] for x in pat])
+                        for pat in rb_pattern]
+    align_barrier = _barrier_op([qr[x] for x in qlist_flat])
+    if is_interleaved:
+        interleaved_elem_ops = [
+            _pattern_ops(rb_group._to_circuit(elem, basis_gates), pat, qr)
+            for elem, pat in zip(interleaved_elem, rb_pattern)]
+
+    # make sequences for each of the separate sequences in
+    # rb_pattern
+    Elmnts = []
+    for rb_q_num in pattern_sizes:
+        Elmnts.append(rb_group.iden(rb_q_num))
+    # Sequences for interleaved rb sequences
+    Elmnts_interleaved = []
+    for rb_q_num in pattern_sizes:
+        Elmnts_interleaved.append(rb_group.iden(rb_q_num))
+
+    # go through and add elements to RB sequences
+    length_index = 0
+    for elmnts_index in range(length_vector[-1]):
+        for (rb_pattern_index, rb_q_num) in enumerate(pattern_sizes):
+
+            for _ in range(length_multiplier[rb_pattern_index]):
+                # all elements are sampled, so that the sequences do not
+                # depend on the requested families
+                new_elmnt = rb_group.random(rb_q_num, rng)
+                new_elmnt_ops = _pattern_ops(
+                    rb_group._to_circuit(new_elmnt, basis_gates),
+                    rb_pattern[rb_pattern_index], qr)
+                if is_general:
                     Elmnts[rb_pattern_index] = rb_group.compose(
                         Elmnts[rb_pattern_index], new_elmnt)
-                    general_circ += replace_q_indices(
-                        rb_group.to_circuit(new_elmnt),
+                    general_ops += new_elmnt_ops
+                    # add a barrier
+                    general_ops.append(pattern_barriers[rb_pattern_index])
+
+                # interleaved rb sequences
+                if is_interleaved:
+                    Elmnts_interleaved[rb_pattern_index] = \
+                        rb_group.compose(
+                            Elmnts_interleaved[rb_pattern_index],
+                            new_elmnt)
+                    interleaved_ops += new_elmnt_ops
+                    Elmnts_interleaved[rb_pattern_index] = \
+                        rb_group.compose(
+                            Elmnts_interleaved[rb_pattern_index],
+                            interleaved_elem[rb_pattern_index])
+                    # add a barrier - interleaved rb
+                    interleaved_ops.append(
+                        pattern_barriers[rb_pattern_index])
+                    interleaved_ops += \
+                        interleaved_elem_ops[rb_pattern_index]
+                    # add a barrier - interleaved rb
+                    interleaved_ops.append(
+                        pattern_barriers[rb_pattern_index])
+
+        if align_cliffs:
+            # if align at a barrier across all patterns
+            if is_general:
+                general_ops.append(align_barrier)
+            # align for interleaved rb
+            if is_interleaved:
+                interleaved_ops.append(align_barrier)
+
+        # if the number of elements matches one of the sequence lengths
+        # then calculate the inverse and produce the circuits
+        if (elmnts_index+1) == length_vector[length_index]:
+            # instructions of the sequence followed by the inverse
+            # for rb and interleaved rb
+            seq_ops = list(general_ops)
+            seq_interleaved_ops = list(interleaved_ops)
+            for (rb_pattern_index, rb_q_num) in enumerate(pattern_sizes):
+                if is_general:
+                    inv_circuit = rb_group._inverse(
+                        Elmnts[rb_pattern_index], basis_gates)
+                    seq_ops += _pattern_ops(
+                        inv_circuit, rb_pattern[rb_pattern_index], qr)
+                # calculate the inverse and produce the circuit
+                # for interleaved rb
+                if is_interleaved:
+                    inv_circuit_interleaved = rb_group._inverse(
+                        Elmnts_interleaved[rb_pattern_index],
+                        basis_gates)
+                    seq_interleaved_ops += _pattern_ops(
+                        inv_circuit_interleaved,
                         rb_pattern[rb_pattern_index], qr)
 
-                    # add a barrier
-                    general_circ.barrier(
-                        *[qr[x] for x in rb_pattern[rb_pattern_index]])
-
-                    # interleaved rb sequences
-                    if interleaved_elem is not None:
-                        Elmnts_interleaved[rb_pattern_index] = \
-                            rb_group.compose(
-                                Elmnts_interleaved[rb_pattern_index],
-                                new_elmnt)
-                        interleaved_circ += replace_q_indices(
-                            rb_group.to_circuit(
-                                new_elmnt),
-                            rb_pattern[rb_pattern_index], qr)
-                        Elmnts_interleaved[rb_pattern_index] = \
-                            rb_group.compose(
-                                Elmnts_interleaved[rb_pattern_index],
-                                interleaved_elem[rb_pattern_index])
-                        # add a barrier - interleaved rb
-                        interleaved_circ.barrier(
-                            *[qr[x] for x in rb_pattern[rb_pattern_index]])
-                        interleaved_circ += replace_q_indices(
-                            rb_group.to_circuit(
-                                interleaved_elem[rb_pattern_index]),
-                            rb_pattern[rb_pattern_index], qr)
-                        # add a barrier - interleaved rb
-                        interleaved_circ.barrier(
-                            *[qr[x] for x in rb_pattern[rb_pattern_index]])
-
-            if align_cliffs:
-                # if align at a barrier across all patterns
-                general_circ.barrier(
-                    *[qr[x] for x in qlist_flat])
-                # align for interleaved rb
-                if interleaved_elem is not None:
-                    interleaved_circ.barrier(
-                        *[qr[x] for x in qlist_flat])
-
-            # if the number of elements matches one of the sequence lengths
-            # then calculate the inverse and produce the circuit
-            if (elmnts_index+1) == length_vector[length_index]:
-                # circ for rb:
-                circ = QuantumCircuit(qr, cr)
-                circ += general_circ
-                # circ_interleaved for interleaved rb:
-                circ_interleaved = QuantumCircuit(qr, cr)
-                circ_interleaved += interleaved_circ
-
-                for (rb_pattern_index, rb_q_num) in enumerate(pattern_sizes):
-                    inv_circuit = rb_group.inverse(Elmnts[rb_pattern_index])
-                    circ += replace_q_indices(inv_circuit,
-                                              rb_pattern[rb_pattern_index], qr)
-                    # calculate the inverse and produce the circuit
-                    # for interleaved rb
-                    if interleaved_elem is not None:
-                        inv_circuit_interleaved = rb_group.inverse(
-                            Elmnts_interleaved[rb_pattern_index])
-                        circ_interleaved += replace_q_indices(
-                            inv_circuit_interleaved,
-                            rb_pattern[rb_pattern_index], qr)
-
-                # Circuits for purity rb
-                if is_purity:
-                    circ_purity = [[] for d in range(npurity)]
-                    for d in range(npurity):
-                        circ_purity[d] = QuantumCircuit(qr, cr)
-                        circ_purity[d] += circ
-                        circ_purity[d].name = rb_circ_type + '_purity_'
-                        ind_d = d
-                        purity_qubit_num = 0
-                        while True:
-                            # Per each qubit:
-                            # do nothing or rx(pi/2) or ry(pi/2)
-                            purity_qubit_rot = np.mod(ind_d, 3)
-                            ind_d = np.floor_divide(ind_d, 3)
-                            if purity_qubit_rot == 0:  # do nothing
-                                circ_purity[d].name += 'Z'
-                            if purity_qubit_rot == 1:  # add rx(pi/2)
-                                for pat in rb_pattern:
-                                    circ_purity[d].rx(np.pi / 2,
-                                                      qr[pat[
-                                                          purity_qubit_num]])
-                                circ_purity[d].name += 'X'
-                            if purity_qubit_rot == 2:  # add ry(pi/2)
-                                for pat in rb_pattern:
-                                    circ_purity[d].ry(np.pi / 2,
-                                                      qr[pat[
-                                                          purity_qubit_num]])
-                                circ_purity[d].name += 'Y'
-                            purity_qubit_num = purity_qubit_num + 1
-                            if ind_d == 0:
-                                break
-                        # padding the circuit name with Z's so that
-                        # all circuits will have names of the same length
-                        for _ in range(max_dim - purity_qubit_num):
-                            circ_purity[d].name += 'Z'
-                        # add measurement for purity rb
-                        for qind, qb in enumerate(qlist_flat):
-                            circ_purity[d].measure(qr[qb], cr[qind])
-                        circ_purity[d].name += '_length_%d_seed_%d' \
-                                               % (length_index,
-                                                  seed + seed_offset)
-
-                # add measurement for Non-Clifford cnot-dihedral rb
-                # measure both the ground state |0...0> (circ)
-                # and the |+...+> state (cnot-dihedral_circ)
-                cnotdihedral_circ = QuantumCircuit(qr, cr)
-                cnotdihedral_interleaved_circ = QuantumCircuit(qr, cr)
-                if group_gates_type == 1:
-                    for _, qb in enumerate(qlist_flat):
-                        cnotdihedral_circ.h(qr[qb])
-                        cnotdihedral_circ.barrier(qr[qb])
-                        cnotdihedral_interleaved_circ.h(qr[qb])
-                        cnotdihedral_interleaved_circ.barrier(qr[qb])
-                    cnotdihedral_circ += circ
-                    cnotdihedral_interleaved_circ += circ_interleaved
-                    for _, qb in enumerate(qlist_flat):
-                        cnotdihedral_circ.barrier(qr[qb])
-                        cnotdihedral_circ.h(qr[qb])
-                        cnotdihedral_interleaved_circ.barrier(qr[qb])
-                        cnotdihedral_interleaved_circ.h(qr[qb])
-                    for qind, qb in enumerate(qlist_flat):
-                        cnotdihedral_circ.measure(qr[qb], cr[qind])
-                        cnotdihedral_interleaved_circ.measure(qr[qb], cr[qind])
-
-                # add measurement for standard rb
-                # qubits measure to the c registers as
-                # they appear in the pattern
-                for qind, qb in enumerate(qlist_flat):
-                    circ.measure(qr[qb], cr[qind])
-                    # add measurement for interleaved rb
-                    circ_interleaved.measure(qr[qb], cr[qind])
-
-                circ.name = \
-                    rb_circ_type + '_length_%d_seed_%d' % \
-                    (length_index, seed + seed_offset)
-                circ_interleaved.name = \
-                    rb_circ_type + '_interleaved_length_%d_seed_%d' % \
-                    (length_index, seed + seed_offset)
-
-                if group_gates_type == 1:
-                    circ.name = rb_circ_type + '_Z_length_%d_seed_%d' % \
-                                (length_index, seed + seed_offset)
-                    circ_interleaved.name = \
-                        rb_circ_type + '_interleaved_Z_length_%d_seed_%d' % \
-                        (length_index, seed + seed_offset)
-                    cnotdihedral_circ.name = \
-                        rb_circ_type + '_X_length_%d_seed_%d' % \
-                        (length_index, seed + seed_offset)
-                    cnotdihedral_interleaved_circ.name = \
-                        rb_circ_type + '_interleaved_X_length_%d_seed_%d' % \
-                        (length_index, seed + seed_offset)
-
-                circuits[seed].append(circ)
-                circuits_interleaved[seed].append(circ_interleaved)
-                circuits_cnotdihedral[seed].append(cnotdihedral_circ)
-                circuits_cnotdihedral_interleaved[seed].append(
-                    cnotdihedral_interleaved_circ)
-
-                if is_purity:
-                    for d in range(npurity):
-                        circuits_purity[seed][d].append(circ_purity[d])
-
-                length_index += 1
+            name = '_length_%d_seed_%d' % (length_index, seed)
+            circuits = {}
+            if 'rb' in families:
+                circuits['rb'] = _measured_circuit(
+                    qr, cr, qlist_flat, seq_ops,
+                    rb_circ_type + z_suffix + name)
+            if 'interleaved' in families:
+                circuits['interleaved'] = _measured_circuit(
+                    qr, cr, qlist_flat, seq_interleaved_ops,
+                    rb_circ_type + '_interleaved' + z_suffix + name)
+            if 'cnotdihedral' in families:
+                circuits['cnotdihedral'] = _cnotdihedral_circuit(
+                    qr, cr, qlist_flat, seq_ops, rb_circ_type + '_X' + name)
+            if 'cnotdihedral_interleaved' in families:
+                circuits['cnotdihedral_interleaved'] = _cnotdihedral_circuit(
+                    qr, cr, qlist_flat, seq_interleaved_ops,
+                    rb_circ_type + '_interleaved_X' + name)
+            if 'purity' in families:
+                circuits['purity'] = _purity_circuits(
+                    qr, cr, qlist_flat, seq_ops, rb_pattern,
+                    settings['npurity'], settings['max_dim'],
+                    rb_circ_type + '_purity_', name)
+            yield length_index, circuits
+
+            length_index += 1
+
+
+def _device_seed_circuits(seed, entropy, settings):
+    """
+    Generate the RB circuits of a single seed at device scale.
 
-    # output of purity rb
-    if is_purity:
-        return circuits_purity, xdata, npurity
-    # output of non-clifford cnot-dihedral interleaved rb
-    if interleaved_elem is not None and group_gates_type == 1:
-        return circuits, xdata, circuits_cnotdihedral, circuits_interleaved, \
-               circuits_cnotdihedral_interleaved
-    # output of interleaved rb
-    if interleaved_elem is not None:
-        return circuits, xdata, circuits_interleaved
-    # output of Non-Clifford cnot-dihedral rb
-    if group_gates_type == 1:
-        return circuits, xdata, circuits_cnotdihedral
-    # output of standard (simultaneous) rb
-    return circuits, xdata
+    Args:
+        seed (int): the seed index, including the seed offset.
+        entropy (int): the entropy of the root ``SeedSequence``.
+        settings (dict): the settings returned by :func:`_rb_settings`.
+
+    Returns:
+        dict: the list of circuits of each sequence length for each family.
+    """
+    # the cached circuits of the group elements are shared, and only
+    # their instructions are appended to the output circuits
+    # pylint: disable=protected-access
+    rb_pattern = settings['rb_pattern']
+    pattern_sizes = settings['pattern_sizes']
+    length_vector = settings['length_vector']
+    length_multiplier = settings['length_multiplier']
+    qlist_flat = settings['qlist_flat']
+    basis_gates = settings['basis_gates']
+    families = settings['families']
+
+    rb_group = RBgroup(settings['group_gates'], use_tables=True)
+    rb_circ_type = rb_group.rb_circ_type()
+    z_suffix = '_Z' if rb_group.group_gates_type() == 1 else ''
+    rng = np.random.default_rng(
+        np.random.SeedSequence(entropy, spawn_key=(seed,)))
+
+    # Sample the sequences of the patterns with the same number of qubits
+    # and length multiplier together
+    sequences = [None] * len(rb_pattern)
+    products = [None] * len(rb_pattern)
+    pattern_groups = {}
+    for index, (size, mult) in enumerate(zip(pattern_sizes,
+                                             length_multiplier)):
+        pattern_groups.setdefault((size, int(mult)), []).append(index)
+    for (size, mult), indices in pattern_groups.items():
+        group_sequences, group_products = _sample_sequences(
+            rb_group, size, len(indices),
+            [length * mult for length in length_vector], rng)
+        for index, elems, prods in zip(indices, group_sequences,
+                                       group_products):
+            sequences[index] = elems
+            products[index] = prods
+
+    qr = qiskit.QuantumRegister(settings['n_q_max']+1, 'qr')
+    cr = qiskit.ClassicalRegister(len(qlist_flat), 'cr')
+    pattern_barriers = [_barrier_op([qr[x] for x in pat])
+                        for pat in rb_pattern]
+    align_barrier = _barrier_op([qr[x] for x in qlist_flat])
+    # The instructions of each group element on each pattern are cached
+    elem_ops = {}
+
+    def pattern_elem_ops(pattern_index, elem, inverse=False):
+        key = (pattern_index, elem, inverse) \
+            if isinstance(elem, TableElement) else None
+        ops = elem_ops.get(key)
+        if ops is None:
+            if inverse:
+                circ = rb_group._inverse(elem, basis_gates)
+            else:
+                circ = rb_group._to_circuit(elem, basis_gates)
+            ops = _pattern_ops(circ, rb_pattern[pattern_index], qr)
+            if key is not None:
+                elem_ops[key] = ops
+        return ops
+
+    seed_circuits = {family: [] for family in families}
+    general_ops = []
+    length_index = 0
+    for elmnts_index in range(length_vector[-1]):
+        for pattern_index, mult in enumerate(length_multiplier):
+            for elem in sequences[pattern_index][elmnts_index * mult:
+                                                 (elmnts_index + 1) * mult]:
+                general_ops += pattern_elem_ops(pattern_index, elem)
+                general_ops.append(pattern_barriers[pattern_index])
+        if settings['align_cliffs']:
+            general_ops.append(align_barrier)
+
+        if (elmnts_index+1) == length_vector[length_index]:
+            seq_ops = list(general_ops)
+            for pattern_index in range(len(rb_pattern)):
+                seq_ops += pattern_elem_ops(
+                    pattern_index, products[pattern_index][length_index],
+                    inverse=True)
+            name = '_length_%d_seed_%d' % (length_index, seed)
+            if 'rb' in families:
+                seed_circuits['rb'].append(_measured_circuit(
+                    qr, cr, qlist_flat, seq_ops,
+                    rb_circ_type + z_suffix + name))
+            if 'cnotdihedral' in families:
+                seed_circuits['cnotdihedral'].append(_cnotdihedral_circuit(
+                    qr, cr, qlist_flat, seq_ops, rb_circ_type + '_X' + name))
+            length_index += 1
+    return seed_circuits
+
+
+def _sample_sequences(rb_group, num_qubits, num_sequences, lengths, rng):
+    """
+    Sample random sequences of group elements together.
+
+    Args:
+        rb_group (RBgroup): the group.
+        num_qubits (int): the number of qubits of the elements.
+        num_sequences (int): the number of sequences.
+        lengths (list): the ascending lengths at which the products of the
+            sequences are returned.
+        rng (np.random.Generator): the random generator.
+
+    Returns:
+        tuple: the list of the ``lengths[-1]`` elements of each sequence,
+        and the list of the products of each sequence at the ``lengths``.
+    """
+    table = rb_group.table(num_qubits)
+    checkpoints = set(lengths)
+    if table is not None:
+        indices = rng.integers(len(table), size=(num_sequences, lengths[-1]))
+        product = np.zeros(num_sequences, dtype=np.int64)
+        products = []
+        for step in range(lengths[-1]):
+            product = table.compose_indices(product, indices[:, step])
+            if step + 1 in checkpoints:
+                products.append(product)
+        sequences = [[TableElement(table, index) for index in row]
+                     for row in indices.tolist()]
+        products = [[TableElement(table, index) for index in column]
+                    for column in np.array(products).T.tolist()]
+        return sequences, products
+
+    sequences = [[rb_group.random(num_qubits, rng)
+                  for _ in range(lengths[-1])]
+                 for _ in range(num_sequences)]
+    product = [rb_group.iden(num_qubits) for _ in range(num_sequences)]
+    products = []
+    for step in range(lengths[-1]):
+        column = [elems[step] for elems in sequences]
+        if rb_group.group_gates_type():
+            product = compose_cnotdihedral_batch(product, column)
+        else:
+            product = [rb_group.compose(elem, other)
+                       for elem, other in zip(product, column)]
+        if step + 1 in checkpoints:
+            products.append(product)
+    return [list(elems) for elems in sequences], \
+        [list(prods) for prods in zip(*products)]
+
+
+def _measured_circuit(qr, cr, qlist_flat, ops, name):
+    """
+    Return a circuit of a sequence followed by the measurements.
+
+    Args:
+        qr (QuantumRegister): the quantum register.
+        cr (ClassicalRegister): the classical register.
+        qlist_flat (list): the measured qubits.
+        ops (list): the instructions of the sequence.
+        name (str): the circuit name.
+
+    Returns:
+        QuantumCircuit: the circuit.
+    """
+    circ = QuantumCircuit(qr, cr, name=name)
+    _append_ops(circ, ops)
+    # qubits measure to the c registers as
+    # they appear in the pattern
+    for qind, qb in enumerate(qlist_flat):
+        circ.measure(qr[qb], cr[qind])
+    return circ
+
+
+def _cnotdihedral_circuit(qr, cr, qlist_flat, ops, name):
+    """
+    Return a Non-Clifford cnot-dihedral rb circuit of a sequence.
+
+    The circuit measures the sequence on the :math:`|+...+>` state.
+
+    Args:
+        qr (QuantumRegister): the quantum register.
+        cr (ClassicalRegister): the classical register.
+        qlist_flat (list): the measured qubits.
+        ops (list): the instructions of the sequence.
+        name (str): the circuit name.
+
+    Returns:
+        QuantumCircuit: the circuit.
+    """
+    circ = QuantumCircuit(qr, cr, name=name)
+    for qb in qlist_flat:
+        circ.h(qr[qb])
+        circ.barrier(qr[qb])
+    _append_ops(circ, ops)
+    for qb in qlist_flat:
+        circ.barrier(qr[qb])
+        circ.h(qr[qb])
+    for qind, qb in enumerate(qlist_flat):
+        circ.measure(qr[qb], cr[qind])
+    return circ
+
+
+def _purity_circuits(qr, cr, qlist_flat, ops, rb_pattern, npurity, max_dim,
+                     prefix, suffix):
+    """
+    Return the purity rb circuits of a sequence.
+
+    Args:
+        qr (QuantumRegister): the quantum register.
+        cr (ClassicalRegister): the classical register.
+        qlist_flat (list): the measured qubits.
+        ops (list): the instructions of the sequence.
+        rb_pattern (list): the lists of qubit indexes.
+        npurity (int): the number of purity circuits.
+        max_dim (int): the maximal number of qubits of the patterns.
+        prefix (str): the prefix of the circuit names.
+        suffix (str): the suffix of the circuit names.
+
+    Returns:
+        list: the ``npurity`` purity circuits.
+    """
+    circ_purity = [[] for d in range(npurity)]
+    for d in range(npurity):
+        circ_purity[d] = QuantumCircuit(qr, cr)
+        _append_ops(circ_purity[d], ops)
+        circ_purity[d].name = prefix
+        ind_d = d
+        purity_qubit_num = 0
+        while True:
+            # Per each qubit:
+            # do nothing or rx(pi/2) or ry(pi/2)
+            purity_qubit_rot = np.mod(ind_d, 3)
+            ind_d = np.floor_divide(ind_d, 3)
+            if purity_qubit_rot == 0:  # do nothing
+                circ_purity[d].name += 'Z'
+            if purity_qubit_rot == 1:  # add rx(pi/2)
+                for pat in rb_pattern:
+                    circ_purity[d].rx(np.pi / 2,
+                                      qr[pat[purity_qubit_num]])
+                circ_purity[d].name += 'X'
+            if purity_qubit_rot == 2:  # add ry(pi/2)
+                for pat in rb_pattern:
+                    circ_purity[d].ry(np.pi / 2,
+                                      qr[pat[purity_qubit_num]])
+                circ_purity[d].name += 'Y'
+            purity_qubit_num = purity_qubit_num + 1
+            if ind_d == 0:
+                break
+        # padding the circuit name with Z's so that
+        # all circuits will have names of the same length
+        for _ in range(max_dim - purity_qubit_num):
+            circ_purity[d].name += 'Z'
+        # add measurement for purity rb
+        for qind, qb in enumerate(qlist_flat):
+            circ_purity[d].measure(qr[qb], cr[qind])
+        circ_purity[d].name += suffix
+    return circ_purity
+
+
+def _seed_entropy(rand_seed):
+    """
+    Return the entropy of the root ``SeedSequence`` of the RB seeds.
+
+    Args:
+        rand_seed (int or RandomState or Generator or None): the random seed
+            of :func:`randomized_benchmarking_seq`.
+
+    Returns:
+        int: the entropy.
+    """
+    if isinstance(rand_seed, RandomState):
+        return int(rand_seed.randint(np.iinfo(np.int64).max))
+    if isinstance(rand_seed, np.random.Generator):
+        return int(rand_seed.integers(np.iinfo(np.int64).max))
+    return np.random.SeedSequence(rand_seed).entropy
 
 
 def replace_q_indices(circuit, q_nums, qr):
@@ -654,3 +1265,37 @@ def replace_q_indices(circuit, q_nums, qr):
         new_circuit.data.append(new_op)
 
     return new_circuit
+
+
+def _pattern_ops(circuit, q_nums, qr):
+    """
+    Return the instructions of a circuit that is ordered from 0,1,2 qubits
+    with qubit 0 replaced by the qubit label in the first index of q_nums,
+    1 with the second index...
+
+    Unlike :func:`replace_q_indices` the instruction objects are not copied,
+    so that they can be shared between the output RB circuits.
+
+    Args:
+        circuit (QuantumCircuit): circuit to operate on
+        q_nums (list): list of qubit indices
+        qr (QuantumRegister): A quantum register to use for the output circuit
+
+    Returns:
+        list: a list of ``(instruction, qargs, cargs)`` tuples.
+    """
+    qubit_indices = {bit: idx for idx, bit in enumerate(circuit.qubits)}
+    return [(instr, [qr[q_nums[qubit_indices[qarg]]] for qarg in qargs], cargs)
+            for instr, qargs, cargs in circuit.data]
+
+
+def _barrier_op(qubits):
+    """Return a barrier instruction tuple on a list of qubits."""
+    return (Barrier(len(qubits)), qubits, [])
+
+
+def _append_ops(circuit, ops):
+    """Append a list of ``(instruction, qargs, cargs)`` tuples to a circuit."""
+    for instr, qargs, cargs in ops:
+        # pylint: disable=protected-access
+        circuit._append(instr, qargs, cargs)
@@ -0,0 +1,488 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Indexed lookup tables of the 1 and 2-qubit Clifford groups
+for randomized benchmarking
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.exceptions import QiskitError
+from qiskit.quantum_info import Operator
+from qiskit.quantum_info.operators.symplectic import Clifford
+
+# Numbers of qubits for which a Clifford table can be built
+CLIFFORD_TABLE_QUBITS = (1, 2)
+
+# Tables that were already built or loaded, indexed by number of qubits
+_CLIFFORD_TABLES = {}
+
+
+class TableElement(namedtuple('TableElement', ['table', 'index'])):
+    """An integer-encoded element of an indexed group table."""
+    __slots__ = ()
+
+    @property
+    def num_qubits(self):
+        """Return the number of qubits of the element."""
+        return self.table.num_qubits
+
+
+class CliffordTable():
+    """Indexed table of the n-qubit Clifford group, for n = 1, 2.
+
+    Every Clifford element (up to a global phase) is stored by the action
+    of its conjugation on the :math:`4^n` Hermitian Pauli operators,
+    that is by the index of the Pauli image and the sign of the image.
+    Composition of two elements is therefore an array lookup, and the
+    element of a Clifford is found from its tableau. The decomposed
+    circuit and the inverse circuit of every element are computed once
+    on demand and cached.
+
+    Pauli operators are labelled by the integer
+    :math:`x + 2^n z`, where bit :math:`j` of :math:`x` (:math:`z`)
+    is the X (Z) component on qubit :math:`j`.
+    """
+
+    def __init__(self, num_qubits, images, signs):
+        """Initialize the table from the Pauli images of its elements.
+
+        Use :func:`clifford_table` or :meth:`build` for constructing the
+        table of the full group.
+
+        Args:
+            num_qubits (int): the number of qubits.
+            images (np.ndarray): array of shape ``(size, 4 ** num_qubits)``
+                of the Pauli images of the elements.
+            signs (np.ndarray): boolean array of shape
+                ``(size, 4 ** num_qubits)`` of the signs of the Pauli
+                images of the elements.
+
+        Raises:
+            QiskitError: if the arrays do not describe the Clifford elements
+                of ``num_qubits`` qubits with the identity first.
+        """
+        if num_qubits not in CLIFFORD_TABLE_QUBITS:
+            raise QiskitError("Clifford tables are only supported for "
+                              "{} qubits.".format(CLIFFORD_TABLE_QUBITS))
+        self._num_qubits = num_qubits
+        self._images = np.asarray(images, dtype=np.int64)
+        self._signs = np.asarray(signs, dtype=bool)
+        dim = 4 ** num_qubits
+        if self._images.ndim != 2 or self._images.shape[1] != dim or \
+                self._signs.shape != self._images.shape:
+            raise QiskitError("Invalid Clifford table arrays.")
+        if np.any(self._images[0] != np.arange(dim)) or np.any(self._signs[0]):
+            raise QiskitError("The first Clifford table element must be "
+                              "the identity.")
+
+        keys = _table_keys(num_qubits, self._images, self._signs)
+        self._key_index = dict(zip(keys.tolist(), range(len(keys))))
+        if len(self._key_index) != len(keys):
+            raise QiskitError("Clifford table elements are not unique.")
+
+        # Generator rows of the tableau as Pauli labels
+        self._rows = _generator_rows(num_qubits)
+
+        # Inverse of each element: P -> s Q inverts to Q -> s P
+        inv_images = np.empty_like(self._images)
+        inv_signs = np.empty_like(self._signs)
+        np.put_along_axis(inv_images, self._images,
+                          np.arange(dim)[None, :], axis=1)
+        np.put_along_axis(inv_signs, self._images, self._signs, axis=1)
+        self._inverse = self._indices(
+            _table_keys(num_qubits, inv_images, inv_signs))
+
+        # Full composition table for the small groups
+        self._products = None
+        if len(keys) <= 24:
+            self._products = np.array(
+                [[self._compose_index(i, j) for j in range(len(keys))]
+                 for i in range(len(keys))], dtype=np.int64)
+
+        self._circuits = {}
+        self._inverse_circuits = {}
+
+    def __len__(self):
+        return len(self._images)
+
+    def __repr__(self):
+        return "CliffordTable(num_qubits={}, size={})".format(
+            self._num_qubits, len(self))
+
+    @property
+    def num_qubits(self):
+        """Return the number of qubits."""
+        return self._num_qubits
+
+    @classmethod
+    def build(cls, num_qubits):
+        """Build the table of the full Clifford group.
+
+        The elements are enumerated by a breadth-first search over
+        products of H, S and CX gates, so that the indices are
+        deterministic and the identity has index 0.
+
+        Args:
+            num_qubits (int): the number of qubits (1 or 2).
+
+        Returns:
+            CliffordTable: the table of the ``num_qubits``-qubit Clifford group.
+
+        Raises:
+            QiskitError: if the number of qubits is not supported.
+        """
+        if num_qubits not in CLIFFORD_TABLE_QUBITS:
+            raise QiskitError("Clifford tables are only supported for "
+                              "{} qubits.".format(CLIFFORD_TABLE_QUBITS))
+        generators = _gate_maps(num_qubits)
+        dim = 4 ** num_qubits
+        images = np.arange(dim, dtype=np.int64)[None, :]
+        signs = np.zeros((1, dim), dtype=bool)
+        all_images = [images]
+        all_signs = [signs]
+        seen = _table_keys(num_qubits, images, signs)
+        while len(images):
+            new_images = np.concatenate(
+                [gen_images[images] for gen_images, _ in generators])
+            new_signs = np.concatenate(
+                [signs ^ gen_signs[images] for _, gen_signs in generators])
+            keys = _table_keys(num_qubits, new_images, new_signs)
+            keys, pos = np.unique(keys, return_index=True)
+            new = ~np.isin(keys, seen)
+            images = new_images[pos[new]]
+            signs = new_signs[pos[new]]
+            seen = np.concatenate([seen, keys[new]])
+            all_images.append(images)
+            all_signs.append(signs)
+        return cls(num_qubits, np.concatenate(all_images),
+                   np.concatenate(all_signs))
+
+    @classmethod
+    def load(cls, filename):
+        """Load a table stored by :meth:`save`.
+
+        Args:
+            filename (str): the file name.
+
+        Returns:
+            CliffordTable: the loaded table.
+        """
+        with np.load(filename) as data:
+            return cls(int(data['num_qubits']), data['images'],
+                       data['signs'])
+
+    def save(self, filename):
+        """Store the table in a ``.npz`` file.
+
+        Args:
+            filename (str): the file name.
+        """
+        with open(filename, 'wb') as file:
+            np.savez_compressed(file, num_qubits=self._num_qubits,
+                                images=self._images.astype(np.uint8),
+                                signs=self._signs)
+
+    def identity(self):
+        """Return the identity element."""
+        return TableElement(self, 0)
+
+    def element(self, elem):
+        """Return the table element of an index or a Clifford.
+
+        Args:
+            elem (int or TableElement or Clifford or QuantumCircuit):
+                the element.
+
+        Returns:
+            TableElement: the table element.
+
+        Raises:
+            QiskitError: if the element is not a Clifford of the table.
+        """
+        if isinstance(elem, TableElement):
+            if elem.table is self:
+                return elem
+            elem = elem.table.to_clifford(elem)
+        if isinstance(elem, (int, np.integer)):
+            if not 0 <= elem < len(self):
+                raise QiskitError("Clifford table index out of range.")
+            return TableElement(self, int(elem))
+        if not isinstance(elem, Clifford):
+            elem = Clifford(elem)
+        if elem.num_qubits != self._num_qubits:
+            raise QiskitError("Number of qubits of the Clifford does not "
+                              "match the table.")
+        tableau = np.asarray(elem.table.array, dtype=np.int64)
+        phase = np.asarray(elem.table.phase, dtype=bool)
+        weights = 1 << np.arange(2 * self._num_qubits)
+        images = tableau.dot(weights)
+        key = _row_keys(self._num_qubits, images[None, :], phase[None, :])[0]
+        return TableElement(self, self._key_index[int(key)])
+
+    def random(self, seed=None):
+        """Return a uniformly random element.
+
+        Args:
+            seed (int or np.random.Generator): optional random seed or
+                generator.
+
+        Returns:
+            TableElement: the random element.
+        """
+        if isinstance(seed, np.random.Generator):
+            rng = seed
+        else:
+            rng = np.random.default_rng(seed)
+        return TableElement(self, int(rng.integers(len(self))))
+
+    def compose(self, elem, other):
+        """Return the element applying ``elem`` followed by ``other``.
+
+        Args:
+            elem (TableElement or Clifford): the first element.
+            other (TableElement or Clifford): the second element.
+
+        Returns:
+            TableElement: the composed element.
+        """
+        first = self.element(elem).index
+        second = self.element(other).index
+        if self._products is not None:
+            return TableElement(self, int(self._products[first, second]))
+        return TableElement(self, self._compose_index(first, second))
+
+    def compose_indices(self, first, second):
+        """Compose arrays of element indices elementwise in one pass.
+
+        This is equivalent to :meth:`compose` on each pair of indices,
+        but the compositions are computed together on the arrays.
+
+        Args:
+            first (array_like): the indices of the first elements.
+            second (array_like): the indices of the second elements,
+                broadcast with ``first``.
+
+        Returns:
+            np.ndarray: the indices of the elements applying ``first``
+            followed by ``second``.
+        """
+        first, second = np.broadcast_arrays(np.asarray(first, dtype=np.int64),
+                                            np.asarray(second, dtype=np.int64))
+        if self._products is not None:
+            return self._products[first, second]
+        shape = first.shape
+        first = first.reshape(-1, 1)
+        second = second.reshape(-1, 1)
+        paulis = self._images[first, self._rows]
+        images = self._images[second, paulis]
+        signs = self._signs[first, self._rows] ^ self._signs[second, paulis]
+        keys = _row_keys(self._num_qubits, images, signs)
+        return self._indices(keys).reshape(shape)
+
+    def inverse(self, elem):
+        """Return the inverse element.
+
+        Args:
+            elem (TableElement or Clifford): the element.
+
+        Returns:
+            TableElement: the inverse element.
+        """
+        return TableElement(self, int(self._inverse[self.element(elem).index]))
+
+    def to_clifford(self, elem):
+        """Return the Clifford object of an element.
+
+        Args:
+            elem (TableElement or int): the element.
+
+        Returns:
+            Clifford: the Clifford object.
+        """
+        index = self.element(elem).index
+        nq = 2 * self._num_qubits
+        images = self._images[index, self._rows]
+        tableau = np.zeros((nq, nq + 1), dtype=bool)
+        tableau[:, :nq] = (images[:, None] >> np.arange(nq)) & 1
+        tableau[:, nq] = self._signs[index, self._rows]
+        return Clifford(tableau)
+
+    def to_circuit(self, elem):
+        """Return the decomposed circuit of an element.
+
+        The decomposition is computed once and cached, and a copy of the
+        cached circuit is returned.
+
+        Args:
+            elem (TableElement or int): the element.
+
+        Returns:
+            QuantumCircuit: the decomposition of the element.
+        """
+        return self._circuit(self.element(elem).index).copy()
+
+    def inverse_circuit(self, elem):
+        """Return the inverse of the decomposed circuit of an element.
+
+        The inverse is computed once and cached, and a copy of the cached
+        circuit is returned.
+
+        Args:
+            elem (TableElement or int): the element.
+
+        Returns:
+            QuantumCircuit: the inverse of :meth:`to_circuit`.
+        """
+        return self._inverse_circuit(self.element(elem).index).copy()
+
+    def _circuit(self, index):
+        """Return the cached decomposed circuit of an element index.
+
+        The circuit is shared by all callers and must not be modified.
+        """
+        circ = self._circuits.get(index)
+        if circ is None:
+            circ = self.to_clifford(index).to_circuit()
+            self._circuits[index] = circ
+        return circ
+
+    def _inverse_circuit(self, index):
+        """Return the cached inverse circuit of an element index.
+
+        The circuit is shared by all callers and must not be modified.
+        """
+        circ = self._inverse_circuits.get(index)
+        if circ is None:
+            circ = self._circuit(index).inverse()
+            self._inverse_circuits[index] = circ
+        return circ
+
+    def _compose_index(self, first, second):
+        """Compose two elements by their indices."""
+        # (B A) P (B A)^dg = s_A(P) B Q B^dg for A P A^dg = s_A(P) Q
+        paulis = self._images[first, self._rows]
+        images = self._images[second, paulis]
+        signs = self._signs[first, self._rows] ^ self._signs[second, paulis]
+        key = _row_keys(self._num_qubits, images[None, :], signs[None, :])[0]
+        return self._key_index[int(key)]
+
+    def _indices(self, keys):
+        """Return the indices of an array of element keys."""
+        return np.array([self._key_index[key] for key in keys.tolist()],
+                        dtype=np.int64)
+
+
+def clifford_table(num_qubits, filename=None):
+    """Return the indexed table of the 1 or 2-qubit Clifford group.
+
+    The table is built once on first use and is shared by all later calls.
+
+    Args:
+        num_qubits (int): the number of qubits (1 or 2).
+        filename (str): optional ``.npz`` file for storing the table.
+            If the file exists the table is loaded from it, otherwise
+            the built table is saved to it.
+
+    Returns:
+        CliffordTable: the table of the Clifford group.
+
+    Raises:
+        QiskitError: if the number of qubits is not supported, or the
+            stored table has a different number of qubits.
+    """
+    table = _CLIFFORD_TABLES.get(num_qubits)
+    if table is not None:
+        if filename is not None and not os.path.exists(filename):
+            table.save(filename)
+        return table
+    if filename is not None and os.path.exists(filename):
+        table = CliffordTable.load(filename)
+        if table.num_qubits != num_qubits:
+            raise QiskitError("Stored Clifford table has {} qubits.".format(
+                table.num_qubits))
+    else:
+        table = CliffordTable.build(num_qubits)
+        if filename is not None:
+            table.save(filename)
+    _CLIFFORD_TABLES[num_qubits] = table
+    return table
+
+
+def _generator_rows(num_qubits):
+    """Pauli labels of the tableau rows X_0, ..., X_n-1, Z_0, ..., Z_n-1."""
+    return 1 << np.arange(2 * num_qubits)
+
+
+def _row_keys(num_qubits, images, signs):
+    """Integer keys of elements from the images of the tableau rows."""
+    nq = 2 * num_qubits
+    rows = images | (signs.astype(np.int64) << nq)
+    shifts = (nq + 1) * np.arange(nq)
+    return np.bitwise_or.reduce(rows << shifts, axis=1)
+
+
+def _table_keys(num_qubits, images, signs):
+    """Integer keys of elements from their full Pauli images."""
+    rows = _generator_rows(num_qubits)
+    return _row_keys(num_qubits, images[:, rows], signs[:, rows])
+
+
+def _pauli_matrix(num_qubits, label):
+    """Hermitian Pauli matrix i^(x.z) X^x Z^z of an integer label."""
+    single = {(0, 0): np.eye(2),
+              (1, 0): np.array([[0, 1], [1, 0]]),
+              (0, 1): np.diag([1, -1]),
+              (1, 1): np.array([[0, -1j], [1j, 0]])}
+    mat = np.eye(1)
+    for qubit in range(num_qubits):
+        xbit = (label >> qubit) & 1
+        zbit = (label >> (num_qubits + qubit)) & 1
+        mat = np.kron(single[(xbit, zbit)], mat)
+    return mat
+
+
+def _gate_maps(num_qubits):
+    """Pauli images and signs of the conjugation by H, S and CX gates."""
+    dim = 4 ** num_qubits
+    paulis = [_pauli_matrix(num_qubits, label) for label in range(dim)]
+    gates = []
+    for qubit in range(num_qubits):
+        for name in ('h', 's'):
+            circ = QuantumCircuit(num_qubits)
+            getattr(circ, name)(qubit)
+            gates.append(circ)
+    for control in range(num_qubits):
+        for target in range(num_qubits):
+            if control != target:
+                circ = QuantumCircuit(num_qubits)
+                circ.cx(control, target)
+                gates.append(circ)
+    maps = []
+    for circ in gates:
+        mat = Operator(circ).data
+        images = np.zeros(dim, dtype=np.int64)
+        signs = np.zeros(dim, dtype=bool)
+        for label, pauli in enumerate(paulis):
+            conj = mat.dot(pauli).dot(mat.conj().T)
+            overlaps = np.array([np.trace(other.dot(conj)).real
+                                 for other in paulis]) / 2 ** num_qubits
+            images[label] = np.argmax(np.abs(overlaps))
+            signs[label] = overlaps[images[label]] < 0
+        maps.append((images, signs))
+    return maps
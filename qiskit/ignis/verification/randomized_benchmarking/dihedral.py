@@ -34,11 +34,10 @@ Example:
  T^3 on qubit 0, T^3 on qubit 1, and CS_{0,1} BEFORE CNOT_{0,1}.
 """
 
-import itertools
-from itertools import combinations
-import copy
-from functools import reduce
-from operator import mul
+import os
+from collections import namedtuple
+from itertools import combinations, permutations, product
+from functools import lru_cache
 import numpy as np
 from numpy.random import RandomState
 
@@ -55,8 +54,15 @@ class SpecialPolynomial():
     """Multivariate polynomial with special form.
 
     Maximum degree 3, n Z_2 variables, coefficients in Z_8.
+
+    The coefficients are stored in a single flat ``int8`` array ``weights``
+    holding the constant, linear, quadratic and cubic coefficients in
+    lexicographic order of the monomials. The attributes ``weight_0``,
+    ``weight_1``, ``weight_2`` and ``weight_3`` are views of this array.
     """
 
+    __slots__ = ('n_vars', 'nc2', 'nc3', 'weights')
+
     def __init__(self, n_vars):
         """Construct the zero polynomial on n_vars variables."""
         #   1 constant term
@@ -69,10 +75,61 @@ class SpecialPolynomial():
         self.n_vars = n_vars
         self.nc2 = int(n_vars * (n_vars-1) / 2)
         self.nc3 = int(n_vars * (n_vars-1) * (n_vars-2) / 6)
-        self.weight_0 = 0
-        self.weight_1 = np.zeros(n_vars, dtype=np.int8)
-        self.weight_2 = np.zeros(self.nc2, dtype=np.int8)
-        self.weight_3 = np.zeros(self.nc3, dtype=np.int8)
+        self.weights = np.zeros(1 + n_vars + self.nc2 + self.nc3,
+                                dtype=np.int8)
+
+    @property
+    def weight_0(self):
+        """The constant coefficient."""
+        return int(self.weights[0])
+
+    @weight_0.setter
+    def weight_0(self, value):
+        self.weights[0] = value
+
+    @property
+    def weight_1(self):
+        """The coefficients of the linear terms."""
+        return self.weights[1:1 + self.n_vars]
+
+    @weight_1.setter
+    def weight_1(self, value):
+        self.weights[1:1 + self.n_vars] = value
+
+    @property
+    def weight_2(self):
+        """The coefficients of the quadratic terms."""
+        start = 1 + self.n_vars
+        return self.weights[start:start + self.nc2]
+
+    @weight_2.setter
+    def weight_2(self, value):
+        start = 1 + self.n_vars
+        self.weights[start:start + self.nc2] = value
+
+    @property
+    def weight_3(self):
+        """The coefficients of the cubic terms."""
+        return self.weights[1 + self.n_vars + self.nc2:]
+
+    @weight_3.setter
+    def weight_3(self, value):
+        self.weights[1 + self.n_vars + self.nc2:] = value
+
+    @classmethod
+    def _from_weights(cls, n_vars, weights):
+        """Construct a polynomial from an integer array of coefficients."""
+        result = cls(n_vars)
+        result.weights[:] = np.mod(weights, 8)
+        return result
+
+    def _check_indices(self, indices):
+        """Check that the term indices are in bounds and increasing."""
+        indices_arr = np.array(indices)
+        if (indices_arr < 0).any() or (indices_arr >= self.n_vars).any():
+            raise QiskitError("Indices are out of bounds.")
+        if len(indices) > 1 and (np.diff(indices_arr) <= 0).any():
+            raise QiskitError("Indices are non-increasing.")
 
     def mul_monomial(self, indices):
         """Multiply by a monomial given by indices.
@@ -82,50 +139,25 @@ class SpecialPolynomial():
         length = len(indices)
         if length >= 4:
             raise QiskitError("There is no term with on more than 3 indices.")
-        indices_arr = np.array(indices)
-        if (indices_arr < 0).any() and (indices_arr > self.n_vars).any():
-            raise QiskitError("Indices are out of bounds.")
-        if length > 1 and (np.diff(indices_arr) <= 0).any():
-            raise QiskitError("Indices are non-increasing!")
-        result = SpecialPolynomial(self.n_vars)
-        if length == 0:
-            result = copy.deepcopy(self)
-        else:
-            terms0 = [[]]
-            terms1 = list(combinations(range(self.n_vars), r=1))
-            terms2 = list(combinations(range(self.n_vars), r=2))
-            terms3 = list(combinations(range(self.n_vars), r=3))
-            for term in terms0 + terms1 + terms2 + terms3:
-                value = self.get_term(term)
-                new_term = list(set(term).union(set(indices)))
-                result.set_term(new_term, (result.get_term(new_term) + value) % 8)
-        return result
+        self._check_indices(indices)
+        monomial = SpecialPolynomial(self.n_vars)
+        monomial.set_term(indices, 1)
+        return self * monomial
 
     def __mul__(self, other):
         """Multiply two polynomials."""
         if not isinstance(other, SpecialPolynomial):
             other = int(other)
-        result = SpecialPolynomial(self.n_vars)
         if isinstance(other, int):
-            result.weight_0 = (self.weight_0 * other) % 8
-            result.weight_1 = (self.weight_1 * other) % 8
-            result.weight_2 = (self.weight_2 * other) % 8
-            result.weight_3 = (self.weight_3 * other) % 8
-        else:
-            if self.n_vars != other.n_vars:
-                raise QiskitError("Multiplication on different n_vars.")
-            terms0 = [[]]
-            terms1 = list(combinations(range(self.n_vars), r=1))
-            terms2 = list(combinations(range(self.n_vars), r=2))
-            terms3 = list(combinations(range(self.n_vars), r=3))
-            for term in terms0 + terms1 + terms2 + terms3:
-                value = other.get_term(term)
-                if value != 0:
-                    temp = copy.deepcopy(self)
-                    temp = temp.mul_monomial(term)
-                    temp = temp * value
-                    result = result + temp
-        return result
+            return SpecialPolynomial._from_weights(
+                self.n_vars, self.weights.astype(np.int64) * other)
+        if self.n_vars != other.n_vars:
+            raise QiskitError("Multiplication on different n_vars.")
+        # Pointwise product of the values on the points of weight <= 3
+        tables = _poly_tables(self.n_vars)
+        values = tables.zeta.dot(self.weights) * tables.zeta.dot(other.weights)
+        return SpecialPolynomial._from_weights(self.n_vars,
+                                               tables.mobius.dot(values))
 
     def __rmul__(self, other):
         """Right multiplication.
@@ -140,12 +172,9 @@ class SpecialPolynomial():
             raise QiskitError("Element to add is not a SpecialPolynomial.")
         if self.n_vars != other.n_vars:
             raise QiskitError("Addition on different n_vars.")
-        result = SpecialPolynomial(self.n_vars)
-        result.weight_0 = (self.weight_0 + other.weight_0) % 8
-        result.weight_1 = (self.weight_1 + other.weight_1) % 8
-        result.weight_2 = (self.weight_2 + other.weight_2) % 8
-        result.weight_3 = (self.weight_3 + other.weight_3) % 8
-        return result
+        return SpecialPolynomial._from_weights(
+            self.n_vars,
+            self.weights.astype(np.int64) + other.weights)
 
     def evaluate(self, xval):
         """Evaluate the multinomial at xval.
@@ -156,38 +185,26 @@ class SpecialPolynomial():
         """
         if len(xval) != self.n_vars:
             raise QiskitError("Evaluate on wrong number of variables.")
-        check_int = list(map(lambda x: isinstance(x, int), xval))
-        check_poly = list(map(lambda x: isinstance(x, SpecialPolynomial), xval))
+        check_int = [isinstance(x, (int, np.integer)) for x in xval]
+        check_poly = [isinstance(x, SpecialPolynomial) for x in xval]
         if False in check_int and False in check_poly:
             raise QiskitError("Evaluate on a wrong type.")
-        is_int = (False not in check_int)
-        if not is_int:
-            if False in [i.n_vars == self.n_vars for i in xval]:
-                raise QiskitError("Evaluate on incompatible polynomials.")
-        else:
-            xval = xval % 2
-        # Examine each term of this polynomial
-        terms0 = [[]]
-        terms1 = list(combinations(range(self.n_vars), r=1))
-        terms2 = list(combinations(range(self.n_vars), r=2))
-        terms3 = list(combinations(range(self.n_vars), r=3))
-        # Set the initial result and start for each term
-        if is_int:
-            result = 0
-            start = 1
-        else:
-            result = SpecialPolynomial(self.n_vars)
-            start = SpecialPolynomial(self.n_vars)
-            start.weight_0 = 1
-        # Compute the new terms and accumulate
-        for term in terms0 + terms1 + terms2 + terms3:
-            value = self.get_term(term)
-            if value != 0:
-                newterm = reduce(mul, [xval[j] for j in term], start)
-                result = result + value * newterm
-        if isinstance(result, int):
-            result = result % 8
-        return result
+        tables = _poly_tables(self.n_vars)
+        if False not in check_int:
+            point = np.dot(np.mod(xval, 2).astype(np.int64),
+                           1 << np.arange(self.n_vars, dtype=np.int64))
+            return int(_contains(point, tables.masks).dot(self.weights) % 8)
+        if False in [i.n_vars == self.n_vars for i in xval]:
+            raise QiskitError("Evaluate on incompatible polynomials.")
+        # Values of the variables on the points of weight <= 3, with a
+        # trailing column of ones for the padded monomial variables
+        var_values = np.ones((len(tables.masks), self.n_vars + 1),
+                             dtype=np.int64)
+        var_values[:, :-1] = tables.zeta.dot(
+            np.array([x.weights for x in xval], dtype=np.int64).T)
+        terms = np.prod(var_values[:, tables.term_vars], axis=2) % 8
+        return SpecialPolynomial._from_weights(
+            self.n_vars, tables.mobius.dot(terms.dot(self.weights)))
 
     def set_pj(self, indices):
         """Set to special form polynomial on subset of variables.
@@ -197,19 +214,8 @@ class SpecialPolynomial():
         indices_arr = np.array(indices)
         if (indices_arr < 0).any() or (indices_arr >= self.n_vars).any():
             raise QiskitError("Indices are out of bounds.")
-        indices = sorted(indices)
-        subsets_2 = itertools.combinations(indices, 2)
-        subsets_3 = itertools.combinations(indices, 3)
-        self.weight_0 = 0
-        self.weight_1 = np.zeros(self.n_vars)
-        self.weight_2 = np.zeros(self.nc2)
-        self.weight_3 = np.zeros(self.nc3)
-        for j in indices:
-            self.set_term([j], 1)
-        for j in subsets_2:
-            self.set_term(list(j), 6)
-        for j in subsets_3:
-            self.set_term(list(j), 4)
+        self.weights[:] = _pj_weights(self.n_vars,
+                                      int(np.sum(1 << np.unique(indices_arr))))
 
     def get_term(self, indices):
         """Get the value of a term given the list of variables.
@@ -223,36 +229,10 @@ class SpecialPolynomial():
         If the indices are out of bounds the method fails.
         If the indices are not increasing the method fails.
         """
-        length = len(indices)
-        if length >= 4:
+        if len(indices) >= 4:
             return 0
-        indices_arr = np.array(indices)
-        if (indices_arr < 0).any() or (indices_arr >= self.n_vars).any():
-            raise QiskitError("Indices are out of bounds.")
-        if length > 1 and (np.diff(indices_arr) <= 0).any():
-            raise QiskitError("Indices are non-increasing.")
-
-        if length == 0:
-            return self.weight_0
-        if length == 1:
-            return self.weight_1[indices[0]]
-        if length == 2:
-            # sum(self.n_vars-j, {j, 1, indices[0]})
-            offset_1 = int(indices[0] * self.n_vars -
-                           ((indices[0] + 1) * indices[0])/2)
-            offset_2 = int(indices[1] - indices[0] - 1)
-            return self.weight_2[offset_1 + offset_2]
-
-        # handle length = 3
-        tmp_1 = self.n_vars - indices[0]
-        offset_1 = int((tmp_1 - 3) * (tmp_1 - 2) * (tmp_1 - 1) / 6)
-        tmp_2 = self.n_vars - indices[1]
-        offset_2 = int((tmp_2 - 2) * (tmp_2 - 1) / 2)
-        offset_3 = self.n_vars - indices[2]
-        offset = int(self.n_vars * (self.n_vars - 1) * (self.n_vars - 2) / 6 -
-                     offset_1 - offset_2 - offset_3)
-
-        return self.weight_3[offset]
+        self._check_indices(indices)
+        return self.weights[_poly_tables(self.n_vars).index[tuple(indices)]]
 
     def set_term(self, indices, value):
         """Set the value of a term given the list of variables.
@@ -267,35 +247,11 @@ class SpecialPolynomial():
         If the indices are not increasing the method fails.
         The value is reduced modulo 8.
         """
-        length = len(indices)
-        if length >= 4:
+        if len(indices) >= 4:
             return
-        indices_arr = np.array(indices)
-        if (indices_arr < 0).any() or (indices_arr >= self.n_vars).any():
-            raise QiskitError("Indices are out of bounds.")
-        if length > 1 and (np.diff(indices_arr) <= 0).any():
-            raise QiskitError("Indices are non-increasing.")
-
-        value = value % 8
-        if length == 0:
-            self.weight_0 = value
-        elif length == 1:
-            self.weight_1[indices[0]] = value
-        elif length == 2:
-            # sum(self.n_vars-j, {j, 1, indices[0]})
-            offset_1 = int(indices[0] * self.n_vars -
-                           ((indices[0] + 1) * indices[0])/2)
-            offset_2 = int(indices[1] - indices[0] - 1)
-            self.weight_2[offset_1 + offset_2] = value
-        else:  # length = 3
-            tmp_1 = self.n_vars - indices[0]
-            offset_1 = int((tmp_1 - 3) * (tmp_1 - 2) * (tmp_1 - 1) / 6)
-            tmp_2 = self.n_vars - indices[1]
-            offset_2 = int((tmp_2 - 2) * (tmp_2 - 1) / 2)
-            offset_3 = self.n_vars - indices[2]
-            offset = int(self.n_vars * (self.n_vars - 1) * (self.n_vars - 2) / 6 -
-                         offset_1 - offset_2 - offset_3)
-            self.weight_3[offset] = value
+        self._check_indices(indices)
+        self.weights[_poly_tables(self.n_vars).index[tuple(indices)]] = \
+            value % 8
 
     @property
     def key(self):
@@ -306,7 +262,8 @@ class SpecialPolynomial():
 
     def __eq__(self, x):
         """Test equality."""
-        return isinstance(x, SpecialPolynomial) and self.key == x.key
+        return isinstance(x, SpecialPolynomial) and \
+            self.n_vars == x.n_vars and np.array_equal(self.weights, x.weights)
 
     def __str__(self):
         """Return formatted string representation."""
@@ -339,11 +296,139 @@ class SpecialPolynomial():
         return out
 
 
+_PolyTables = namedtuple('_PolyTables', ['masks', 'index', 'zeta', 'mobius',
+                                         'term_vars', 'bits'])
+
+
+@lru_cache(maxsize=None)
+def _poly_tables(n_vars):
+    """Return the lookup tables of the polynomials on n_vars variables.
+
+    A polynomial of degree at most 3 is determined by its values on the
+    points of weight at most 3, one point for each monomial. The tables
+    hold the bit masks of the monomials (and points), the index of the
+    monomial of each list of variables, the matrix ``zeta`` evaluating
+    the polynomial on the points, its inverse ``mobius``, the variables
+    of each monomial padded with ``n_vars``, and the number of variables
+    of each monomial.
+    """
+    terms = [()]
+    for degree in range(1, 4):
+        terms += list(combinations(range(n_vars), degree))
+    masks = np.array([sum(1 << j for j in term) for term in terms],
+                     dtype=np.int64)
+    index = {term: idx for idx, term in enumerate(terms)}
+    zeta = _contains(masks, masks)
+    bits = np.array([len(term) for term in terms])
+    mobius = zeta * (1 - 2 * ((bits[:, None] - bits[None, :]) % 2))
+    term_vars = np.full((len(terms), 3), n_vars)
+    for idx, term in enumerate(terms):
+        term_vars[idx, :len(term)] = term
+    return _PolyTables(masks, index, zeta, mobius, term_vars, bits)
+
+
+@lru_cache(maxsize=None)
+def _pj_weights(n_vars, support):
+    """Return the weights of the polynomial p_J for a bit mask support J."""
+    tables = _poly_tables(n_vars)
+    inside = (tables.masks & support) == tables.masks
+    weights = np.array([0, 1, 6, 4], dtype=np.int8)[tables.bits]
+    weights[~inside] = 0
+    weights.setflags(write=False)
+    return weights
+
+
+def _contains(points, masks):
+    """Return the matrix of the monomials ``masks`` contained in ``points``."""
+    points = np.asarray(points)
+    return ((points[..., None] & masks) == masks).astype(np.int64)
+
+
+def _parity(values):
+    """Return the parity of the bits of non-negative int64 values."""
+    values = np.array(values, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        values ^= values >> shift
+    return values & 1
+
+
+def _affine_images(linear, shift, points):
+    """Return the bit masks of A x + c for bit masks x.
+
+    Args:
+        linear (np.ndarray): array ``(..., n)`` of the bit masks of the rows
+            of the linear parts A.
+        shift (np.ndarray): array ``(...)`` of the bit masks of the shifts c.
+        points (np.ndarray): array ``(..., P)`` of the points x.
+
+    Returns:
+        np.ndarray: array ``(..., P)`` of the images.
+    """
+    num_qubits = linear.shape[-1]
+    bits = _parity(linear[..., None, :] & points[..., None])
+    images = bits.dot(1 << np.arange(num_qubits, dtype=np.int64))
+    return images ^ shift[..., None]
+
+
+def _compose_arrays(num_qubits, first, second):
+    """Compose batches of CNOT-dihedral elements given as arrays.
+
+    Args:
+        num_qubits (int): the number of qubits.
+        first (tuple): arrays ``(linear, shift, weights)`` of shapes
+            ``(B, n)``, ``(B,)`` and ``(B, m)`` of the first elements.
+        second (tuple): arrays of the second elements.
+
+    Returns:
+        tuple: the arrays of the elements applying the first element
+        and then the second element.
+    """
+    lin1, shift1, weights1 = first
+    lin2, shift2, weights2 = second
+    tables = _poly_tables(num_qubits)
+    # Linear part A2 A1 and shift A2 c1 + c2
+    rows = (lin2[..., None] >> np.arange(num_qubits)) & 1
+    linear = np.bitwise_xor.reduce(np.where(rows, lin1[:, None, :], 0),
+                                   axis=2)
+    shift = _affine_images(lin2, shift2, shift1[:, None])[:, 0]
+    # p(x) = p1(x) + p2(A1 x + c1)
+    images = _affine_images(lin1, shift1,
+                            np.broadcast_to(tables.masks,
+                                            (len(lin1), len(tables.masks))))
+    values = np.einsum('bpm,bm->bp', _contains(images, tables.masks),
+                       weights2.astype(np.int64))
+    weights = np.mod(weights1 + values.dot(tables.mobius.T), 8)
+    return linear, shift, weights
+
+
+def _z2_inverse_rows(rows, num_qubits):
+    """Return the bit mask rows of the inverse of an invertible Z_2 matrix."""
+    rows = [int(row) for row in rows]
+    inverse = [1 << i for i in range(num_qubits)]
+    for col in range(num_qubits):
+        pivot = next((r for r in range(col, num_qubits)
+                      if (rows[r] >> col) & 1), None)
+        if pivot is None:
+            raise QiskitError("Linear part is not invertible.")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        inverse[col], inverse[pivot] = inverse[pivot], inverse[col]
+        for r in range(num_qubits):
+            if r != col and (rows[r] >> col) & 1:
+                rows[r] ^= rows[col]
+                inverse[r] ^= inverse[col]
+    return np.array(inverse, dtype=np.int64)
+
+
 class CNOTDihedral(BaseOperator):
     """CNOT-dihedral Object Class.
     The CNOT-dihedral group on num_qubits qubits is generated by the gates
     CNOT, T and X.
 
+    The linear part and the shift of the affine function are stored as
+    bit masks (one integer per row of the linear part), and the phase
+    polynomial as a flat array of coefficients, so that composition,
+    inversion and the gate updates are vectorized.
+
     References:
         1. Shelly Garion and Andrew W. Cross, *On the structure of the CNOT-Dihedral group*,
            `arXiv:2006.12042 [quant-ph] <https://arxiv.org/abs/2006.12042>`_
@@ -358,47 +443,28 @@ class CNOTDihedral(BaseOperator):
         # Initialize from another CNOTDihedral by sharing the underlying
         # poly, linear and shift
         if isinstance(data, CNOTDihedral):
-            self.linear = data.linear
-            self.shift = data.shift
-            self.poly = data.poly
+            self._num_qubits = data.num_qubits
+            self._set_data(data)
 
         # Initialize from ScalarOp as N-qubit identity discarding any global phase
         elif isinstance(data, ScalarOp):
             if not data.is_unitary() or set(data._input_dims) != {2} or \
                     data.num_qubits is None:
                 raise QiskitError("Can only initialize from N-qubit identity ScalarOp.")
-            self._num_qubits = data.num_qubits
-            # phase polynomial
-            self.poly = SpecialPolynomial(self._num_qubits)
-            # n x n invertible matrix over Z_2
-            self.linear = np.eye(self._num_qubits, dtype=np.int8)
-            # binary shift, n coefficients in Z_2
-            self.shift = np.zeros(self._num_qubits, dtype=np.int8)
+            self._set_identity(data.num_qubits)
 
         # Initialize from a QuantumCircuit or Instruction object
         elif isinstance(data, (QuantumCircuit, Instruction)):
-            self._num_qubits = data.num_qubits
-            elem = self.from_circuit(data)
-            self.poly = elem.poly
-            self.linear = elem.linear
-            self.shift = elem.shift
+            self._set_identity(data.num_qubits)
+            self._set_data(self.from_circuit(data))
 
         # Construct the identity element on num_qubits qubits.
-        elif isinstance(data, int):
-            self._num_qubits = data
-            # phase polynomial
-            self.poly = SpecialPolynomial(self._num_qubits)
-            # n x n invertible matrix over Z_2
-            self.linear = np.eye(self._num_qubits, dtype=np.int8)
-            # binary shift, n coefficients in Z_2
-            self.shift = np.zeros(self._num_qubits, dtype=np.int8)
+        elif isinstance(data, (int, np.integer)):
+            self._set_identity(int(data))
 
         elif isinstance(data, Pauli):
-            self._num_qubits = data.num_qubits
-            elem = self.from_circuit(data.to_instruction())
-            self.poly = elem.poly
-            self.linear = elem.linear
-            self.shift = elem.shift
+            self._set_identity(data.num_qubits)
+            self._set_data(self.from_circuit(data.to_instruction()))
 
         # Initialize BaseOperator
         super().__init__(num_qubits=self._num_qubits)
@@ -407,61 +473,83 @@ class CNOTDihedral(BaseOperator):
         if validate and not self.is_cnotdihedral():
             raise QiskitError('Invalid CNOTDihedsral element.')
 
-    def _z2matmul(self, left, right):
-        """Compute product of two n x n z2 matrices."""
-        prod = np.mod(np.dot(left, right), 2)
-        return prod
+    def _set_identity(self, num_qubits):
+        """Set the data to the identity element on num_qubits qubits."""
+        if num_qubits > 63:
+            raise QiskitError("CNOTDihedral supports at most 63 qubits.")
+        self._num_qubits = num_qubits
+        # phase polynomial
+        self.poly = SpecialPolynomial(num_qubits)
+        # n x n invertible matrix over Z_2, as bit masks of the rows
+        self._linear = 1 << np.arange(num_qubits, dtype=np.int64)
+        # binary shift, n coefficients in Z_2, as a bit mask
+        self._shift = 0
+
+    def _set_data(self, other):
+        """Share the poly, linear and shift of another element."""
+        self._linear = other._linear
+        self._shift = other._shift
+        self.poly = other.poly
+
+    @property
+    def linear(self):
+        """The n x n linear part of the affine function over Z_2."""
+        return ((self._linear[:, None] >> np.arange(self._num_qubits)) &
+                1).astype(np.int8)
+
+    @linear.setter
+    def linear(self, value):
+        value = np.asarray(value, dtype=np.int64)
+        if value.shape != (self._num_qubits, self._num_qubits):
+            raise QiskitError("Invalid shape of the linear part.")
+        self._linear = (value & 1).dot(
+            1 << np.arange(self._num_qubits, dtype=np.int64))
 
-    def _z2matvecmul(self, mat, vec):
-        """Compute mat*vec of n x n z2 matrix and vector."""
-        prod = np.mod(np.dot(mat, vec), 2)
-        return prod
+    @property
+    def shift(self):
+        """The binary shift of the affine function."""
+        return ((self._shift >> np.arange(self._num_qubits)) &
+                1).astype(np.int8)
+
+    @shift.setter
+    def shift(self, value):
+        value = np.asarray(value, dtype=np.int64)
+        if value.shape != (self._num_qubits,):
+            raise QiskitError("Invalid shape of the shift.")
+        self._shift = int((value & 1).dot(
+            1 << np.arange(self._num_qubits, dtype=np.int64)))
+
+    def _arrays(self):
+        """Return the batch arrays (linear, shift, weights) of the element."""
+        return (self._linear[None, :], np.array([self._shift], dtype=np.int64),
+                self.poly.weights[None, :].astype(np.int64))
+
+    @classmethod
+    def _from_arrays(cls, num_qubits, linear, shift, weights):
+        """Construct an element from the arrays of a single element."""
+        result = cls(num_qubits, validate=False)
+        result._linear = np.array(linear, dtype=np.int64)
+        result._shift = int(shift)
+        result.poly.weights[:] = weights
+        return result
 
     def __mul__(self, other):
         """Left multiplication self * other."""
         if self.num_qubits != other.num_qubits:
             raise QiskitError("Multiplication on different number of qubits.")
-        result = CNOTDihedral(self.num_qubits)
-        result.shift = [(x[0] + x[1]) % 2
-                        for x in zip(self._z2matvecmul(self.linear, other.shift), self.shift)]
-        result.linear = self._z2matmul(self.linear, other.linear)
-        # Compute x' = B1*x + c1 using the p_j identity
-        new_vars = []
-        for i in range(self.num_qubits):
-            support = np.arange(self.num_qubits)[np.nonzero(other.linear[i])]
-            poly = SpecialPolynomial(self.num_qubits)
-            poly.set_pj(support)
-            if other.shift[i] == 1:
-                poly = -1 * poly
-                poly.weight_0 = (poly.weight_0 + 1) % 8
-            new_vars.append(poly)
-        # p' = p1 + p2(x')
-        result.poly = other.poly + self.poly.evaluate(new_vars)
-        return result
+        linear, shift, weights = _compose_arrays(
+            self.num_qubits, other._arrays(), self._arrays())
+        return CNOTDihedral._from_arrays(self.num_qubits, linear[0], shift[0],
+                                         weights[0])
 
     def __rmul__(self, other):
         """Right multiplication other * self."""
         if self.num_qubits != other.num_qubits:
             raise QiskitError("Multiplication on different number of qubits.")
-        result = CNOTDihedral(self.num_qubits)
-        result.shift = [(x[0] + x[1]) % 2
-                        for x in zip(self._z2matvecmul(other.linear,
-                                                       self.shift),
-                                     other.shift)]
-        result.linear = self._z2matmul(other.linear, self.linear)
-        # Compute x' = B1*x + c1 using the p_j identity
-        new_vars = []
-        for i in range(self.num_qubits):
-            support = np.arange(self.num_qubits)[np.nonzero(self.linear[i])]
-            poly = SpecialPolynomial(self.num_qubits)
-            poly.set_pj(support)
-            if other.shift[i] == 1:
-                poly = -1 * poly
-                poly.weight_0 = (poly.weight_0 + 1) % 8
-            new_vars.append(poly)
-        # p' = p1 + p2(x')
-        result.poly = self.poly + other.poly.evaluate(new_vars)
-        return result
+        linear, shift, weights = _compose_arrays(
+            self.num_qubits, self._arrays(), other._arrays())
+        return CNOTDihedral._from_arrays(self.num_qubits, linear[0], shift[0],
+                                         weights[0])
 
     @property
     def key(self):
@@ -470,9 +558,26 @@ class CNOTDihedral(BaseOperator):
                tuple(self.shift))
         return str(tup)
 
+    def _int_key(self):
+        """Return an integer key of the element up to a global phase."""
+        num_qubits = self._num_qubits
+        key = int.from_bytes(self.poly.weights[1:].tobytes(), 'little')
+        for row in self._linear[::-1]:
+            key = (key << num_qubits) | int(row)
+        return (key << num_qubits) | self._shift
+
+    def copy(self):
+        """Return a copy of the element."""
+        return CNOTDihedral._from_arrays(self._num_qubits, self._linear,
+                                         self._shift, self.poly.weights)
+
     def __eq__(self, x):
         """Test equality."""
-        return isinstance(x, CNOTDihedral) and self.key == x.key
+        return isinstance(x, CNOTDihedral) and \
+            self.num_qubits == x.num_qubits and \
+            self._shift == x._shift and \
+            np.array_equal(self._linear, x._linear) and \
+            self.poly == x.poly
 
     def cnot(self, i, j):
         """Apply a CNOT gate to this element.
@@ -481,8 +586,8 @@ class CNOTDihedral(BaseOperator):
 
         if not 0 <= i < self.num_qubits or not 0 <= j < self.num_qubits:
             raise QiskitError("cnot qubits are out of bounds.")
-        self.linear[j] = (self.linear[i] + self.linear[j]) % 2
-        self.shift[j] = (self.shift[i] + self.shift[j]) % 2
+        self._linear[j] ^= self._linear[i]
+        self._shift ^= ((self._shift >> i) & 1) << j
 
     def phase(self, k, i):
         """Apply an k-th power of T to this element.
@@ -490,24 +595,15 @@ class CNOTDihedral(BaseOperator):
         """
         if not 0 <= i < self.num_qubits:
             raise QiskitError("phase qubit out of bounds.")
-        # If the kth bit is flipped, conjugate this gate
-        if self.shift[i] == 1:
+        # Add k times the i-th output bit (A x + c)_i, which has the
+        # polynomial p_J or 1 - p_J for the support J of row i.
+        # The constant term is a global phase and is discarded.
+        weights = _pj_weights(self.num_qubits, int(self._linear[i]))
+        if (self._shift >> i) & 1:
             k = (7*k) % 8
-        # Take all subsets \alpha of the support of row i
-        # of weight up to 3 and add k*(-2)**(|\alpha| - 1) mod 8
-        # to the corresponding term.
-        support = np.arange(self.num_qubits)[np.nonzero(self.linear[i])]
-        subsets_2 = itertools.combinations(support, 2)
-        subsets_3 = itertools.combinations(support, 3)
-        for j in support:
-            value = self.poly.get_term([j])
-            self.poly.set_term([j], (value + k) % 8)
-        for j in subsets_2:
-            value = self.poly.get_term(list(j))
-            self.poly.set_term(list(j), (value + -2 * k) % 8)
-        for j in subsets_3:
-            value = self.poly.get_term(list(j))
-            self.poly.set_term(list(j), (value + 4 * k) % 8)
+        constant = self.poly.weights[0]
+        self.poly.weights[:] = (self.poly.weights + k * weights) % 8
+        self.poly.weights[0] = constant
 
     def flip(self, i):
         """Apply X to this element.
@@ -515,7 +611,7 @@ class CNOTDihedral(BaseOperator):
         """
         if not 0 <= i < self.num_qubits:
             raise QiskitError("flip qubit out of bounds.")
-        self.shift[i] = (self.shift[i] + 1) % 2
+        self._shift ^= 1 << i
 
     def __str__(self):
         """Return formatted string representation."""
@@ -523,16 +619,18 @@ class CNOTDihedral(BaseOperator):
         out += str(self.poly)
         out += "\naffine function = \n"
         out += " ("
+        linear = self.linear
+        shift = self.shift
         for row in range(self.num_qubits):
             wrote = False
             for col in range(self.num_qubits):
-                if self.linear[row][col] != 0:
+                if linear[row][col] != 0:
                     if wrote:
                         out += (" + x_" + str(col))
                     else:
                         out += ("x_" + str(col))
                         wrote = True
-            if self.shift[row] != 0:
+            if shift[row] != 0:
                 out += " + 1"
             if row != self.num_qubits - 1:
                 out += ","
@@ -677,35 +775,19 @@ class CNOTDihedral(BaseOperator):
             elem0 = other
             elem1 = self
 
-        result = CNOTDihedral(elem0.num_qubits + elem1.num_qubits)
-        linear = np.block([[elem0.linear,
-                            np.zeros((elem0.num_qubits, elem1.num_qubits), dtype=np.int8)],
-                           [np.zeros((elem1.num_qubits, elem0.num_qubits), dtype=np.int8),
-                            elem1.linear]])
-        result.linear = linear
-        shift = np.block([elem0.shift, elem1.shift])
-        result.shift = shift
-
-        for i in range(elem0.num_qubits):
-            value = elem0.poly.get_term([i])
-            result.poly.set_term([i], value)
-            for j in range(i):
-                value = elem0.poly.get_term([j, i])
-                result.poly.set_term([j, i], value)
-                for k in range(j):
-                    value = elem0.poly.get_term([k, j, i])
-                    result.poly.set_term([k, j, i], value)
-
-        for i in range(elem1.num_qubits):
-            value = elem1.poly.get_term([i])
-            result.poly.set_term([i + elem0.num_qubits], value)
-            for j in range(i):
-                value = elem1.poly.get_term([j, i])
-                result.poly.set_term([j + elem0.num_qubits, i + elem0.num_qubits], value)
-                for k in range(j):
-                    value = elem1.poly.get_term([k, j, i])
-                    result.poly.set_term([k + elem0.num_qubits, j + elem0.num_qubits,
-                                          i + elem0.num_qubits], value)
+        num0 = elem0.num_qubits
+        result = CNOTDihedral(num0 + elem1.num_qubits)
+        result._linear = np.concatenate([elem0._linear, elem1._linear << num0])
+        result._shift = elem0._shift | (elem1._shift << num0)
+
+        # The monomials of both elements are monomials of the result on
+        # the variables of elem0 and the shifted variables of elem1
+        index = {mask: idx for idx, mask in
+                 enumerate(_poly_tables(result.num_qubits).masks)}
+        for elem, offset in ((elem0, 0), (elem1, num0)):
+            masks = _poly_tables(elem.num_qubits).masks[1:] << offset
+            result.poly.weights[[index[mask] for mask in masks]] = \
+                elem.poly.weights[1:]
 
         return result
 
@@ -734,9 +816,17 @@ class CNOTDihedral(BaseOperator):
     def adjoint(self):
         """Return the conjugate transpose of the CNOTDihedral element"""
 
-        circ = self.to_instruction()
-        result = self.from_circuit(circ.inverse())
-        return result
+        # The inverse maps y to A^{-1} (y + c) with the phase -p(A^{-1} (y + c))
+        tables = _poly_tables(self.num_qubits)
+        linear = _z2_inverse_rows(self._linear, self.num_qubits)
+        shift = _affine_images(linear, np.array(0),
+                               np.array([self._shift]))[0]
+        images = _affine_images(linear, np.array(shift), tables.masks)
+        weights = tables.mobius.dot(
+            -_contains(images, tables.masks).dot(self.poly.weights))
+        weights[0] = 0
+        return CNOTDihedral._from_arrays(self.num_qubits, linear, shift,
+                                         weights % 8)
 
     def conjugate(self):
         """Return the conjugate of the CNOTDihedral element."""
@@ -784,6 +874,52 @@ class CNOTDihedral(BaseOperator):
         return True
 
 
+def compose_cnotdihedral_batch(elems, others, front=False):
+    """Compose lists of CNOT-dihedral elements elementwise in one pass.
+
+    This is equivalent to ``[a.compose(b, front=front) for a, b in
+    zip(elems, others)]``, but the compositions are computed together on
+    the stacked arrays of the elements.
+
+    Args:
+        elems (list[CNOTDihedral]): the elements to compose.
+        others (list[CNOTDihedral]): the elements composed with ``elems``.
+        front (bool): if True compose using right operator multiplication,
+                      instead of left multiplication [default: False].
+
+    Returns:
+        list[CNOTDihedral]: the composed elements.
+
+    Raises:
+        QiskitError: if the lists have different lengths, or the elements
+            have different numbers of qubits.
+    """
+    elems = list(elems)
+    others = list(others)
+    if len(elems) != len(others):
+        raise QiskitError("Lists of elements have different lengths.")
+    if not elems:
+        return []
+    num_qubits = elems[0].num_qubits
+    if any(elem.num_qubits != num_qubits for elem in elems + others):
+        raise QiskitError("Incompatible dimension for composition")
+
+    def stack(batch):
+        return (np.array([elem._linear for elem in batch]),
+                np.array([elem._shift for elem in batch], dtype=np.int64),
+                np.array([elem.poly.weights for elem in batch],
+                         dtype=np.int64))
+
+    if front:
+        first, second = stack(others), stack(elems)
+    else:
+        first, second = stack(elems), stack(others)
+    linear, shift, weights = _compose_arrays(num_qubits, first, second)
+    weights[:, 0] = 0  # set global phase
+    return [CNOTDihedral._from_arrays(num_qubits, *arrays)
+            for arrays in zip(linear, shift, weights)]
+
+
 def make_dict_0(num_qubits):
     """Make the zero-CNOT dictionary.
 
@@ -828,21 +964,320 @@ def make_dict_next(num_qubits, dicts_prior):
             for j in range(num_qubits):
                 if i != j:
                     for tpower in range(4):
-                        new_elem = copy.deepcopy(elem)
-                        new_circ = copy.deepcopy(circ)
+                        new_elem = elem.copy()
+                        new_circ = circ + [("cx", i, j)]
                         new_elem.cnot(i, j)
-                        new_circ.append(("cx", i, j))
                         if tpower > 0:
                             new_elem.phase(tpower, j)
                             new_circ.append(("u1", tpower, j))
-                        if True not in [(new_elem.key in d)
-                                        for d in dicts_prior] \
-                                and new_elem.key not in obj:
-                            obj[new_elem.key] = (new_elem, new_circ)
+                        key = new_elem.key
+                        if key not in obj and \
+                                not any(key in d for d in dicts_prior):
+                            obj[key] = (new_elem, new_circ)
 
     return obj
 
 
+# Numbers of qubits for which CNOT-dihedral synthesis tables are used
+CNOTDIHEDRAL_TABLE_QUBITS = (1, 2)
+
+# Packaged synthesis tables, formatted with the number of qubits
+CNOTDIHEDRAL_TABLE_FILE = os.path.join(os.path.dirname(__file__),
+                                       'cnotdihedral_table_{}q.npz')
+
+# Tables that were already built or loaded, indexed by number of qubits
+_CNOTDIHEDRAL_TABLES = {}
+
+
+class CNOTDihedralTable():
+    """Synthesis table of the n-qubit CNOT-dihedral group, for n = 1, 2.
+
+    The table maps the integer key of every element (up to a global
+    phase) to the circuit of :func:`decompose_cnotdihedral_2_qubits`,
+    encoded as an array of gate codes. The circuit and the inverse
+    circuit of an element are therefore dictionary lookups, and are
+    constructed once on demand and cached.
+    """
+
+    def __init__(self, num_qubits, keys, gates):
+        """Initialize the table from the element keys and gate codes.
+
+        Use :func:`cnotdihedral_table` or :meth:`build` for constructing
+        the table of the full group.
+
+        Args:
+            num_qubits (int): the number of qubits.
+            keys (np.ndarray): array of the integer keys of the elements.
+            gates (np.ndarray): array of shape ``(len(keys), length)`` of
+                the gate codes of the circuits of the elements, padded
+                with zeros.
+
+        Raises:
+            QiskitError: if the arrays are not a table of ``num_qubits``
+                qubits.
+        """
+        if num_qubits not in CNOTDIHEDRAL_TABLE_QUBITS:
+            raise QiskitError("CNOT-dihedral tables are only supported for "
+                              "{} qubits.".format(CNOTDIHEDRAL_TABLE_QUBITS))
+        self._num_qubits = num_qubits
+        self._keys = np.asarray(keys, dtype=np.int64)
+        self._gates = np.asarray(gates, dtype=np.uint8)
+        if self._keys.ndim != 1 or self._gates.ndim != 2 or \
+                len(self._gates) != len(self._keys) or \
+                self._gates.max(initial=0) >= len(_synthesis_gates(num_qubits)):
+            raise QiskitError("Invalid CNOT-dihedral table arrays.")
+        self._key_index = dict(zip(self._keys.tolist(),
+                                   range(len(self._keys))))
+        if len(self._key_index) != len(self._keys):
+            raise QiskitError("CNOT-dihedral table elements are not unique.")
+        self._circuits = {}
+        self._inverse_circuits = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return "CNOTDihedralTable(num_qubits={}, size={})".format(
+            self._num_qubits, len(self))
+
+    @property
+    def num_qubits(self):
+        """Return the number of qubits."""
+        return self._num_qubits
+
+    @classmethod
+    def build(cls, num_qubits):
+        """Build the table of the full CNOT-dihedral group.
+
+        Args:
+            num_qubits (int): the number of qubits (1 or 2).
+
+        Returns:
+            CNOTDihedralTable: the table of the ``num_qubits``-qubit
+            CNOT-dihedral group.
+
+        Raises:
+            QiskitError: if the number of qubits is not supported.
+        """
+        if num_qubits not in CNOTDIHEDRAL_TABLE_QUBITS:
+            raise QiskitError("CNOT-dihedral tables are only supported for "
+                              "{} qubits.".format(CNOTDIHEDRAL_TABLE_QUBITS))
+        codes = {gate: code for code, gate in
+                 enumerate(_synthesis_gates(num_qubits))}
+        elems = sorted(_cnotdihedral_elements(num_qubits),
+                       key=CNOTDihedral._int_key)
+        circuits = [[codes[_gate_label(circuit, instr, qargs)]
+                     for instr, qargs, _ in circuit.data]
+                    for circuit in map(decompose_cnotdihedral_2_qubits, elems)]
+        gates = np.zeros((len(elems), max(map(len, circuits))),
+                         dtype=np.uint8)
+        for row, circuit in zip(gates, circuits):
+            row[:len(circuit)] = circuit
+        return cls(num_qubits, [elem._int_key() for elem in elems], gates)
+
+    @classmethod
+    def load(cls, filename):
+        """Load a table stored by :meth:`save`.
+
+        Args:
+            filename (str): the file name.
+
+        Returns:
+            CNOTDihedralTable: the loaded table.
+        """
+        with np.load(filename) as data:
+            return cls(int(data['num_qubits']), data['keys'], data['gates'])
+
+    def save(self, filename):
+        """Store the table in a ``.npz`` file.
+
+        Args:
+            filename (str): the file name.
+        """
+        with open(filename, 'wb') as file:
+            np.savez_compressed(file, num_qubits=self._num_qubits,
+                                keys=self._keys, gates=self._gates)
+
+    def index(self, elem):
+        """Return the index of an element in the table.
+
+        Args:
+            elem (CNOTDihedral): the element.
+
+        Returns:
+            int: the index of the element.
+
+        Raises:
+            QiskitError: if the element is not in the table.
+        """
+        if elem.num_qubits != self._num_qubits:
+            raise QiskitError("Number of qubits of the CNOTDihedral does not "
+                              "match the table.")
+        index = self._key_index.get(elem._int_key())
+        if index is None:
+            raise QiskitError("Element is not in the CNOT-dihedral table.")
+        return index
+
+    def gates(self, elem):
+        """Return the gates of the circuit of an element.
+
+        Args:
+            elem (CNOTDihedral): the element.
+
+        Returns:
+            list[tuple]: the gates ``(name, power, qubits)``, where
+            ``power`` is the power of T of the ``u1`` gates.
+        """
+        gates = _synthesis_gates(self._num_qubits)
+        return [gates[code] for code in self._gates[self.index(elem)]
+                if code]
+
+    def to_circuit(self, elem):
+        """Return the circuit of an element.
+
+        The circuit is constructed once and cached, and a copy of the
+        cached circuit is returned.
+
+        Args:
+            elem (CNOTDihedral): the element.
+
+        Returns:
+            QuantumCircuit: the decomposition of the element.
+        """
+        return self._circuit(self.index(elem)).copy()
+
+    def inverse_circuit(self, elem):
+        """Return the inverse of the circuit of an element.
+
+        The inverse is constructed once and cached, and a copy of the
+        cached circuit is returned.
+
+        Args:
+            elem (CNOTDihedral): the element.
+
+        Returns:
+            QuantumCircuit: the inverse of :meth:`to_circuit`.
+        """
+        return self._inverse_circuit(self.index(elem)).copy()
+
+    def _circuit(self, index):
+        """Return the cached circuit of an element index.
+
+        The circuit is shared by all callers and must not be modified.
+        """
+        circuit = self._circuits.get(index)
+        if circuit is None:
+            gates = _synthesis_gates(self._num_qubits)
+            circuit = QuantumCircuit(self._num_qubits)
+            for code in self._gates[index]:
+                if not code:
+                    continue
+                name, power, qubits = gates[code]
+                if name == 'u1':
+                    circuit.append(U1Gate(power * np.pi / 4), list(qubits))
+                else:
+                    getattr(circuit, name)(*qubits)
+            self._circuits[index] = circuit
+        return circuit
+
+    def _inverse_circuit(self, index):
+        """Return the cached inverse circuit of an element index.
+
+        The circuit is shared by all callers and must not be modified.
+        """
+        circuit = self._inverse_circuits.get(index)
+        if circuit is None:
+            circuit = self._circuit(index).inverse()
+            self._inverse_circuits[index] = circuit
+        return circuit
+
+
+def cnotdihedral_table(num_qubits, filename=None):
+    """Return the synthesis table of the 1 or 2-qubit CNOT-dihedral group.
+
+    The table is loaded from the packaged file, or built if the file is
+    missing, once on first use and is shared by all later calls.
+
+    Args:
+        num_qubits (int): the number of qubits (1 or 2).
+        filename (str): optional ``.npz`` file for storing the table.
+            If the file exists the table is loaded from it, otherwise
+            the table is saved to it.
+
+    Returns:
+        CNOTDihedralTable: the table of the CNOT-dihedral group.
+
+    Raises:
+        QiskitError: if the number of qubits is not supported, or the
+            stored table has a different number of qubits.
+    """
+    table = _CNOTDIHEDRAL_TABLES.get(num_qubits)
+    if table is not None:
+        if filename is not None and not os.path.exists(filename):
+            table.save(filename)
+        return table
+    if filename is None and num_qubits in CNOTDIHEDRAL_TABLE_QUBITS:
+        packaged = CNOTDIHEDRAL_TABLE_FILE.format(num_qubits)
+        if os.path.exists(packaged):
+            filename = packaged
+    if filename is not None and os.path.exists(filename):
+        table = CNOTDihedralTable.load(filename)
+        if table.num_qubits != num_qubits:
+            raise QiskitError("Stored CNOT-dihedral table has {} qubits."
+                              .format(table.num_qubits))
+    else:
+        table = CNOTDihedralTable.build(num_qubits)
+        if filename is not None:
+            table.save(filename)
+    _CNOTDIHEDRAL_TABLES[num_qubits] = table
+    return table
+
+
+@lru_cache(maxsize=None)
+def _synthesis_gates(num_qubits):
+    """Return the gates of the synthesis tables indexed by their codes.
+
+    The gates are tuples ``(name, power, qubits)``, where ``power`` is
+    the power of T of the ``u1`` gates. Code 0 is the padding.
+    """
+    gates = [None]
+    for qubit in range(num_qubits):
+        gates += [('id', 0, (qubit,)), ('x', 0, (qubit,))]
+        gates += [('u1', power, (qubit,)) for power in range(1, 8)]
+    for qubits in permutations(range(num_qubits), 2):
+        gates += [('cx', 0, qubits), ('cz', 0, qubits)]
+    return gates
+
+
+def _gate_label(circuit, instr, qargs):
+    """Return the synthesis table gate of a circuit instruction."""
+    power = 0
+    if instr.name == 'u1':
+        power = int(round(4 * float(instr.params[0]) / np.pi)) % 8
+    return (instr.name, power,
+            tuple(circuit.qubits.index(qubit) for qubit in qargs))
+
+
+def _cnotdihedral_elements(num_qubits):
+    """Return all the CNOT-dihedral elements on num_qubits qubits."""
+    nc2 = num_qubits * (num_qubits - 1) // 2
+    nc3 = num_qubits * (num_qubits - 1) * (num_qubits - 2) // 6
+    weights = [np.array((0,) + w1 + w2 + w3) for w1, w2, w3 in product(
+        product(range(8), repeat=num_qubits),
+        product(range(0, 8, 2), repeat=nc2),
+        product((0, 4), repeat=nc3))]
+    elems = []
+    for rows in product(range(2 ** num_qubits), repeat=num_qubits):
+        try:
+            _z2_inverse_rows(rows, num_qubits)
+        except QiskitError:
+            continue
+        for shift in range(2 ** num_qubits):
+            elems += [CNOTDihedral._from_arrays(num_qubits, rows, shift, w)
+                      for w in weights]
+    return elems
+
+
 def append_circuit(elem, circuit, qargs=None):
     """Update a CNOTDihedral element inplace by applying a CNOTDihedral circuit.
 
@@ -935,6 +1370,9 @@ def decompose_cnotdihedral(elem):
         elem (CNOTDihedral): a CNOTDihedral element.
     Return:
         QuantumCircuit: a circuit implementation of the CNOTDihedral element.
+    Remark:
+        1 and 2-qubit elements are looked up in the synthesis tables
+        of :func:`cnotdihedral_table`.
 
     References:
         1. Shelly Garion and Andrew W. Cross, *On the structure of the CNOT-Dihedral group*,
@@ -947,7 +1385,9 @@ def decompose_cnotdihedral(elem):
     num_qubits = elem.num_qubits
 
     if num_qubits < 3:
-        return decompose_cnotdihedral_2_qubits(elem)
+        if elem.poly.weight_0 != 0:
+            raise QiskitError("Element is not CNOT-Dihedral.")
+        return cnotdihedral_table(num_qubits).to_circuit(elem)
 
     return decompose_cnotdihedral_general(elem)
 
@@ -1313,8 +1753,8 @@ def random_cnotdihedral(num_qubits, seed=None):
 
     Args:
         num_qubits (int): the number of qubits for the CNOTDihedral object.
-        seed (int or RandomState): Optional. Set a fixed seed or
-                                   generator for RNG.
+        seed (int or RandomState or Generator): Optional. Set a fixed seed or
+                                                generator for RNG.
     Returns:
         CNOTDihedral: a random CNOTDihedral element.
     """
@@ -1323,6 +1763,8 @@ def random_cnotdihedral(num_qubits, seed=None):
         rng = np.random
     elif isinstance(seed, RandomState):
         rng = seed
+    elif isinstance(seed, np.random.Generator):
+        rng = RandomState(seed.bit_generator)
     else:
         rng = RandomState(seed)
 
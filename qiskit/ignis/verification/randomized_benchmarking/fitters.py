@@ -23,13 +23,12 @@
 Functions used for the analysis of randomized benchmarking results.
 """
 
+import re
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from scipy.optimize import curve_fit
 import numpy as np
-from qiskit import QiskitError
-from qiskit.quantum_info.analysis.average import average_data
-from ..tomography import marginal_counts
-from ...utils import build_counts_dict_from_list
+from qiskit.tools import parallel_map
 
 try:
     from matplotlib import pyplot as plt
@@ -158,6 +157,25 @@ class RBFitter(RBFitterBase):
         self._nseeds = []
         self._circ_name_type = ''
 
+        # Ground state and total counts of each seed and length, and the
+        # number of results that were added to them
+        self._ground_counts = np.zeros((0, len(cliff_lengths[0]),
+                                        len(rb_pattern)))
+        self._shot_counts = np.zeros((0, len(cliff_lengths[0]), 1))
+        self._num_processed = 0
+
+        # Running statistics over the seeds of each pattern and length,
+        # and the raw data values that they include
+        self._stats = None
+        self._stats_data = None
+
+        # Fitted parameters of each pattern, used as the initial guess of
+        # later fits if warm_start is True
+        self._fit_guess = [None] * len(rb_pattern)
+        self._warm_start = False
+        self._batch_fit = False
+        self._num_processes = 1
+
         self._result_list = []
         self.add_data(backend_result)
 
@@ -171,7 +189,7 @@ class RBFitter(RBFitterBase):
         if raw_data is None:
             self._raw_data = []
         else:
-            self._raw_data = raw_data
+            self._raw_data = np.asarray(raw_data, dtype=float)
 
     @property
     def cliff_lengths(self):
@@ -207,6 +225,33 @@ class RBFitter(RBFitterBase):
         """Return the fit function rb_fit_fun."""
         return self._rb_fit_fun
 
+    @property
+    def warm_start(self):
+        """Return True if fits start from the previous fit parameters."""
+        return self._warm_start
+
+    @warm_start.setter
+    def warm_start(self, warm_start):
+        self._warm_start = bool(warm_start)
+
+    @property
+    def batch_fit(self):
+        """Return True if all the patterns are fitted together in a batch."""
+        return self._batch_fit
+
+    @batch_fit.setter
+    def batch_fit(self, batch_fit):
+        self._batch_fit = bool(batch_fit)
+
+    @property
+    def num_processes(self):
+        """Return the number of processes for the batched fit."""
+        return self._num_processes
+
+    @num_processes.setter
+    def num_processes(self, num_processes):
+        self._num_processes = int(num_processes)
+
     @property
     def seeds(self):
         """Return the number of loaded seeds."""
@@ -222,6 +267,12 @@ class RBFitter(RBFitterBase):
         Add a new result. Re calculate the raw data, means and
         fit.
 
+        Only the counts of the results added since the last update are
+        processed: the raw data of the seeds and lengths of their circuits
+        are updated, and the means and std devs are updated by removing
+        the old values and adding the new values. If ``warm_start`` is
+        True, the fit starts from the previous fit parameters.
+
         Args:
             new_backend_result (list): list of RB results.
             rerun_fit (bool): re calculate the means and fit the result.
@@ -249,8 +300,8 @@ class RBFitter(RBFitterBase):
                     self._nseeds.append(nseeds_circ)
 
         if rerun_fit:
-            self.calc_data()
-            self.calc_statistics()
+            self._update_data()
+            self._update_statistics()
             self.fit_data()
 
     @staticmethod
@@ -263,7 +314,7 @@ class RBFitter(RBFitterBase):
         """Retrieve probabilities of success from execution results.
 
         Outputs results into an internal variable _raw_data which is a
-        3-dimensional list, where item (i,j,k) is the probability
+        3-dimensional array, where item (i,j,k) is the probability
         to measure the ground state for the set of qubits in pattern "i"
         for seed no. j and vector length self._cliff_lengths[i][k].
 
@@ -272,53 +323,50 @@ class RBFitter(RBFitterBase):
             the output of circuits generated by randomized_benchmarking_seq.
         """
 
-        # The type of the circuit name, e.g. rb or rb_interleaved
-        # as it appears in the result (before _length_%d_seed_%d)
-        self._circ_name_type = self._result_list[0].results[0]. \
-            header.name.split("_length")[0]
-
-        circ_counts = {}
-        circ_shots = {}
-        for seed in self._nseeds:
-            for circ, _ in enumerate(self._cliff_lengths[0]):
-                circ_name = self._circ_name_type + '_length_%d_seed_%d' \
-                            % (circ, seed)
-                count_list = []
-                for result in self._result_list:
-                    try:
-                        count_list.append(result.get_counts(circ_name))
-                    except (QiskitError, KeyError):
-                        pass
-
-                circ_counts[circ_name] = \
-                    build_counts_dict_from_list(count_list)
-
-                circ_shots[circ_name] = sum(circ_counts[circ_name].values())
-
+        self._ground_counts[:] = 0
+        self._shot_counts[:] = 0
+        self._num_processed = 0
         self._raw_data = []
-        startind = 0
-
-        for patt_ind in range(len(self._rb_pattern)):
+        self._update_data()
 
-            string_of_0s = ''
-            string_of_0s = string_of_0s.zfill(len(self._rb_pattern[patt_ind]))
+    def _update_data(self):
+        """Add the counts of the results that were not processed yet.
 
-            self._raw_data.append([])
-            endind = startind+len(self._rb_pattern[patt_ind])
+        Updates the raw data of the seeds and lengths of their circuits.
+        """
+        if not self._result_list:
+            return
 
-            for seedidx, seed in enumerate(self._nseeds):
+        # The type of the circuit name, e.g. rb or rb_interleaved
+        # as it appears in the result (before _length_%d_seed_%d)
+        self._circ_name_type = self._result_list[0].results[0]. \
+            header.name.split("_length")[0]
 
-                self._raw_data[-1].append([])
-                for k, _ in enumerate(self._cliff_lengths[patt_ind]):
-                    circ_name = self._circ_name_type + '_length_%d_seed_%d' \
-                                % (k, seed)
-                    counts_subspace = marginal_counts(
-                        circ_counts[circ_name],
-                        np.arange(startind, endind))
-                    self._raw_data[-1][seedidx].append(
-                        counts_subspace.get(string_of_0s, 0)
-                        / circ_shots[circ_name])
-            startind = endind
+        nseeds = len(self._nseeds)
+        nlengths = len(self._cliff_lengths[0])
+        npatterns = len(self._rb_pattern)
+        new_seeds = nseeds - len(self._ground_counts)
+        self._ground_counts = np.concatenate(
+            [self._ground_counts, np.zeros((new_seeds, nlengths, npatterns))])
+        self._shot_counts = np.concatenate(
+            [self._shot_counts, np.zeros((new_seeds, nlengths, 1))])
+        raw_data = np.full((npatterns, nseeds, nlengths), np.nan)
+        if len(self._raw_data):
+            raw_data[:, :self._raw_data.shape[1]] = self._raw_data
+        self._raw_data = raw_data
+
+        circ_names = [self._circ_name_type + '_length_%d_seed_%d' % (k, seed)
+                      for seed in self._nseeds for k in range(nlengths)]
+        ground, shots = _ground_state_counts(
+            self._result_list[self._num_processed:], circ_names,
+            [len(qubits) for qubits in self._rb_pattern])
+        self._num_processed = len(self._result_list)
+        self._ground_counts += ground.reshape(self._ground_counts.shape)
+        self._shot_counts += shots.reshape(self._shot_counts.shape)
+
+        updated = shots.reshape(nseeds, nlengths) > 0
+        self._raw_data[:, updated] = (self._ground_counts[updated] /
+                                      self._shot_counts[updated]).T
 
     def calc_statistics(self):
         """Extract averages and std dev from the raw data (self._raw_data).
@@ -335,17 +383,44 @@ class RBFitter(RBFitterBase):
            entry j of this array contains the std
            of the probability of success over seeds,
            for vector length self._cliff_lengths[i][j].
+
+        Seeds whose raw data is missing (nan) are skipped.
         """
 
-        self._ydata = []
-        for patt_ind in range(len(self._rb_pattern)):
-            self._ydata.append({})
-            self._ydata[-1]['mean'] = np.mean(self._raw_data[patt_ind], 0)
+        self._stats = None
+        self._stats_data = None
+        self._update_statistics()
 
-            if len(self._raw_data[patt_ind]) == 1:  # 1 seed
-                self._ydata[-1]['std'] = None
-            else:
-                self._ydata[-1]['std'] = np.std(self._raw_data[patt_ind], 0)
+    def _update_statistics(self):
+        """Update the running means and std devs with the changed raw data.
+
+        The values of the raw data that changed since the last update are
+        removed from, and their new values are added to, the count, mean
+        and sum of squared deviations of each pattern and length.
+        """
+        raw_data = np.asarray(self._raw_data, dtype=float)
+        if self._stats_data is None:
+            self._stats = np.zeros((3,) + raw_data.shape[::2])
+            old_data = np.full(raw_data.shape, np.nan)
+        else:
+            old_data = np.full(raw_data.shape, np.nan)
+            old_data[:, :self._stats_data.shape[1]] = self._stats_data
+        changed = (old_data != raw_data) & \
+            ~(np.isnan(old_data) & np.isnan(raw_data))
+        self._stats = _remove_samples(self._stats, old_data,
+                                      changed & ~np.isnan(old_data))
+        self._stats = _add_samples(self._stats, raw_data,
+                                   changed & ~np.isnan(raw_data))
+        self._stats_data = raw_data.copy()
+
+        count, mean, sum_sq = self._stats
+        mean = np.where(count > 0, mean, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(sum_sq / count)
+        if raw_data.shape[1] == 1:
+            std = [None] * len(raw_data)
+        self._ydata = [{'mean': mean[patt_ind], 'std': std[patt_ind]}
+                       for patt_ind in range(len(raw_data))]
 
     def fit_data_pattern(self, patt_ind, fit_guess):
         """
@@ -364,22 +439,31 @@ class RBFitter(RBFitterBase):
          * ``epc`` - error per Clifford.
         """
 
-        lens = self._cliff_lengths[patt_ind]
-        qubits = self._rb_pattern[patt_ind]
+        params, pcov = curve_fit(self._rb_fit_fun,
+                                 self._cliff_lengths[patt_ind],
+                                 self._ydata[patt_ind]['mean'],
+                                 sigma=self._fit_sigma(patt_ind),
+                                 p0=fit_guess,
+                                 bounds=([0, 0, 0], [1, 1, 1]))
+        self._set_fit(patt_ind, params, pcov)
+
+    def _fit_sigma(self, patt_ind):
+        """Return the sigma of the fit of a pattern.
 
-        # if at least one of the std values is zero, then sigma is replaced
-        # by None
+        If at least one of the std values is zero, then sigma is
+        replaced by None.
+        """
         if not self._ydata[patt_ind]['std'] is None:
             sigma = self._ydata[patt_ind]['std'].copy()
             if len(sigma) - np.count_nonzero(sigma) > 0:
                 sigma = None
         else:
             sigma = None
-        params, pcov = curve_fit(self._rb_fit_fun, lens,
-                                 self._ydata[patt_ind]['mean'],
-                                 sigma=sigma,
-                                 p0=fit_guess,
-                                 bounds=([0, 0, 0], [1, 1, 1]))
+        return sigma
+
+    def _set_fit(self, patt_ind, params, pcov):
+        """Store the fit parameters of a pattern and their errors."""
+        qubits = self._rb_pattern[patt_ind]
         alpha = params[1]  # exponent
         params_err = np.sqrt(np.diag(pcov))
         alpha_err = params_err[1]
@@ -390,12 +474,16 @@ class RBFitter(RBFitterBase):
 
         self._fit[patt_ind] = {'params': params, 'params_err': params_err,
                                'epc': epc, 'epc_err': epc_err}
+        self._fit_guess[patt_ind] = tuple(params)
 
     def fit_data(self):
         """Fit the RB results to an exponential curve.
 
         Fit each of the patterns. Use the data to construct guess values
-        for the fits.
+        for the fits, or the previous fit parameters of the pattern if
+        ``warm_start`` is True. If ``batch_fit`` is True, all the patterns
+        are fitted together by a vectorized Levenberg-Marquardt with an
+        analytic Jacobian, using ``num_processes`` processes.
 
         Puts the results into a list of fit dictionaries where each dictionary
         corresponds to a pattern and has fields:
@@ -407,29 +495,141 @@ class RBFitter(RBFitterBase):
 
         """
 
+        if self._batch_fit:
+            _batch_fit_data([self], self._num_processes)
+            return
+
         for patt_ind, _ in enumerate(self._rb_pattern):
+            self.fit_data_pattern(patt_ind, self._initial_guess(patt_ind))
+
+    def _initial_guess(self, patt_ind):
+        """Return the guess values for the fit of a pattern."""
+        if self._warm_start and self._fit_guess[patt_ind] is not None:
+            return self._fit_guess[patt_ind]
 
-            qubits = self._rb_pattern[patt_ind]
+        qubits = self._rb_pattern[patt_ind]
 
-            # Should decay to 1/2^n
-            fit_guess = [0.95, 0.99, 1/2**len(qubits)]
+        # Should decay to 1/2^n
+        fit_guess = [0.95, 0.99, 1/2**len(qubits)]
+
+        # Use the first two points to guess the decay param
+        y0 = self._ydata[patt_ind]['mean'][0]
+        y1 = self._ydata[patt_ind]['mean'][1]
+        dcliff = (self._cliff_lengths[patt_ind][1] -
+                  self._cliff_lengths[patt_ind][0])
+        dy = ((y1 - fit_guess[2]) /
+              (y0 - fit_guess[2]))
+        alpha_guess = dy**(1/dcliff)
+        if alpha_guess < 1.0:
+            fit_guess[1] = alpha_guess
+
+        if y0 > fit_guess[2]:
+            fit_guess[0] = ((y0 - fit_guess[2]) /
+                            fit_guess[1]**self._cliff_lengths[patt_ind][0])
+
+        return tuple(fit_guess)
+
+    def bootstrap(self, num_samples=1000, percentiles=(2.5, 50, 97.5),
+                  resample_shots=True, seed=None, num_processes=None):
+        """Bootstrap confidence intervals of the RB fit.
+
+        Every bootstrap sample resamples the seeds with replacement (the
+        same seeds for all the patterns) and, if ``resample_shots`` is
+        True, the ground state counts of every circuit from a binomial
+        distribution with the measured probability. The seed to seed
+        variation already contains the shot noise, so resampling the shots
+        too gives wider, more conservative intervals. The samples are
+        fitted together by the batched fitter, starting from the fit
+        parameters.
 
-            # Use the first two points to guess the decay param
-            y0 = self._ydata[patt_ind]['mean'][0]
-            y1 = self._ydata[patt_ind]['mean'][1]
-            dcliff = (self._cliff_lengths[patt_ind][1] -
-                      self._cliff_lengths[patt_ind][0])
-            dy = ((y1 - fit_guess[2]) /
-                  (y0 - fit_guess[2]))
-            alpha_guess = dy**(1/dcliff)
-            if alpha_guess < 1.0:
-                fit_guess[1] = alpha_guess
+        Args:
+            num_samples (int): the number of bootstrap samples.
+            percentiles (list): the percentiles to return.
+            resample_shots (bool): resample the shots of the circuits in
+                addition to the seeds.
+            seed (int): the seed of the random number generator. The result
+                does not depend on ``num_processes``.
+            num_processes (int): the number of processes to fit the samples
+                with (default is ``num_processes`` of the fitter).
 
-            if y0 > fit_guess[2]:
-                fit_guess[0] = ((y0 - fit_guess[2]) /
-                                fit_guess[1]**self._cliff_lengths[patt_ind][0])
+        Returns:
+            list: A list of dictionaries where each dictionary corresponds
+            to a pattern and has fields:
+
+                * ``percentiles`` - the percentiles.
+                * ``alpha`` - the percentiles of the exponent.
+                * ``epc`` - the percentiles of the error per Clifford.
+                * ``epc_samples`` - the error per Clifford of all the
+                  samples.
+        """
+        rng = np.random.default_rng(seed)
+        alpha = self._bootstrap_alpha(num_samples, resample_shots, rng,
+                                      num_processes)
+        nrb = 2 ** np.array([len(qubits) for qubits in self._rb_pattern])
+        epc = ((nrb - 1) / nrb)[:, None] * (1 - alpha)
+
+        alpha_pct = _bootstrap_percentiles(alpha, percentiles)
+        epc_pct = _bootstrap_percentiles(epc, percentiles)
+        return [{'percentiles': np.array(percentiles),
+                 'alpha': alpha_pct[patt_ind],
+                 'epc': epc_pct[patt_ind],
+                 'epc_samples': epc[patt_ind]}
+                for patt_ind, _ in enumerate(self._rb_pattern)]
+
+    def _bootstrap_alpha(self, num_samples, resample_shots, rng,
+                         num_processes=None):
+        """Return the exponents of bootstrap samples of the raw data.
 
-            self.fit_data_pattern(patt_ind, tuple(fit_guess))
+        Args:
+            num_samples (int): the number of bootstrap samples.
+            resample_shots (bool): resample the shots of the circuits in
+                addition to the seeds.
+            rng (np.random.Generator): the random number generator.
+            num_processes (int): the number of processes to fit the samples
+                with (default is ``num_processes`` of the fitter).
+
+        Returns:
+            np.array: the exponents, of shape ``(patterns, num_samples)``.
+        """
+        if num_processes is None:
+            num_processes = self._num_processes
+        raw_data = np.asarray(self._raw_data, dtype=float)
+        npatterns, nseeds, nlengths = raw_data.shape
+
+        seeds = rng.integers(nseeds, size=(num_samples, nseeds))
+        data = raw_data[:, seeds]
+        valid = ~np.isnan(data)
+        if resample_shots:
+            shots = np.broadcast_to(self._shot_counts[seeds, :, 0],
+                                    data.shape)
+            counts = rng.binomial(shots.astype(np.int64),
+                                  np.where(valid, data, 0))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                data = np.where(valid, counts / shots, np.nan)
+
+        # means and std devs over the seeds, skipping missing data
+        count = np.sum(valid, axis=2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.where(valid, data, 0).sum(axis=2) / count
+            std = np.sqrt(np.where(valid, (data - mean[:, :, None]) ** 2,
+                                   0).sum(axis=2) / count)
+        # as in the fit, sigma is replaced by None if a std value is zero
+        unweighted = (nseeds == 1) | np.any(std == 0, axis=2, keepdims=True)
+        sigma = np.where(unweighted | np.isnan(std), 1, std)
+
+        xdata = np.broadcast_to(
+            np.asarray(self._cliff_lengths, dtype=float)[:, None],
+            mean.shape)
+        # the raw fitted parameters, before any rescaling of the stored fit
+        fit_guess = np.broadcast_to(
+            np.array([self._fit_guess[patt_ind]
+                      for patt_ind in range(npatterns)])[:, None],
+            (npatterns, num_samples, 3))
+        params, _ = _fit_exponential_parallel(
+            xdata.reshape(-1, nlengths), mean.reshape(-1, nlengths),
+            sigma.reshape(-1, nlengths), fit_guess.reshape(-1, 3),
+            num_processes)
+        return params[:, 1].reshape(npatterns, num_samples)
 
     def plot_rb_data(self, pattern_index=0, ax=None,
                      add_label=True, show_plt=True):
@@ -582,6 +782,36 @@ class InterleavedRBFitter(RBFitterBase):
         """Return raw_data as a 2 element list."""
         return [self.rbfit_std.raw_data, self.rbfit_int.raw_data]
 
+    @property
+    def warm_start(self):
+        """Return True if fits start from the previous fit parameters."""
+        return self.rbfit_std.warm_start
+
+    @warm_start.setter
+    def warm_start(self, warm_start):
+        self.rbfit_std.warm_start = warm_start
+        self.rbfit_int.warm_start = warm_start
+
+    @property
+    def batch_fit(self):
+        """Return True if all the patterns are fitted together in a batch."""
+        return self.rbfit_std.batch_fit
+
+    @batch_fit.setter
+    def batch_fit(self, batch_fit):
+        self.rbfit_std.batch_fit = batch_fit
+        self.rbfit_int.batch_fit = batch_fit
+
+    @property
+    def num_processes(self):
+        """Return the number of processes for the batched fit."""
+        return self.rbfit_std.num_processes
+
+    @num_processes.setter
+    def num_processes(self, num_processes):
+        self.rbfit_std.num_processes = num_processes
+        self.rbfit_int.num_processes = num_processes
+
     def add_data(self, new_original_result,
                  new_interleaved_result, rerun_fit=True):
         """
@@ -597,10 +827,14 @@ class InterleavedRBFitter(RBFitterBase):
             Assumes that the executed 'result' is
             the output of circuits generated by randomized_benchmarking_seq.
         """
-        self.rbfit_std.add_data(new_original_result, rerun_fit)
-        self.rbfit_int.add_data(new_interleaved_result, rerun_fit)
+        # the inner fitters are only fitted once, by fit_data
+        self.rbfit_std.add_data(new_original_result, rerun_fit=False)
+        self.rbfit_int.add_data(new_interleaved_result, rerun_fit=False)
 
         if rerun_fit:
+            for fitter in (self.rbfit_std, self.rbfit_int):
+                fitter._update_data()
+                fitter._update_statistics()
             self.fit_data()
 
     def calc_data(self):
@@ -655,8 +889,12 @@ class InterleavedRBFitter(RBFitterBase):
             * 'systematic_err_L' = epc_est - systematic_err (left error bound).
             * 'systematic_err_R' = epc_est + systematic_err (right error bound).
         """
-        self.rbfit_std.fit_data()
-        self.rbfit_int.fit_data()
+        if self.rbfit_std.batch_fit:
+            _batch_fit_data([self.rbfit_std, self.rbfit_int],
+                            self.rbfit_std.num_processes)
+        else:
+            self.rbfit_std.fit_data()
+            self.rbfit_int.fit_data()
         self._fit_interleaved = []
 
         for patt_ind, (_, qubits) in enumerate(zip(self._cliff_lengths,
@@ -703,6 +941,55 @@ class InterleavedRBFitter(RBFitterBase):
                                           'systematic_err_R':
                                               systematic_err_R})
 
+    def bootstrap(self, num_samples=1000, percentiles=(2.5, 50, 97.5),
+                  resample_shots=True, seed=None, num_processes=None):
+        """Bootstrap confidence intervals of the interleaved RB fit.
+
+        The standard and interleaved data are resampled independently as
+        in :meth:`RBFitter.bootstrap`.
+
+        Args:
+            num_samples (int): the number of bootstrap samples.
+            percentiles (list): the percentiles to return.
+            resample_shots (bool): resample the shots of the circuits in
+                addition to the seeds.
+            seed (int): the seed of the random number generator. The result
+                does not depend on ``num_processes``.
+            num_processes (int): the number of processes to fit the samples
+                with (default is ``num_processes`` of the fitter).
+
+        Returns:
+            list: A list of dictionaries where each dictionary corresponds
+            to a pattern and has fields:
+
+                * ``percentiles`` - the percentiles.
+                * ``alpha`` - the percentiles of the standard exponent.
+                * ``alpha_c`` - the percentiles of the interleaved exponent.
+                * ``epc_est`` - the percentiles of the estimated error per
+                  the interleaved Clifford.
+                * ``epc_est_samples`` - the estimated error per the
+                  interleaved Clifford of all the samples.
+        """
+        rng = np.random.default_rng(seed)
+        alpha = self.rbfit_std._bootstrap_alpha(
+            num_samples, resample_shots, rng, num_processes)
+        alpha_c = self.rbfit_int._bootstrap_alpha(
+            num_samples, resample_shots, rng, num_processes)
+
+        # Eq. (4) of arXiv:1203.4550
+        nrb = 2 ** np.array([len(qubits) for qubits in self._rb_pattern])
+        epc_est = ((nrb - 1) / nrb)[:, None] * (1 - alpha_c / alpha)
+
+        alpha_pct = _bootstrap_percentiles(alpha, percentiles)
+        alpha_c_pct = _bootstrap_percentiles(alpha_c, percentiles)
+        epc_est_pct = _bootstrap_percentiles(epc_est, percentiles)
+        return [{'percentiles': np.array(percentiles),
+                 'alpha': alpha_pct[patt_ind],
+                 'alpha_c': alpha_c_pct[patt_ind],
+                 'epc_est': epc_est_pct[patt_ind],
+                 'epc_est_samples': epc_est[patt_ind]}
+                for patt_ind, _ in enumerate(self._rb_pattern)]
+
     def plot_rb_data(self, pattern_index=0, ax=None,
                      add_label=True, show_plt=True):
         """
@@ -810,6 +1097,11 @@ class PurityRBFitter(RBFitterBase):
         # rb purity fitter
         self._rbfit_purity = RBFitter(purity_result, cliff_lengths,
                                       rb_pattern)
+
+        # Marginal counts of the patterns of each (purity index, seed,
+        # length), and the number of results that were added to them
+        self._circ_counts = None
+        self._num_processed = 0
         self.add_data(purity_result)
 
     @property
@@ -852,6 +1144,33 @@ class PurityRBFitter(RBFitterBase):
         """Return all the results."""
         return self.rbfit_pur.results
 
+    @property
+    def warm_start(self):
+        """Return True if fits start from the previous fit parameters."""
+        return self.rbfit_pur.warm_start
+
+    @warm_start.setter
+    def warm_start(self, warm_start):
+        self.rbfit_pur.warm_start = warm_start
+
+    @property
+    def batch_fit(self):
+        """Return True if all the patterns are fitted together in a batch."""
+        return self.rbfit_pur.batch_fit
+
+    @batch_fit.setter
+    def batch_fit(self, batch_fit):
+        self.rbfit_pur.batch_fit = batch_fit
+
+    @property
+    def num_processes(self):
+        """Return the number of processes for the batched fit."""
+        return self.rbfit_pur.num_processes
+
+    @num_processes.setter
+    def num_processes(self, num_processes):
+        self.rbfit_pur.num_processes = num_processes
+
     @staticmethod
     def _rb_pur_fit_fun(x, a, alpha, b):
         """Function used to fit purity rb."""
@@ -907,6 +1226,10 @@ class PurityRBFitter(RBFitterBase):
         """
         Add a new result.
 
+        Only the counts of the results added since the last update are
+        merged, and the purities of the seeds of their circuits are
+        recalculated.
+
         Args:
             new_purity_result (list): list of RB results of the
                 purity RB circuits.
@@ -921,11 +1244,11 @@ class PurityRBFitter(RBFitterBase):
         if new_purity_result is None:
             return
 
-        self.rbfit_pur.add_data(new_purity_result, rerun_fit)
+        self.rbfit_pur.add_data(new_purity_result, rerun_fit=False)
 
         if rerun_fit:
-            self.calc_data()
-            self.calc_statistics()
+            self._update_data()
+            self.rbfit_pur._update_statistics()
             self.fit_data()
 
     def calc_data(self):
@@ -941,86 +1264,100 @@ class PurityRBFitter(RBFitterBase):
             Assumes that the executed 'result' is
             the output of circuits generated by randomized_benchmarking_seq,
         """
-        circ_counts = {}
-        circ_shots = {}
-        result_count = 0
-
-        # Calculating the result output
-        for _, seed in enumerate(self.rbfit_pur.seeds):
-
-            for pur in range(self._npurity):
-
-                self._circ_name_type = self.rbfit_pur.results[
-                    result_count].results[0].header.name.split("_length")[0]
-                result_count += 1
-
-                for circ, _ in enumerate(self._cliff_lengths[0]):
-                    circ_name = self._circ_name_type + '_length_%d_seed_%d' \
-                                % (circ, seed)
-                    count_list = []
-                    for result in self.rbfit_pur.results:
-                        try:
-                            count_list.append(result.get_counts(circ_name))
-                        except (QiskitError, KeyError):
-                            pass
-
-                    circ_name = 'rb_purity_' + str(pur) + \
-                                '_length_%d_seed_%d' % (circ, seed)
-
-                    circ_counts[circ_name] = build_counts_dict_from_list(
-                        count_list)
-                    circ_shots[circ_name] = sum(circ_counts[circ_name].
-                                                values())
-
-        # Calculating raw_data
-        self.rbfit_pur.raw_data = []
-        startind = 0
-        # for each pattern
-        for patt_ind, _ in enumerate(self._rb_pattern):
-
-            endind = startind + len(self._rb_pattern[patt_ind])
-            self.rbfit_pur.raw_data.append([])
-
-            # for each seed
-            for seedidx, seed in enumerate(self.rbfit_pur.seeds):
-                self.rbfit_pur.raw_data[-1].append([])
-
-                # for each length
-                for k, _ in enumerate(self._cliff_lengths[0]):
-
-                    # vector of the 4^n correlators and counts
-                    corr_vec = [0] * (4 ** self._nq)
-                    count_vec = [0] * (4 ** self._nq)
-                    # corr_list = [[] for e in range(4 ** self._nq)]
-
-                    for pur in range(self._npurity):
-
-                        circ_name = 'rb_purity_' + str(pur) + \
-                                    '_length_%d_seed_%d' % (k, seed)
-
-                        # marginal counts for the pattern
-                        counts_subspace = marginal_counts(
-                            circ_counts[circ_name],
-                            np.arange(startind, endind))
-
-                        # calculating the vector of 4^n correlators
-                        for indcorr in range(2 ** self._nq):
-                            zcorr = average_data(counts_subspace,
-                                                 self._zdict_ops[indcorr])
-                            zind = self.F234(self._nq, indcorr, pur)
+        self._circ_counts = None
+        self._num_processed = 0
+        self._update_data()
 
-                            corr_vec[zind] += zcorr
-                            count_vec[zind] += 1
+    def _update_data(self):
+        """Merge the counts of the results that were not processed yet.
 
-                    # calculating the purity
-                    purity = 0
-                    for idx, _ in enumerate(corr_vec):
-                        purity += (corr_vec[idx]/count_vec[idx]) ** 2
-                    purity = purity / (2 ** self._nq)
+        The counts of each circuit are added to the marginal counts of
+        the patterns, and the purities of the seeds of the circuits are
+        recalculated. The purity of a seed and length is nan until the
+        counts of all the ``npurity`` circuits are available.
+        """
+        seeds = self.rbfit_pur.seeds
+        nlengths = len(self._cliff_lengths[0])
+        dim = 2 ** self._nq
+        raw_data = np.full((len(self._rb_pattern), len(seeds), nlengths),
+                           np.nan)
+        if self._num_processed:
+            old_data = self.rbfit_pur.raw_data
+            raw_data[:, :old_data.shape[1]] = old_data
+        else:
+            self._circ_counts = np.zeros((self._npurity, 0, nlengths,
+                                          len(self._rb_pattern), dim))
+        new_seeds = len(seeds) - self._circ_counts.shape[1]
+        self._circ_counts = np.concatenate(
+            [self._circ_counts,
+             np.zeros((self._npurity, new_seeds) +
+                      self._circ_counts.shape[2:])], axis=1)
+
+        seed_index = {seed: seedidx for seedidx, seed in enumerate(seeds)}
+        starts = np.cumsum([0] + [len(qubits) for qubits in
+                                  self._rb_pattern])[:-1, None]
+        offsets = dim * np.arange(len(self._rb_pattern))[:, None]
+        name_re = re.compile(r'_purity_([XYZ]+)_length_(\d+)_seed_(\d+)$')
+
+        updated = set()
+        for result in self.rbfit_pur.results[self._num_processed:]:
+            done = set()
+            for exp_index, rbcirc in enumerate(result.results):
+                match = name_re.search(rbcirc.header.name)
+                if match is None or rbcirc.header.name in done:
+                    continue
+                done.add(rbcirc.header.name)
+                self._circ_name_type = rbcirc.header.name.split("_length")[0]
+                # the first letter is the least significant base 3 digit
+                pur = sum(3 ** ind * 'ZXY'.index(basis)
+                          for ind, basis in enumerate(match.group(1)))
+                seedidx = seed_index[int(match.group(3))]
+                counts = result.get_counts(exp_index)
+                if not counts:
+                    continue
+                keys = [key.replace(' ', '') for key in counts]
+                outcomes = np.array([int(key, 2) for key in keys])
+                values = np.fromiter(counts.values(), dtype=float,
+                                     count=len(counts))
+                # outcome of the qubits of each pattern, offset by pattern.
+                # As in marginal_counts, outcomes of only nq bits are
+                # not marginalized.
+                shifts = 0 if len(keys[0]) == self._nq else starts
+                marginal = ((outcomes >> shifts) & (dim - 1)) + offsets
+                self._circ_counts[pur, seedidx, int(match.group(2))] += \
+                    np.bincount(marginal.ravel(),
+                                weights=np.tile(values, len(starts)),
+                                minlength=dim * len(starts)).reshape(-1, dim)
+                updated.add(seedidx)
+        self._num_processed = len(self.rbfit_pur.results)
+
+        if updated:
+            rows = sorted(updated)
+            raw_data[:, rows] = self._purities(self._circ_counts[:, rows])
+        self.rbfit_pur.raw_data = raw_data
+
+    def _purities(self, circ_counts):
+        """Return the purities of marginal counts.
+
+        The :math:`2^n` Z-correlators of every marginal distribution are
+        computed by one Walsh-Hadamard transform, and are averaged into
+        the :math:`4^n` Pauli correlators of each purity.
 
-                    self.rbfit_pur.raw_data[-1][seedidx].append(purity)
+        Args:
+            circ_counts (np.array): the marginal counts of the patterns, of
+                shape ``(npurity, seeds, lengths, patterns, 2 ** n)``.
 
-            startind = endind
+        Returns:
+            np.array: the purities, of shape ``(patterns, seeds, lengths)``.
+        """
+        dim = 2 ** self._nq
+        with np.errstate(divide='ignore', invalid='ignore'):
+            probs = circ_counts / np.sum(circ_counts, axis=-1, keepdims=True)
+        zcorr = np.moveaxis(_walsh_hadamard(probs), 0, -2)
+        zcorr = zcorr.reshape(zcorr.shape[:-2] + (-1,))
+        corr = zcorr.dot(_purity_correlator_map(self._nq, self._npurity))
+        purity = np.sum(corr ** 2, axis=-1) / dim
+        return np.moveaxis(purity, -1, 0)
 
     def calc_statistics(self):
         """Extract averages and std dev from the raw data (self._raw_data).
@@ -1101,6 +1438,48 @@ class PurityRBFitter(RBFitterBase):
             self.rbfit_pur.fit[patt_ind]['pepc_err'] = \
                 pepc_err
 
+    def bootstrap(self, num_samples=1000, percentiles=(2.5, 50, 97.5),
+                  seed=None, num_processes=None):
+        """Bootstrap confidence intervals of the purity RB fit.
+
+        Every bootstrap sample resamples the seeds with replacement, as in
+        :meth:`RBFitter.bootstrap`. The shots are not resampled, since the
+        purities are not binomial.
+
+        Args:
+            num_samples (int): the number of bootstrap samples.
+            percentiles (list): the percentiles to return.
+            seed (int): the seed of the random number generator. The result
+                does not depend on ``num_processes``.
+            num_processes (int): the number of processes to fit the samples
+                with (default is ``num_processes`` of the fitter).
+
+        Returns:
+            list: A list of dictionaries where each dictionary corresponds
+            to a pattern and has fields:
+
+                * ``percentiles`` - the percentiles.
+                * ``alpha`` - the percentiles of the purity exponent.
+                * ``pepc`` - the percentiles of the purity error per
+                  Clifford.
+                * ``pepc_samples`` - the purity error per Clifford of all
+                  the samples.
+        """
+        rng = np.random.default_rng(seed)
+        alpha_pur = np.sqrt(self.rbfit_pur._bootstrap_alpha(
+            num_samples, False, rng, num_processes))
+
+        nrb = 2 ** self._nq
+        pepc = (nrb - 1) / nrb * (1 - alpha_pur)
+
+        alpha_pct = _bootstrap_percentiles(alpha_pur, percentiles)
+        pepc_pct = _bootstrap_percentiles(pepc, percentiles)
+        return [{'percentiles': np.array(percentiles),
+                 'alpha': alpha_pct[patt_ind],
+                 'pepc': pepc_pct[patt_ind],
+                 'pepc_samples': pepc[patt_ind]}
+                for patt_ind, _ in enumerate(self._rb_pattern)]
+
     def plot_rb_data(self, pattern_index=0, ax=None,
                      add_label=True, show_plt=True):
         """Plot purity RB data of a single pattern."""
@@ -1243,6 +1622,36 @@ class CNOTDihedralRBFitter(RBFitterBase):
         """Return raw_data as 2 element list."""
         return [self.rbfit_Z.raw_data, self.rbfit_X.raw_data]
 
+    @property
+    def warm_start(self):
+        """Return True if fits start from the previous fit parameters."""
+        return self.rbfit_Z.warm_start
+
+    @warm_start.setter
+    def warm_start(self, warm_start):
+        self.rbfit_Z.warm_start = warm_start
+        self.rbfit_X.warm_start = warm_start
+
+    @property
+    def batch_fit(self):
+        """Return True if all the patterns are fitted together in a batch."""
+        return self.rbfit_Z.batch_fit
+
+    @batch_fit.setter
+    def batch_fit(self, batch_fit):
+        self.rbfit_Z.batch_fit = batch_fit
+        self.rbfit_X.batch_fit = batch_fit
+
+    @property
+    def num_processes(self):
+        """Return the number of processes for the batched fit."""
+        return self.rbfit_Z.num_processes
+
+    @num_processes.setter
+    def num_processes(self, num_processes):
+        self.rbfit_Z.num_processes = num_processes
+        self.rbfit_X.num_processes = num_processes
+
     def add_data(self, new_cnotdihedral_Z_result,
                  new_cnotdihedral_X_result, rerun_fit=True):
         """
@@ -1259,10 +1668,14 @@ class CNOTDihedralRBFitter(RBFitterBase):
             Assumes that the executed 'result' is
             the output of circuits generated by randomized_benchmarking_seq.
         """
-        self.rbfit_Z.add_data(new_cnotdihedral_Z_result, rerun_fit)
-        self.rbfit_X.add_data(new_cnotdihedral_X_result, rerun_fit)
+        # the inner fitters are only fitted once, by fit_data
+        self.rbfit_Z.add_data(new_cnotdihedral_Z_result, rerun_fit=False)
+        self.rbfit_X.add_data(new_cnotdihedral_X_result, rerun_fit=False)
 
         if rerun_fit:
+            for fitter in (self.rbfit_Z, self.rbfit_X):
+                fitter._update_data()
+                fitter._update_statistics()
             self.fit_data()
 
     def calc_data(self):
@@ -1321,8 +1734,12 @@ class CNOTDihedralRBFitter(RBFitterBase):
                    params_err.
 
         """
-        self.rbfit_Z.fit_data()
-        self.rbfit_X.fit_data()
+        if self.rbfit_Z.batch_fit:
+            _batch_fit_data([self.rbfit_Z, self.rbfit_X],
+                            self.rbfit_Z.num_processes)
+        else:
+            self.rbfit_Z.fit_data()
+            self.rbfit_X.fit_data()
         self._fit_cnotdihedral = []
 
         for patt_ind, (_, qubits) in enumerate(zip(self._cliff_lengths,
@@ -1356,6 +1773,52 @@ class CNOTDihedralRBFitter(RBFitterBase):
                                            'epg_est': epg_est,
                                            'epg_est_err': epg_est_err})
 
+    def bootstrap(self, num_samples=1000, percentiles=(2.5, 50, 97.5),
+                  resample_shots=True, seed=None, num_processes=None):
+        """Bootstrap confidence intervals of the CNOT-dihedral RB fit.
+
+        The Z and X data are resampled independently as in
+        :meth:`RBFitter.bootstrap`.
+
+        Args:
+            num_samples (int): the number of bootstrap samples.
+            percentiles (list): the percentiles to return.
+            resample_shots (bool): resample the shots of the circuits in
+                addition to the seeds.
+            seed (int): the seed of the random number generator. The result
+                does not depend on ``num_processes``.
+            num_processes (int): the number of processes to fit the samples
+                with (default is ``num_processes`` of the fitter).
+
+        Returns:
+            list: A list of dictionaries where each dictionary corresponds
+            to a pattern and has fields:
+
+                * ``percentiles`` - the percentiles.
+                * ``alpha`` - the percentiles of the alpha parameter.
+                * ``epg_est`` - the percentiles of the estimated error per
+                  a CNOT-dihedral element.
+                * ``epg_est_samples`` - the estimated error per a
+                  CNOT-dihedral element of all the samples.
+        """
+        rng = np.random.default_rng(seed)
+        alpha_Z = self.rbfit_Z._bootstrap_alpha(
+            num_samples, resample_shots, rng, num_processes)
+        alpha_R = self.rbfit_X._bootstrap_alpha(
+            num_samples, resample_shots, rng, num_processes)
+
+        nrb = 2 ** np.array([len(qubits) for qubits in self._rb_pattern])
+        alpha = (alpha_Z + nrb[:, None] * alpha_R) / (nrb + 1)[:, None]
+        epg_est = ((nrb - 1) / nrb)[:, None] * (1 - alpha)
+
+        alpha_pct = _bootstrap_percentiles(alpha, percentiles)
+        epg_est_pct = _bootstrap_percentiles(epg_est, percentiles)
+        return [{'percentiles': np.array(percentiles),
+                 'alpha': alpha_pct[patt_ind],
+                 'epg_est': epg_est_pct[patt_ind],
+                 'epg_est_samples': epg_est[patt_ind]}
+                for patt_ind, _ in enumerate(self._rb_pattern)]
+
     def plot_rb_data(self, pattern_index=0, ax=None,
                      add_label=True, show_plt=True):
         """
@@ -1426,3 +1889,293 @@ class CNOTDihedralRBFitter(RBFitterBase):
 
         if show_plt:
             plt.show()
+
+
+def _sample_statistics(data, mask):
+    """Return the count, mean and sum of squared deviations over axis 1.
+
+    Only the entries of ``data`` where ``mask`` is True are included.
+    """
+    count = np.sum(mask, axis=1)
+    values = np.where(mask, data, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(count > 0, np.sum(values, axis=1) / count, 0)
+    sum_sq = np.sum(np.where(mask, (data - mean[:, None]) ** 2, 0), axis=1)
+    return np.array([count, mean, sum_sq])
+
+
+def _add_samples(stats, data, mask):
+    """Add samples to running statistics (count, mean, sum_sq).
+
+    This is the batched form of Welford's update.
+    """
+    count, mean, sum_sq = stats
+    new_count, new_mean, new_sum_sq = _sample_statistics(data, mask)
+    total = count + new_count
+    delta = new_mean - mean
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(total > 0, new_count / total, 0)
+    return np.array([total, mean + delta * ratio,
+                     sum_sq + new_sum_sq + delta ** 2 * count * ratio])
+
+
+def _remove_samples(stats, data, mask):
+    """Remove samples from running statistics (count, mean, sum_sq).
+
+    This inverts :func:`_add_samples`.
+    """
+    total, mean, sum_sq = stats
+    old_count, old_mean, old_sum_sq = _sample_statistics(data, mask)
+    count = total - old_count
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rest_mean = np.where(count > 0,
+                             (total * mean - old_count * old_mean) / count, 0)
+        ratio = np.where(total > 0, old_count / total, 0)
+    delta = old_mean - rest_mean
+    rest_sum_sq = sum_sq - old_sum_sq - delta ** 2 * count * ratio
+    return np.array([count, rest_mean,
+                     np.where(count > 1, np.maximum(rest_sum_sq, 0), 0)])
+
+
+def _ground_state_counts(results, circ_names, pattern_sizes):
+    """Count the ground state outcomes of the patterns of RB circuits.
+
+    The counts of every circuit are converted once to a matrix of
+    outcome bits, and the ground state counts of all the patterns are
+    computed from it together. The classical bits of each pattern
+    follow the bits of the previous patterns, starting from bit 0.
+
+    Args:
+        results (list): list of results (qiskit.Result).
+        circ_names (list): the names of the circuits.
+        pattern_sizes (list): the number of qubits of each pattern.
+
+    Returns:
+        tuple: arrays ``(ground, shots)`` of shapes
+        ``(len(circ_names), len(pattern_sizes))`` and
+        ``(len(circ_names), 1)`` of the number of outcomes in which all the
+        qubits of each pattern are 0, and of the total number of outcomes,
+        summed over the results.
+    """
+    circ_index = {name: idx for idx, name in enumerate(circ_names)}
+    ground = np.zeros((len(circ_names), len(pattern_sizes)))
+    shots = np.zeros((len(circ_names), 1))
+    bounds = np.cumsum([0] + list(pattern_sizes))
+    patterns = {}
+    for result in results:
+        done = set()
+        for exp_index, experiment in enumerate(result.results):
+            name = experiment.header.name
+            idx = circ_index.get(name)
+            if idx is None or name in done:
+                continue
+            done.add(name)
+            counts = result.get_counts(exp_index)
+            if not counts:
+                continue
+            keys = ''.join(counts).replace(' ', '')
+            values = np.fromiter(counts.values(), dtype=float,
+                                 count=len(counts))
+            # Outcome bits, with the last column the bit of qubit 0
+            bits = np.frombuffer(keys.encode(), dtype=np.uint8).reshape(
+                len(counts), -1) - ord('0')
+            num_bits = bits.shape[1]
+            if num_bits not in patterns:
+                # Reversed bits of each pattern
+                position = num_bits - 1 - np.arange(num_bits)
+                patterns[num_bits] = ((position[:, None] >= bounds[:-1]) &
+                                      (position[:, None] < bounds[1:]))
+            zeros = bits.dot(patterns[num_bits]) == 0
+            ground[idx] += values.dot(zeros)
+            shots[idx] += values.sum()
+    return ground, shots
+
+
+def _batch_fit_data(fitters, num_processes=1):
+    """Fit all the patterns of RB fitters together.
+
+    The data of all the patterns of all the fitters (e.g. the standard and
+    interleaved fitters of interleaved RB) is stacked, fitted in one
+    batch by :func:`_fit_exponential` and stored in the fitters.
+
+    Args:
+        fitters (list): list of :class:`RBFitter` objects.
+        num_processes (int): the number of processes to split the
+            patterns between.
+    """
+    problems = [(fitter, patt_ind) for fitter in fitters
+                for patt_ind, _ in enumerate(fitter._rb_pattern)]
+    num_lengths = max(len(fitter._cliff_lengths[patt_ind])
+                      for fitter, patt_ind in problems)
+
+    # Pad the rows of the patterns with fewer lengths with nan data
+    xdata = np.ones((len(problems), num_lengths))
+    ydata = np.full((len(problems), num_lengths), np.nan)
+    sigma = np.ones((len(problems), num_lengths))
+    fit_guess = np.zeros((len(problems), 3))
+    for row, (fitter, patt_ind) in enumerate(problems):
+        lens = len(fitter._cliff_lengths[patt_ind])
+        xdata[row, :lens] = fitter._cliff_lengths[patt_ind]
+        ydata[row, :lens] = fitter._ydata[patt_ind]['mean']
+        row_sigma = fitter._fit_sigma(patt_ind)
+        if row_sigma is not None:
+            sigma[row, :lens] = row_sigma
+        fit_guess[row] = fitter._initial_guess(patt_ind)
+
+    params, pcov = _fit_exponential_parallel(xdata, ydata, sigma, fit_guess,
+                                             num_processes)
+    for row, (fitter, patt_ind) in enumerate(problems):
+        fitter._set_fit(patt_ind, params[row], pcov[row])
+
+
+def _bootstrap_percentiles(samples, percentiles):
+    """Return the percentiles of bootstrap samples of each pattern.
+
+    Args:
+        samples (np.array): the samples, of shape ``(patterns, samples)``.
+        percentiles (list): the percentiles to compute.
+
+    Returns:
+        np.array: the percentiles, of shape ``(patterns, len(percentiles))``.
+        Samples of failed fits (nan) are skipped.
+    """
+    return np.nanpercentile(samples, percentiles, axis=1).T
+
+
+def _fit_exponential_parallel(xdata, ydata, sigma, fit_guess,
+                              num_processes=1):
+    """Fit the rows with :func:`_fit_exponential` on a pool of processes.
+
+    The rows are split into ``num_processes`` chunks, so the result does
+    not depend on the number of processes.
+    """
+    chunks = [chunk for chunk in zip(
+        *[np.array_split(data, max(1, num_processes))
+          for data in (xdata, ydata, sigma, fit_guess)])
+              if len(chunk[0])]
+    fits = parallel_map(_fit_exponential_task, chunks,
+                        num_processes=num_processes)
+    return (np.concatenate([fit[0] for fit in fits]),
+            np.concatenate([fit[1] for fit in fits]))
+
+
+def _fit_exponential_task(chunk):
+    """Fit a chunk of rows (xdata, ydata, sigma, fit_guess)."""
+    return _fit_exponential(*chunk)
+
+
+def _fit_exponential(xdata, ydata, sigma, fit_guess, max_iter=1000,
+                     tol=1e-12):
+    """Fit ``a * alpha ** x + b`` to each row of the data.
+
+    All the rows are fitted together by a Levenberg-Marquardt iteration
+    with an analytic Jacobian and a separate damping factor for each row.
+    The parameters are bounded to [0, 1] by projecting the steps. As in
+    ``curve_fit`` with relative sigma, the covariance is scaled by the
+    reduced chi-square. Data values that are nan are ignored.
+
+    Args:
+        xdata (np.array): the lengths, of shape ``(rows, lengths)``.
+        ydata (np.array): the data, of shape ``(rows, lengths)``.
+        sigma (np.array): the uncertainties of the data.
+        fit_guess (np.array): the initial guesses ``(a, alpha, b)``, of
+            shape ``(rows, 3)``.
+        max_iter (int): the maximal number of iterations.
+        tol (float): the relative decrease of the cost at which a row
+            has converged.
+
+    Returns:
+        tuple: arrays ``(params, pcov)`` of shapes ``(rows, 3)`` and
+        ``(rows, 3, 3)``.
+    """
+    mask = ~np.isnan(ydata)
+    weights = np.where(mask, 1 / sigma, 0)
+    ydata = np.where(mask, ydata, 0)
+    num_points = np.sum(mask, axis=1)
+
+    def residuals(params, rows):
+        a, alpha, b = params.T[:, :, None]
+        power = alpha ** xdata[rows]
+        resid = (a * power + b - ydata[rows]) * weights[rows]
+        jac = np.stack([power, a * xdata[rows] * alpha ** (xdata[rows] - 1),
+                        np.ones_like(power)], axis=-1) * weights[rows, :, None]
+        return resid, jac, 0.5 * np.sum(resid ** 2, axis=1)
+
+    params = np.clip(np.array(fit_guess, dtype=float), 0, 1)
+    resid, jac, cost = residuals(params, slice(None))
+    damping = np.full(len(params), 1e-3)
+    active = np.flatnonzero(num_points > 0)
+    for _ in range(max_iter):
+        if not len(active):
+            break
+        jtj = np.einsum('nli,nlj->nij', jac[active], jac[active])
+        grad = np.einsum('nli,nl->ni', jac[active], resid[active])
+        scale = np.diagonal(jtj, axis1=1, axis2=2)
+        scale = np.maximum(scale, 1e-12 * np.max(scale, axis=1,
+                                                 keepdims=True) + 1e-300)
+        step = np.linalg.solve(
+            jtj + damping[active, None, None] * (scale[:, :, None] *
+                                                 np.eye(3)),
+            -grad[..., None])[..., 0]
+        new_params = np.clip(params[active] + step, 0, 1)
+        new_resid, new_jac, new_cost = residuals(new_params, active)
+
+        better = new_cost < cost[active]
+        converged = better & (cost[active] - new_cost <= tol * cost[active])
+        rows = active[better]
+        params[rows] = new_params[better]
+        resid[rows] = new_resid[better]
+        jac[rows] = new_jac[better]
+        cost[rows] = new_cost[better]
+        damping[active] = np.where(better, damping[active] / 10,
+                                   damping[active] * 10)
+        active = active[~converged & (damping[active] < 1e16)]
+
+    jtj = np.einsum('nli,nlj->nij', jac, jac)
+    dof = num_points - 3
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi_sq = 2 * cost / dof
+    pcov = np.where((dof > 0)[:, None, None],
+                    np.linalg.pinv(jtj) * chi_sq[:, None, None], np.inf)
+    params[num_points == 0] = np.nan
+    return params, pcov
+
+
+def _walsh_hadamard(data):
+    """Return the Walsh-Hadamard transform over the last axis of data.
+
+    Entry ``i`` of the transform of ``p`` is
+    :math:`\\sum_j (-1)^{|i \\& j|} p_j`, so for a distribution over the
+    outcomes of :math:`n` qubits it is the expectation value of the
+    Z-correlator of the qubits in ``i``.
+    """
+    shape = data.shape
+    size = shape[-1]
+    step = 1
+    while step < size:
+        data = data.reshape(-1, size // (2 * step), 2, step)
+        data = np.stack([data[:, :, 0] + data[:, :, 1],
+                         data[:, :, 0] - data[:, :, 1]], axis=2)
+        step *= 2
+    return data.reshape(shape)
+
+
+@lru_cache(maxsize=None)
+def _purity_correlator_map(num_qubits, npurity):
+    """Return the map of the Z-correlators to the Pauli correlators.
+
+    Row ``pur * 2 ** num_qubits + indcorr`` maps the Z-correlator
+    ``indcorr`` of the purity circuit ``pur`` to its Pauli correlator
+    :meth:`PurityRBFitter.F234`, divided by the number of Z-correlators
+    that are averaged into that Pauli correlator.
+    """
+    dim = 2 ** num_qubits
+    corr_map = np.zeros((npurity * dim, 4 ** num_qubits))
+    for pur in range(npurity):
+        for indcorr in range(dim):
+            corr_map[pur * dim + indcorr,
+                     PurityRBFitter.F234(num_qubits, indcorr, pur)] = 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr_map /= np.sum(corr_map, axis=0)
+    corr_map.flags.writeable = False
+    return corr_map
@@ -15,19 +15,39 @@
 """Methods for handling groups (Clifford, CNOT Dihedral etc.)
 in randomized benchmarking"""
 
+from collections import OrderedDict
+
 import numpy as np
+from qiskit.compiler import transpile
 from qiskit.exceptions import QiskitError
 from qiskit.quantum_info.operators.symplectic import Clifford
 from qiskit.quantum_info.random import random_clifford
-from .dihedral import CNOTDihedral, random_cnotdihedral
+from .dihedral import (CNOTDIHEDRAL_TABLE_QUBITS, CNOTDihedral,
+                       cnotdihedral_table, random_cnotdihedral)
+from .clifford_tables import (CLIFFORD_TABLE_QUBITS, TableElement,
+                              clifford_table)
+
+# Maximal number of cached basis-translated circuits of group elements
+BASIS_CIRCUITS_MAXSIZE = 2 ** 14
+
+# LRU cache of basis-translated circuits of group elements, indexed by
+# (element key, basis gates, inverse)
+_BASIS_CIRCUITS = OrderedDict()
 
 
 class RBgroup():
     """Class that handles the group operations needed for RB."""
 
-    def __init__(self, group_gates, num_qubits=2):
-        """Initialization from num_qubits and group_gates"""
+    def __init__(self, group_gates, num_qubits=2, use_tables=False):
+        """Initialization from num_qubits and group_gates
+
+        If ``use_tables`` is True, random 1 and 2-qubit Clifford elements
+        are integer-encoded elements of the indexed Clifford tables
+        (see :func:`clifford_table`), so that their composition, inverse
+        and decomposition are table lookups.
+        """
         self._num_qubits = num_qubits
+        self._use_tables = use_tables
         self._group_gates = group_gates
         self._rb_circ_type = 'rb'
         self._group_gates_type = 0
@@ -69,6 +89,9 @@ class RBgroup():
     def random(self, num_qubits, rand_seed=None):
         """Generate a random group element"""
         self._num_qubits = num_qubits
+        table = self.table(num_qubits)
+        if table is not None:
+            return table.random(rand_seed)
         if self._group_gates_type:
             return random_cnotdihedral(num_qubits, seed=rand_seed)
         else:
@@ -77,17 +100,107 @@ class RBgroup():
     @staticmethod
     def compose(elem, other):
         """Compose two group elements: orig and other"""
+        if isinstance(elem, TableElement):
+            return elem.table.compose(elem, other)
+        if isinstance(other, TableElement):
+            return other.table.compose(elem, other)
         return elem.compose(other)
 
     @staticmethod
-    def inverse(elem):
-        """Computes the inverse QuantumCircuit"""
+    def inverse(elem, basis_gates=None):
+        """Computes the inverse QuantumCircuit
+
+        If ``basis_gates`` is given, the circuit is translated to the
+        basis gates and optimized once per group element and basis, and
+        later calls return a copy of the cached circuit.
+        """
+        return RBgroup._inverse(elem, basis_gates).copy()
+
+    @staticmethod
+    def to_circuit(elem, basis_gates=None):
+        """Returns the corresponding QuantumCircuit
+
+        If ``basis_gates`` is given, the circuit is translated to the
+        basis gates and optimized once per group element and basis, and
+        later calls return a copy of the cached circuit.
+        """
+        return RBgroup._to_circuit(elem, basis_gates).copy()
+
+    @staticmethod
+    def _inverse(elem, basis_gates=None):
+        """Return the inverse QuantumCircuit, which may be a cached circuit
+        shared by all callers that must not be modified."""
+        if basis_gates is not None:
+            return _basis_circuit(elem, basis_gates, inverse=True)
+        if isinstance(elem, TableElement):
+            # pylint: disable=protected-access
+            return elem.table._inverse_circuit(elem.index)
+        if _in_cnotdihedral_table(elem):
+            table = cnotdihedral_table(elem.num_qubits)
+            # pylint: disable=protected-access
+            return table._inverse_circuit(table.index(elem))
         # decompose the group element into a QuantumCircuit
         circ = elem.to_circuit()
         # invert the QuantumCircuit
         return circ.inverse()
 
     @staticmethod
-    def to_circuit(elem):
-        """Returns the corresponding QuantumCircuit"""
+    def _to_circuit(elem, basis_gates=None):
+        """Return the QuantumCircuit, which may be a cached circuit shared
+        by all callers that must not be modified."""
+        if basis_gates is not None:
+            return _basis_circuit(elem, basis_gates, inverse=False)
+        if isinstance(elem, TableElement):
+            # pylint: disable=protected-access
+            return elem.table._circuit(elem.index)
+        if _in_cnotdihedral_table(elem):
+            table = cnotdihedral_table(elem.num_qubits)
+            # pylint: disable=protected-access
+            return table._circuit(table.index(elem))
         return elem.to_circuit()
+
+    def table(self, num_qubits):
+        """Return the indexed group table for num_qubits, if it is used
+
+        The random elements of a group with a table are integer-encoded
+        elements of the table, otherwise ``None`` is returned.
+        """
+        if self._use_tables and not self._group_gates_type \
+                and num_qubits in CLIFFORD_TABLE_QUBITS:
+            return clifford_table(num_qubits)
+        return None
+
+
+def _element_key(elem):
+    """Return a hashable key of a group element"""
+    if isinstance(elem, TableElement):
+        return elem
+    if isinstance(elem, Clifford):
+        return ('Clifford', elem.table.array.tobytes(),
+                elem.table.phase.tobytes())
+    return ('CNOTDihedral', elem.num_qubits, elem._int_key())
+
+
+def _in_cnotdihedral_table(elem):
+    """Return True if the circuits of elem are in a CNOT-dihedral table"""
+    return isinstance(elem, CNOTDihedral) and elem.poly.weight_0 == 0 \
+        and elem.num_qubits in CNOTDIHEDRAL_TABLE_QUBITS
+
+
+def _basis_circuit(elem, basis_gates, inverse):
+    """Return the cached basis-translated circuit of a group element"""
+    key = (_element_key(elem), tuple(sorted(basis_gates)), inverse)
+    circ = _BASIS_CIRCUITS.get(key)
+    if circ is not None:
+        _BASIS_CIRCUITS.move_to_end(key)
+        return circ
+    if inverse:
+        circ = RBgroup._inverse(elem)
+    else:
+        circ = RBgroup._to_circuit(elem)
+    circ = transpile(circ, basis_gates=list(basis_gates),
+                     optimization_level=1)
+    _BASIS_CIRCUITS[key] = circ
+    if len(_BASIS_CIRCUITS) > BASIS_CIRCUITS_MAXSIZE:
+        _BASIS_CIRCUITS.popitem(last=False)
+    return circ
@@ -25,6 +25,13 @@ from warnings import warn
 import numpy as np
 from qiskit import QuantumCircuit, QiskitError
 from qiskit.qobj import QasmQobj
+from qiskit.tools import parallel_map
+
+from .clifford_tables import CLIFFORD_TABLE_QUBITS, clifford_table
+from .dihedral import (CNOTDIHEDRAL_TABLE_QUBITS, CNOTDihedral,
+                       cnotdihedral_table, _cnotdihedral_elements,
+                       _synthesis_gates)
+from .rb_groups import RBgroup
 
 
 def count_gates(qobj, basis, qubits):
@@ -69,12 +76,18 @@ def gates_per_clifford(
         transpiled_circuits_list: Union[List[List[QuantumCircuit]], List[QasmQobj]],
         clifford_lengths: Union[np.ndarray, List[int]],
         basis: List[str],
-        qubits: List[int]) -> Dict[int, Dict[str, float]]:
+        qubits: List[int],
+        num_processes: int = 1) -> Dict[int, Dict[str, float]]:
     """Take a list of transpiled ``QuantumCircuit`` and use these to calculate
     the number of gates per Clifford. Each ``QuantumCircuit`` should be transpiled into
     given ``basis`` set. The result can be used to convert a value of error per Clifford
     into error per basis gate under appropriate assumption.
 
+    The (gate, qubit) pairs of the instructions of every circuit are extracted once
+    as arrays and counted with ``numpy.bincount``. The circuits of the seeds can be
+    counted in parallel. To estimate the gates per Clifford without transpiled
+    circuits, see :func:`gates_per_clifford_from_group`.
+
     Example:
         This example shows how to calculate gate per Clifford of 2Q RB sequence for
         qubit 0 and qubit 1. You can refer to the function
@@ -117,6 +130,8 @@ def gates_per_clifford(
         clifford_lengths: number of Cliffords in each circuit
         basis: gates basis for the qobj
         qubits: qubits to count over
+        num_processes: the number of processes for counting the circuits of
+            the seeds in parallel (default is 1, i.e. serial counting).
 
     Returns:
         Nested dictionary of gate counts per Clifford.
@@ -124,43 +139,167 @@ def gates_per_clifford(
     Raises:
         QiskitError: when input object is not a list of `QuantumCircuit`.
     """
-    ngates = {qubit: {base: 0 for base in basis} for qubit in qubits}
+    ngates = np.zeros((len(qubits), len(basis)))
 
     if isinstance(transpiled_circuits_list[0], QasmQobj):
         warn('`QasmQobj` input will be deprecated. Use transpiled `QuantumCircuit` instead. '
              'Gate counts based on `QasmQobj` has no unittest and may return wrong counts.',
              category=DeprecationWarning)
 
+    gate_index = {base: ind for ind, base in enumerate(basis)}
+    qubit_index = {qubit: ind for ind, qubit in enumerate(qubits)}
+    circuits_list = []
     for transpiled_circuits in transpiled_circuits_list:
         if isinstance(transpiled_circuits, QasmQobj):
             # TODO: remove this code block after deprecation period
             for experiment in transpiled_circuits.experiments:
                 for instr in experiment.instructions:
                     for q_ind in instr.qubits:
-                        try:
-                            ngates[q_ind][instr.name] += 1
-                        except KeyError:
-                            pass
+                        if q_ind in qubit_index and instr.name in gate_index:
+                            ngates[qubit_index[q_ind], gate_index[instr.name]] += 1
         else:
-            for transpiled_circuit in transpiled_circuits:
-                if isinstance(transpiled_circuit, QuantumCircuit):
-                    for instr, qregs, _ in transpiled_circuit.data:
-                        for qreg in qregs:
-                            try:
-                                ngates[qreg.index][instr.name] += 1
-                            except KeyError:
-                                pass
-                else:
-                    raise QiskitError('Input object is not `QuantumCircuit`.')
+            if not all(isinstance(transpiled_circuit, QuantumCircuit)
+                       for transpiled_circuit in transpiled_circuits):
+                raise QiskitError('Input object is not `QuantumCircuit`.')
+            circuits_list.append(transpiled_circuits)
+
+    if circuits_list:
+        ngates += sum(parallel_map(_gate_counts, circuits_list,
+                                   task_args=(basis, qubits),
+                                   num_processes=num_processes))
 
     # include inverse, ie + 1 for all clifford length
     total_ncliffs = len(transpiled_circuits_list) * np.sum(np.array(clifford_lengths) + 1)
+    ngates /= total_ncliffs
 
-    for qubit in qubits:
-        for base in basis:
-            ngates[qubit][base] /= total_ncliffs
+    return {qubit: dict(zip(basis, ngates[ind].tolist()))
+            for ind, qubit in enumerate(qubits)}
 
-    return ngates
+
+def gates_per_clifford_from_group(
+        clifford_lengths: Union[np.ndarray, List[int]],
+        qubits: List[int],
+        basis: Optional[List[str]] = None,
+        group_gates: Optional[str] = None,
+        num_samples: Optional[int] = None,
+        seed: Optional[int] = None) -> Dict[int, Dict[str, float]]:
+    """Calculate the expected number of gates per Clifford without RB circuits.
+
+    The gate counts are averaged over the elements of the 1 or 2-qubit group,
+    using the cached decompositions of the group tables (see :func:`clifford_table`
+    and :func:`cnotdihedral_table`). An RB circuit of length :math:`m` consists of
+    :math:`m` uniformly random elements and the inverse circuit of a uniformly
+    random element, so its expected number of gates per Clifford is
+    :math:`(m N + N_{inv}) / (m + 1)`, where :math:`N` and :math:`N_{inv}` are the
+    average gate counts of the circuits and of the inverse circuits of the elements.
+
+    If ``basis`` is given, every element is translated to the basis gates once and
+    cached, as with the ``basis_gates`` argument of
+    :func:`randomized_benchmarking_seq`. Otherwise the gates of the decompositions
+    are counted; for the CNOT-dihedral group they are counted directly from the
+    gate codes of the table, without constructing any circuits.
+
+    Decomposing the full 2-qubit Clifford group takes a while on first use, so
+    ``num_samples`` can be used to average over random elements instead.
+
+    Args:
+        clifford_lengths: number of Cliffords in each circuit
+        qubits: the qubits of the RB pattern. Qubit ``i`` of the group elements
+            is counted as ``qubits[i]``.
+        basis: gates basis to count (default is all the gates of the
+            decompositions).
+        group_gates: the group of the RB sequences, ``'Clifford'`` (default) or
+            ``'CNOT-Dihedral'``, as in :func:`randomized_benchmarking_seq`.
+        num_samples: the number of random elements to average over (default is
+            all the elements of the group).
+        seed: the seed of the random elements.
+
+    Returns:
+        Nested dictionary of gate counts per Clifford.
+
+    Raises:
+        QiskitError: if the group has no table for ``len(qubits)`` qubits.
+    """
+    num_qubits = len(qubits)
+    cnotdihedral = bool(RBgroup(group_gates, num_qubits).group_gates_type())
+    table_qubits = CNOTDIHEDRAL_TABLE_QUBITS if cnotdihedral else CLIFFORD_TABLE_QUBITS
+    if num_qubits not in table_qubits:
+        raise QiskitError("Group tables are only supported for {} qubits.".format(
+            table_qubits))
+    table = cnotdihedral_table(num_qubits) if cnotdihedral else clifford_table(num_qubits)
+
+    # weight of every element in the average
+    if num_samples is None:
+        weights = np.full(len(table), 1 / len(table))
+    else:
+        rng = np.random.default_rng(seed)
+        weights = np.bincount(rng.integers(len(table), size=num_samples),
+                              minlength=len(table)) / num_samples
+    indices = np.flatnonzero(weights)
+
+    if cnotdihedral and basis is None:
+        # the inverse circuits have the same gates in reverse order
+        gates = _synthesis_gates(num_qubits)
+        names = sorted({gate[0] for gate in gates[1:]})
+        code_counts = np.zeros((len(gates), num_qubits, len(names)))
+        for code, (name, _, gate_qubits) in enumerate(gates[1:], 1):
+            code_counts[code, list(gate_qubits), names.index(name)] = 1
+        counts = code_counts[table._gates[indices]].sum(axis=1)
+        forward = inverse = np.tensordot(weights[indices], counts, axes=1)
+    else:
+        if cnotdihedral:
+            elems = sorted(_cnotdihedral_elements(num_qubits),
+                           key=CNOTDihedral._int_key)
+            elems = [elems[index] for index in indices]
+        else:
+            elems = [table.element(int(index)) for index in indices]
+        # pylint: disable=protected-access
+        circuits = [RBgroup._to_circuit(elem, basis) for elem in elems]
+        inverse_circuits = [RBgroup._inverse(elem, basis) for elem in elems]
+        names = basis
+        if names is None:
+            names = sorted({instr.name for circuit in circuits + inverse_circuits
+                            for instr, _, _ in circuit.data})
+        forward, inverse = [
+            np.tensordot(weights[indices], np.array(
+                [_gate_counts([circuit], names, range(num_qubits))
+                 for circuit in element_circuits]), axes=1)
+            for element_circuits in (circuits, inverse_circuits)]
+
+    lengths = np.asarray(clifford_lengths)
+    ngates = (np.sum(lengths) * forward + len(lengths) * inverse) / \
+        np.sum(lengths + 1)
+    return {qubit: dict(zip(names, ngates[ind].tolist()))
+            for ind, qubit in enumerate(qubits)}
+
+
+def _gate_counts(circuits, basis, qubits):
+    """Count the basis gates on the qubits in circuits.
+
+    Args:
+        circuits (list): list of ``QuantumCircuit``.
+        basis (list): the gates to count.
+        qubits (list): the qubits to count over, by their index in
+            their register.
+
+    Returns:
+        np.ndarray: array of shape ``(len(qubits), len(basis))`` of the
+        number of gates.
+    """
+    gate_index = {base: ind for ind, base in enumerate(basis)}
+    qubit_index = {qubit: ind for ind, qubit in enumerate(qubits)}
+    codes = [np.zeros(0, dtype=int)]
+    for circuit in circuits:
+        bit_index = {bit: qubit_index.get(ind, -1)
+                     for qreg in circuit.qregs for ind, bit in enumerate(qreg)}
+        # (gate, qubit) of every qubit of every instruction
+        pairs = np.array([(gate_index.get(instr.name, -1), bit_index.get(bit, -1))
+                          for instr, qargs, _ in circuit.data for bit in qargs],
+                         dtype=int).reshape(-1, 2)
+        pairs = pairs[np.all(pairs >= 0, axis=1)]
+        codes.append(pairs[:, 1] * len(basis) + pairs[:, 0])
+    return np.bincount(np.concatenate(codes),
+                       minlength=len(qubits) * len(basis)).reshape(len(qubits), len(basis))
 
 
 def coherence_limit(nQ=2, T1_list=None, T2_list=None,
@@ -20,7 +20,8 @@ import unittest
 import numpy as np
 import scipy as sp
 from qiskit.ignis.mitigation import CTMPExpvalMeasMitigator
-from qiskit.ignis.mitigation.expval.ctmp_mitigator import _markov_chain_compiled
+from qiskit.ignis.mitigation.expval.ctmp_mitigator import (
+    _markov_chain_compiled, _csc_cumulative)
 
 
 def statistical_test(num_tests: int, fraction_passes: float):
@@ -111,5 +112,33 @@ class TestMarkov(unittest.TestCase):
         self.assertEqual(self.markov_chain_int(3), 3)
 
 
+class TestCTMPSamplingMatrices(unittest.TestCase):
+    """Test the CTMP generator and sampling matrix construction
+    """
+
+    def test_csc_cumulative(self):
+        """Test column cumulative probabilities of CSC matrix"""
+        mat = sp.sparse.csc_matrix(np.array([[0.5, 0, 0.1],
+                                             [0.5, 1, 0],
+                                             [0, 0, 0.9]]))
+        cumprobs = _csc_cumulative(mat.data, mat.indptr)
+        for col in range(mat.shape[1]):
+            start, stop = mat.indptr[col], mat.indptr[col + 1]
+            np.testing.assert_allclose(cumprobs[start:stop],
+                                       np.cumsum(mat.data[start:stop]))
+
+    def test_generator_matrix_outcomes(self):
+        """Test generator matrix columns reachable from outcomes"""
+        mitigator = CTMPExpvalMeasMitigator(
+            generators=[('0', '1', (0,)), ('0', '1', (1,))],
+            rates=[1e-2, 1e-1],
+            num_qubits=2)
+        full_mat = mitigator.generator_matrix().toarray()
+        part_mat = mitigator.generator_matrix(outcomes=[1]).toarray()
+        np.testing.assert_allclose(part_mat[:, [0, 1]], full_mat[:, [0, 1]])
+        np.testing.assert_allclose(part_mat[:, [2, 3]], 0)
+        np.testing.assert_allclose(full_mat.sum(axis=0), 0, atol=1e-12)
+
+
 if __name__ == '__main__':
     unittest.main()
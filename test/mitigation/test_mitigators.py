@@ -20,14 +20,27 @@ from typing import List, Tuple
 import unittest
 
 from ddt import ddt, unpack, data
+import numpy as np
 
 from qiskit import QuantumCircuit, assemble, transpile
 from qiskit.result import Result
+from qiskit.exceptions import QiskitError
 from qiskit.providers.aer import QasmSimulator, noise
+import scipy.linalg as la
 from qiskit.ignis.mitigation import (
     expval_meas_mitigator_circuits,
     ExpvalMeasMitigatorFitter,
-    expectation_value
+    CompleteExpvalMeasMitigator,
+    TensoredExpvalMeasMitigator,
+    expectation_value,
+    expectation_values
+)
+from qiskit.ignis.mitigation.expval.utils import ExpvalCalibrationData
+from qiskit.ignis.mitigation.expval.circuits import ExpvalMeasMitigatorCircuits
+from qiskit.ignis.mitigation.expval.ctmp_generator_set import standard_generator_set
+from qiskit.ignis.mitigation.expval.ctmp_fitter import (
+    fit_ctmp_meas_mitigator,
+    _batch_logm
 )
 
 
@@ -107,6 +120,105 @@ class TestExpVals(NoisySimulationTest):
                                       meas_mitigator=mitigator)
         self.assertLess(abs(target - expval), self.tolerance)
 
+    @data('complete', 'tensored', 'CTMP')
+    def test_expval_mitigator_batch(self, method):
+        """Test ExpvalMeasMitigator batched expectation values"""
+        diagonals = [[(-1) ** bin(i).count('1') for i in range(16)],
+                     [(-1) ** i for i in range(16)],
+                     [0.1 * i for i in range(16)]]
+        circs, meta = expval_meas_mitigator_circuits(self.num_qubits, method=method)
+        result_cal = self.execute_circs(circs, noise_model=self.noise_model)
+        mitigator = ExpvalMeasMitigatorFitter(result_cal, meta).fit()
+        targets, _ = expectation_values(self.counts_ideal, diagonals=diagonals)
+        expvals, stddevs = expectation_values(self.counts_noise,
+                                              diagonals=diagonals,
+                                              meas_mitigator=mitigator)
+        self.assertEqual(expvals.shape, (3,))
+        self.assertEqual(stddevs.shape, (3,))
+        for target, expval in zip(targets, expvals):
+            self.assertLess(abs(target - expval), self.tolerance)
+
+        batch_expvals, _ = mitigator.batch_expectation_values(
+            [self.counts_ideal, self.counts_noise], diagonals=diagonals)
+        self.assertEqual(batch_expvals.shape, (2, 3))
+        if method != 'CTMP':
+            np.testing.assert_allclose(batch_expvals[1], expvals)
+            for diagonal, expval in zip(diagonals, expvals):
+                single, _ = mitigator.expectation_value(self.counts_noise,
+                                                        diagonal=diagonal)
+                self.assertAlmostEqual(single, expval)
+
+    @data(*product(['complete', 'tensored'], ['ZZZZ', 'IZIZ', 'Z0I1']))
+    @unpack
+    def test_expval_mitigator_label(self, method, label):
+        """Test ExpvalMeasMitigator with string label diagonals"""
+        local_diags = {'I': [1, 1], 'Z': [1, -1], '0': [1, 0], '1': [0, 1]}
+        diagonal = np.ones(1)
+        for char in label:
+            diagonal = np.kron(diagonal, local_diags[char])
+        circs, meta = expval_meas_mitigator_circuits(self.num_qubits, method=method)
+        result_cal = self.execute_circs(circs, noise_model=self.noise_model)
+        mitigator = ExpvalMeasMitigatorFitter(result_cal, meta).fit()
+
+        target, _ = expectation_value(self.counts_noise, diagonal=diagonal)
+        expval, _ = expectation_value(self.counts_noise, diagonal=label)
+        self.assertAlmostEqual(expval, target)
+
+        target, _ = expectation_value(self.counts_noise, diagonal=diagonal,
+                                      meas_mitigator=mitigator)
+        expval, _ = expectation_value(self.counts_noise, diagonal=label,
+                                      meas_mitigator=mitigator)
+        self.assertAlmostEqual(expval, target)
+
+    @data('complete', 'tensored', 'CTMP')
+    def test_expval_mitigator_add_data(self, method):
+        """Test ExpvalMeasMitigatorFitter incremental calibration data"""
+        circs, meta = expval_meas_mitigator_circuits(self.num_qubits, method=method)
+        result_cal = self.execute_circs(circs, noise_model=self.noise_model)
+        fitter = ExpvalMeasMitigatorFitter(result_cal, meta)
+        amat = fitter.fit().assignment_matrix()
+        fitter.add_data(result_cal, meta)
+        self.assertRaises(QiskitError, lambda: fitter.mitigator)
+        np.testing.assert_allclose(fitter.fit().assignment_matrix(), amat)
+
+    @data('complete', 'tensored', 'CTMP')
+    def test_expval_mitigator_chunks(self, method):
+        """Test ExpvalMeasMitigatorCircuits chunked calibration circuits"""
+        generator = ExpvalMeasMitigatorCircuits(self.num_qubits, method=method)
+        circs, meta = generator.generate_circuits()
+        self.assertEqual(len(circs), generator.num_circuits)
+        fitter = None
+        num_chunks = 0
+        for chunk_circs, chunk_meta in generator.iter_circuits(max_experiments=3):
+            self.assertLessEqual(len(chunk_circs), 3)
+            self.assertEqual(chunk_meta, meta[3 * num_chunks:3 * (num_chunks + 1)])
+            num_chunks += 1
+            result_cal = self.execute_circs(chunk_circs, noise_model=self.noise_model)
+            if fitter is None:
+                fitter = ExpvalMeasMitigatorFitter(result_cal, chunk_meta)
+            else:
+                fitter.add_data(result_cal, chunk_meta)
+        self.assertEqual(num_chunks, -(-len(circs) // 3))
+        mitigator = fitter.fit()
+        target, _ = expectation_value(self.counts_ideal)
+        expval, _ = expectation_value(self.counts_noise, meas_mitigator=mitigator)
+        self.assertLess(abs(target - expval), self.tolerance)
+
+    @data('complete', 'tensored', 'CTMP')
+    def test_expval_mitigator_template(self, method):
+        """Test ExpvalMeasMitigatorCircuits parameterized template circuit"""
+        generator = ExpvalMeasMitigatorCircuits(self.num_qubits, method=method)
+        template = generator.template_circuit()
+        self.assertEqual(len(template.parameters), self.num_qubits)
+        (binds, meta), = list(generator.iter_parameter_binds())
+        self.assertEqual(meta, generator.generate_circuits()[1])
+        circs = [template.bind_parameters(bind) for bind in binds]
+        result_cal = self.execute_circs(circs, noise_model=self.noise_model)
+        mitigator = ExpvalMeasMitigatorFitter(result_cal, meta).fit()
+        target, _ = expectation_value(self.counts_ideal)
+        expval, _ = expectation_value(self.counts_noise, meas_mitigator=mitigator)
+        self.assertLess(abs(target - expval), self.tolerance)
+
 
 # https://docs.python.org/3/library/itertools.html#recipes
 def powerset(iterable):
@@ -160,5 +272,111 @@ class TestPartialExpVals(NoisySimulationTest):
         return None
 
 
+class TestMitigatorCache(unittest.TestCase):
+    """Test the bounded matrix cache of the expval mitigators."""
+
+    @staticmethod
+    def amats(num_qubits):
+        """Return a list of single-qubit assignment matrices"""
+        return [np.array([[1 - p0, p1], [p0, 1 - p1]]) for p0, p1 in
+                zip(0.02 * np.arange(1, num_qubits + 1),
+                    0.01 * np.arange(1, num_qubits + 1))]
+
+    def test_cache_info(self):
+        """Test mitigator cache hits and misses"""
+        amats = self.amats(3)
+        mitigator = CompleteExpvalMeasMitigator(np.kron(amats[2], np.kron(amats[1], amats[0])))
+        mat = mitigator.mitigation_matrix([0, 2])
+        info = mitigator.cache_info()
+        self.assertEqual(info.hits, 0)
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.currsize, 2)
+        self.assertEqual(info.currbytes, 2 * mat.nbytes)
+        self.assertIs(mitigator.mitigation_matrix([2, 0]), mat)
+        self.assertEqual(mitigator.cache_info().hits, 1)
+        np.testing.assert_allclose(
+            mat, np.linalg.inv(np.kron(amats[2], amats[0])))
+        mitigator.clear_cache()
+        self.assertEqual(mitigator.cache_info(), (0, 0, 256, 0, 2**30, 0))
+
+    def test_cache_eviction(self):
+        """Test mitigator cache eviction limits"""
+        mitigator = TensoredExpvalMeasMitigator(self.amats(4))
+        mitigator.set_cache_limits(maxsize=2, maxbytes=None)
+        for qubits in [[0], [1], [2], [0, 1]]:
+            mitigator.assignment_matrix(qubits)
+        self.assertEqual(mitigator.cache_info().currsize, 2)
+        self.assertEqual(mitigator.cache_info().misses, 4)
+        mitigator.assignment_matrix([0])
+        self.assertEqual(mitigator.cache_info().misses, 5)
+
+        mitigator.set_cache_limits(maxsize=None, maxbytes=19 * 8)
+        self.assertEqual(mitigator.cache_info().currsize, 1)
+        mitigator.assignment_matrix([0, 1])
+        self.assertEqual(mitigator.cache_info().currbytes, 16 * 8)
+        mitigator.assignment_matrix([0, 1, 2])
+        self.assertEqual(mitigator.cache_info().currbytes, 16 * 8)
+
+    def test_tensored_qubit_order(self):
+        """Test tensored mitigator matrices for permuted qubits"""
+        amats = self.amats(3)
+        mitigator = TensoredExpvalMeasMitigator(amats)
+        np.testing.assert_allclose(mitigator.assignment_matrix([2, 0]),
+                                   np.kron(amats[0], amats[2]))
+        np.testing.assert_allclose(mitigator.mitigation_matrix([1, 2]),
+                                   np.linalg.inv(np.kron(amats[2], amats[1])))
+
+
+class TestCTMPFitter(unittest.TestCase):
+    """Test the CTMP generator rate fitting."""
+
+    num_qubits = 4
+
+    def cal_data(self, shots=20000, seed=5):
+        """Return CTMP calibration counts for independent bit-flip errors"""
+        rng = np.random.default_rng(seed)
+        self.flip_probs = 0.01 * np.arange(1, self.num_qubits + 1)
+        cals = [0, 2 ** self.num_qubits - 1] + [1 << i for i in range(self.num_qubits)]
+        cal_data = {}
+        for cal in cals:
+            bits = (cal >> np.arange(self.num_qubits)) & 1
+            flips = rng.random((shots, self.num_qubits)) < self.flip_probs
+            outcomes = (bits ^ flips).dot(1 << np.arange(self.num_qubits))
+            vals, counts = np.unique(outcomes, return_counts=True)
+            cal_data[cal] = dict(zip(vals.tolist(), counts.tolist()))
+        return cal_data
+
+    def test_batch_logm(self):
+        """Test batched matrix logarithm"""
+        rng = np.random.default_rng(7)
+        mats = np.eye(4) + 0.05 * rng.random((6, 4, 4))
+        mats[-1] = [[1, 0.1, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+        logs = _batch_logm(mats)
+        for mat, log in zip(mats, logs):
+            np.testing.assert_allclose(log, la.logm(mat), atol=1e-10)
+
+    def test_fit_calibration_data(self):
+        """Test CTMP rates from counts and streamed calibration data"""
+        cal_data = self.cal_data()
+        mitigator = fit_ctmp_meas_mitigator(cal_data, self.num_qubits)
+        data = ExpvalCalibrationData(num_qubits=self.num_qubits, method='CTMP')
+        for cal, counts in cal_data.items():
+            data.add_counts(cal, counts)
+        target = fit_ctmp_meas_mitigator(data, self.num_qubits)
+        np.testing.assert_allclose(mitigator.assignment_matrix(),
+                                   target.assignment_matrix())
+
+    def test_fit_coupling_map(self):
+        """Test CTMP rates for generators on coupling map pairs"""
+        pairs = [[0, 1], [1, 0], [1, 2], [2, 3]]
+        generators = standard_generator_set(self.num_qubits, pairs=pairs)
+        self.assertEqual(len(generators), 2 * self.num_qubits + 12)
+        mitigator = fit_ctmp_meas_mitigator(self.cal_data(), self.num_qubits, generators)
+        for qubit, prob in enumerate(self.flip_probs):
+            amat = mitigator.assignment_matrix([qubit])
+            self.assertAlmostEqual(amat[1, 0], prob, delta=0.005)
+            self.assertAlmostEqual(amat[0, 1], prob, delta=0.005)
+
+
 if __name__ == '__main__':
     unittest.main()
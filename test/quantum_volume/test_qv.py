@@ -18,10 +18,17 @@
 Run through Quantum volume
 """
 
+import copy
+import os
+import tempfile
 import unittest
 
+import numpy as np
+
 import qiskit
 import qiskit.ignis.verification.quantum_volume as qv
+from qiskit.circuit.library import QuantumVolume
+from qiskit.quantum_info import Statevector
 from qiskit.providers.aer.noise import NoiseModel
 from qiskit.providers.aer.noise.errors.standard_errors import depolarizing_error
 
@@ -140,6 +147,165 @@ class TestQV(unittest.TestCase):
         qv_success_list = qv_fitter.qv_success()
         self.assertFalse(qv_success_list[0][0])
 
+    def test_qv_fitter_heavy_outputs(self):
+        """Test the heavy outputs and their counts against the distributions"""
+        qubit_lists = [[0, 1, 2], [0, 1, 2, 3]]
+        ntrials = 3
+
+        ideal_results, exp_results = qv_circuit_execution(qubit_lists,
+                                                          ntrials,
+                                                          shots=256)
+        qv_fitter = qv.QVFitter(qubit_lists=qubit_lists)
+        qv_fitter.add_statevectors(ideal_results)
+        qv_fitter.add_data(exp_results)
+
+        for trial in range(ntrials):
+            for qubit_list in qubit_lists:
+                depth = len(qubit_list)
+                circ_name = 'qv_depth_%d_trial_%d' % (depth, trial)
+                probs = np.abs(np.asarray(
+                    ideal_results[trial].get_statevector(circ_name)))**2
+                heavy = [format(b, '0%db' % depth) for b in range(2**depth)
+                         if probs[b] > np.median(probs)]
+                self.assertEqual(qv_fitter.heavy_outputs[circ_name], heavy)
+                np.testing.assert_array_equal(
+                    qv_fitter.heavy_output_indices[circ_name],
+                    [int(key, 2) for key in heavy])
+                self.assertAlmostEqual(
+                    qv_fitter.heavy_output_prob_ideal[circ_name],
+                    sum(probs[int(key, 2)] for key in heavy))
+                counts = exp_results[trial].get_counts(circ_name)
+                self.assertEqual(qv_fitter.heavy_output_counts[circ_name],
+                                 sum(counts.get(key, 0) for key in heavy))
+
+    def test_qv_fitter_ideal_circuits(self):
+        """Test the ideal outputs computed by the fitter"""
+        qubit_lists = [[0, 1, 2], [0, 1, 2, 3, 4]]
+        ntrials = 3
+
+        qv_circs, qv_circs_nomeas = qv.qv_circuits(qubit_lists, ntrials,
+                                                   seed=SEED)
+        statevector_backend = qiskit.Aer.get_backend('statevector_simulator')
+        ideal_results = [qiskit.execute(qv_circs_nomeas[trial],
+                                        backend=statevector_backend).result()
+                         for trial in range(ntrials)]
+        qv_fitter = qv.QVFitter(qubit_lists=qubit_lists)
+        qv_fitter.add_statevectors(ideal_results)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for num_processes in [1, 2]:
+                fitter = qv.QVFitter(qubit_lists=qubit_lists)
+                fitter.add_ideal_circuits(qv_circs_nomeas,
+                                          num_processes=num_processes,
+                                          cache_dir=cache_dir)
+                self.assertEqual(fitter.heavy_outputs,
+                                 qv_fitter.heavy_outputs)
+                for circ_name, prob in \
+                        qv_fitter.heavy_output_prob_ideal.items():
+                    self.assertAlmostEqual(
+                        fitter.heavy_output_prob_ideal[circ_name], prob)
+            self.assertEqual(len(os.listdir(cache_dir)),
+                             ntrials * len(qubit_lists))
+
+            # the cached probabilities are loaded without simulation
+            for filename in os.listdir(cache_dir):
+                probs = np.load(os.path.join(cache_dir, filename))
+                np.save(os.path.join(cache_dir, filename),
+                        np.arange(len(probs)) / len(probs))
+            fitter = qv.QVFitter(qubit_lists=qubit_lists)
+            fitter.add_ideal_circuits(qv_circs_nomeas, cache_dir=cache_dir)
+            self.assertEqual(fitter.heavy_outputs['qv_depth_3_trial_0'],
+                             ['100', '101', '110', '111'])
+
+        # circuits with the same name and seed but different content do
+        # not share a cache entry
+        with tempfile.TemporaryDirectory() as cache_dir:
+            circs = [QuantumVolume(4, 4, seed=7),
+                     QuantumVolume(4, 4, seed=7, classical_permutation=False)]
+            self.assertEqual(circs[0].data[0][0].name,
+                             circs[1].data[0][0].name)
+            for index, circ in enumerate(circs):
+                circ.name = 'qv_depth_4_trial_%d' % index
+            fitter = qv.QVFitter(qubit_lists=[[0, 1, 2, 3]])
+            fitter.add_ideal_circuits([circs[0]], cache_dir=cache_dir)
+            fitter.add_ideal_circuits([circs[1]], cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            for circ in circs:
+                np.testing.assert_allclose(
+                    fitter.heavy_output_prob_ideal[circ.name],
+                    np.sum(np.sort(Statevector(circ).probabilities())[8:]))
+
+        with self.assertRaises(qiskit.QiskitError):
+            fitter.add_ideal_circuits(circs[:1])
+        with self.assertRaises(qiskit.QiskitError):
+            qv.QVFitter(qubit_lists=qubit_lists).add_ideal_circuits(qv_circs)
+
+    def test_qv_fitter_add_data(self):
+        """Test adding the results incrementally"""
+        qubit_lists = [[0, 1, 2], [0, 1, 2, 3]]
+        ntrials = 4
+
+        ideal_results, exp_results = qv_circuit_execution(qubit_lists,
+                                                          ntrials,
+                                                          shots=256)
+        qv_fitter = qv.QVFitter(qubit_lists=qubit_lists)
+        qv_fitter.add_statevectors(ideal_results)
+        qv_fitter.add_data(exp_results + exp_results[:2])
+
+        incremental_fitter = qv.QVFitter(qubit_lists=qubit_lists)
+        incremental_fitter.add_statevectors(ideal_results)
+        for result in exp_results:
+            incremental_fitter.add_data(result)
+        incremental_fitter.add_data(exp_results[:2], rerun_fit=False)
+        incremental_fitter.calc_statistics()
+        np.testing.assert_allclose(incremental_fitter.ydata, qv_fitter.ydata)
+        self.assertEqual(incremental_fitter.heavy_output_counts,
+                         qv_fitter.heavy_output_counts)
+        self.assertEqual(incremental_fitter.qv_success(),
+                         qv_fitter.qv_success())
+
+        # the counts of the repeated results are added
+        for trial in range(ntrials):
+            circ_name = 'qv_depth_3_trial_%d' % trial
+            counts = exp_results[trial].get_counts(circ_name)
+            heavy_counts = sum(counts.get(key, 0) for key in
+                               qv_fitter.heavy_outputs[circ_name])
+            self.assertEqual(qv_fitter.heavy_output_counts[circ_name],
+                             heavy_counts * (2 if trial < 2 else 1))
+
+        # processing all the results again gives the same statistics
+        incremental_fitter.calc_data()
+        incremental_fitter.calc_statistics()
+        np.testing.assert_allclose(incremental_fitter.ydata, qv_fitter.ydata)
+
+        with self.assertRaises(qiskit.QiskitError):
+            qv.QVFitter(qubit_lists=qubit_lists).add_data(exp_results)
+
+        # the depths may have different numbers of trials
+        uneven_results = []
+        for trial, result in enumerate(exp_results):
+            result = copy.copy(result)
+            result.results = [qvcirc for qvcirc in result.results
+                              if trial < 2 or
+                              qvcirc.header.name.startswith('qv_depth_3')]
+            uneven_results.append(result)
+        uneven_fitter = qv.QVFitter(qubit_lists=qubit_lists)
+        uneven_fitter.add_statevectors(ideal_results)
+        for result in uneven_results:
+            uneven_fitter.add_data(result)
+        for depthidx, depth in enumerate([3, 4]):
+            depth_trials = ntrials if depth == 3 else 2
+            names = ['qv_depth_%d_trial_%d' % (depth, trial)
+                     for trial in range(depth_trials)]
+            hop = sum(uneven_fitter.heavy_output_counts[name]
+                      for name in names) / (256 * depth_trials)
+            ideal_hop = np.mean([uneven_fitter.heavy_output_prob_ideal[name]
+                                 for name in names])
+            np.testing.assert_allclose(
+                uneven_fitter.ydata[:, depthidx],
+                [hop, (hop * (1 - hop) / depth_trials)**0.5, ideal_hop,
+                 (ideal_hop * (1 - ideal_hop) / depth_trials)**0.5])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2020.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tests for the indexed Clifford tables
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from ddt import ddt, data
+from qiskit.exceptions import QiskitError
+from qiskit.quantum_info import Clifford, Operator, random_clifford
+
+from qiskit.ignis.verification.randomized_benchmarking import (
+    CliffordTable, RBgroup, clifford_table, randomized_benchmarking_seq)
+
+
+@ddt
+class TestCliffordTable(unittest.TestCase):
+    """
+        Test the indexed Clifford tables
+    """
+
+    @data(1, 2)
+    def test_table_size(self, num_qubits):
+        """Test the number of elements and the identity"""
+        table = clifford_table(num_qubits)
+        self.assertEqual(len(table), {1: 24, 2: 11520}[num_qubits])
+        self.assertIs(table, clifford_table(num_qubits))
+        self.assertEqual(table.to_clifford(table.identity()),
+                         Clifford(np.eye(2 * num_qubits)))
+
+    @data(1, 2)
+    def test_group_operations(self, num_qubits):
+        """Test composition, inverse and circuits against Clifford"""
+        table = clifford_table(num_qubits)
+        rng = np.random.default_rng(1234)
+        for _ in range(20):
+            elem = table.random(rng)
+            other = table.random(rng)
+            cliff = table.to_clifford(elem)
+            other_cliff = table.to_clifford(other)
+            self.assertEqual(table.element(cliff), elem)
+            self.assertEqual(table.to_clifford(table.compose(elem, other)),
+                             cliff.compose(other_cliff))
+            self.assertEqual(table.compose(elem, other_cliff),
+                             table.compose(elem, other))
+            self.assertEqual(table.to_clifford(table.inverse(elem)),
+                             cliff.adjoint())
+            self.assertTrue(Operator(table.to_circuit(elem)).equiv(
+                Operator(cliff)))
+            self.assertTrue(Operator(table.inverse_circuit(elem)).equiv(
+                Operator(cliff.adjoint())))
+            self.assertEqual(table.to_circuit(elem), table.to_circuit(elem))
+            random_cliff = random_clifford(num_qubits, seed=rng)
+            self.assertEqual(table.to_clifford(table.element(random_cliff)),
+                             random_cliff)
+
+        first = rng.integers(len(table), size=(3, 4))
+        second = rng.integers(len(table), size=(3, 4))
+        composed = table.compose_indices(first, second)
+        self.assertEqual(composed.shape, (3, 4))
+        for index, other, prod in zip(first.flat, second.flat, composed.flat):
+            self.assertEqual(table.compose(table.element(index),
+                                           table.element(other)).index, prod)
+
+    def test_save_load(self):
+        """Test storing the table on disk"""
+        table = clifford_table(1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'clifford_1q.npz')
+            self.assertIs(clifford_table(1, filename=filename), table)
+            self.assertTrue(os.path.exists(filename))
+            loaded = CliffordTable.load(filename)
+        self.assertEqual(len(loaded), len(table))
+        for index in range(len(table)):
+            self.assertEqual(loaded.to_clifford(index),
+                             table.to_clifford(index))
+
+    def test_unsupported_qubits(self):
+        """Test the supported numbers of qubits"""
+        self.assertRaises(QiskitError, clifford_table, 3)
+
+    def test_rb_group(self):
+        """Test the table backend of RBgroup"""
+        rb_group = RBgroup('Clifford', use_tables=True)
+        elem = rb_group.iden(2)
+        cliff = Clifford(np.eye(4))
+        for seed in range(10):
+            new_elem = rb_group.random(2, seed)
+            elem = rb_group.compose(elem, new_elem)
+            cliff = cliff.compose(Clifford(rb_group.to_circuit(new_elem)))
+        self.assertEqual(Clifford(rb_group.to_circuit(elem)), cliff)
+        self.assertEqual(Clifford(rb_group.inverse(elem)), cliff.adjoint())
+        # larger groups are not tabulated
+        self.assertIsInstance(rb_group.random(3, 0), Clifford)
+
+    def test_cached_circuits_are_copied(self):
+        """Test that editing returned circuits does not change the cache"""
+        table = clifford_table(1)
+        rb_circs = randomized_benchmarking_seq(length_vector=[1, 5],
+                                               rand_seed=1)[0]
+        for index in range(len(table)):
+            elem = table.element(index)
+            for circ in [table.to_circuit(elem), table.inverse_circuit(elem),
+                         RBgroup.to_circuit(elem), RBgroup.inverse(elem)]:
+                circ.x(0)
+        for index in range(len(table)):
+            elem = table.element(index)
+            self.assertTrue(Operator(table.to_circuit(elem)).equiv(
+                Operator(table.to_clifford(elem))))
+            self.assertTrue(Operator(RBgroup.inverse(elem)).equiv(
+                Operator(table.to_clifford(elem).adjoint())))
+        self.assertEqual(randomized_benchmarking_seq(length_vector=[1, 5],
+                                                     rand_seed=1)[0],
+                         rb_circs)
+
+
+if __name__ == '__main__':
+    unittest.main()
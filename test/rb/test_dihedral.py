@@ -16,6 +16,8 @@
 Tests for CNOT-dihedral functions
 """
 
+import os
+import tempfile
 import unittest
 import numpy as np
 from qiskit.circuit import QuantumCircuit
@@ -25,7 +27,10 @@ from qiskit.quantum_info.operators import random
 import qiskit
 # Import the dihedral_utils functions
 from qiskit.ignis.verification.randomized_benchmarking \
-    import CNOTDihedral, random_cnotdihedral
+    import (CNOTDihedral, random_cnotdihedral, compose_cnotdihedral_batch,
+            CNOTDihedralTable, cnotdihedral_table)
+from qiskit.ignis.verification.randomized_benchmarking.dihedral import \
+    decompose_cnotdihedral_2_qubits
 
 
 class TestCNOTDihedral(unittest.TestCase):
@@ -487,6 +492,73 @@ class TestCNOTDihedral(unittest.TestCase):
                 self.assertTrue(value.equiv(target),
                                 'Error: Pauli operator is not the same.')
 
+    def test_compose_batch(self):
+        """Test batched composition against the compose method"""
+        samples = 10
+        nseed = 1111
+        for qubit_num in range(1, 6):
+            elems = [random_cnotdihedral(qubit_num, seed=nseed + i)
+                     for i in range(samples)]
+            others = [random_cnotdihedral(qubit_num, seed=nseed + samples + i)
+                      for i in range(samples)]
+            for front in [False, True]:
+                values = compose_cnotdihedral_batch(elems, others, front=front)
+                targets = [elem.compose(other, front=front)
+                           for elem, other in zip(elems, others)]
+                self.assertEqual(values, targets,
+                                 'Error: batched composition is not the same')
+
+    def test_adjoint_composition(self):
+        """Test that the adjoint is the inverse element"""
+        samples = 10
+        nseed = 1222
+        for qubit_num in range(1, 7):
+            for i in range(samples):
+                elem = random_cnotdihedral(qubit_num, seed=nseed + i)
+                self.assertEqual(elem.compose(elem.adjoint()),
+                                 CNOTDihedral(qubit_num),
+                                 'Error: adjoint is not the inverse')
+                self.assertEqual(elem.adjoint().compose(elem),
+                                 CNOTDihedral(qubit_num),
+                                 'Error: adjoint is not the inverse')
+
+    def test_synthesis_table(self):
+        """Test the synthesis tables against the 1 and 2-qubit decomposition"""
+        samples = 20
+        nseed = 1333
+        for qubit_num, size in [(1, 16), (2, 6144)]:
+            table = cnotdihedral_table(qubit_num)
+            self.assertEqual(len(table), size)
+            self.assertIs(cnotdihedral_table(qubit_num), table)
+            for i in range(samples):
+                elem = random_cnotdihedral(qubit_num, seed=nseed + i)
+                target = decompose_cnotdihedral_2_qubits(elem)
+                self.assertEqual(table.to_circuit(elem), target)
+                self.assertEqual(elem.to_circuit(), target)
+                self.assertTrue(
+                    Operator(table.inverse_circuit(elem)).equiv(
+                        Operator(target).adjoint()),
+                    'Error: inverse circuit is not the inverse')
+                # editing the returned circuits does not change the cache
+                table.to_circuit(elem).x(0)
+                table.inverse_circuit(elem).x(0)
+                self.assertEqual(table.to_circuit(elem), target)
+                self.assertEqual(table.inverse_circuit(elem), target.inverse())
+
+    def test_synthesis_table_build(self):
+        """Test that the packaged synthesis tables match the built tables"""
+        for qubit_num in [1, 2]:
+            table = CNOTDihedralTable.build(qubit_num)
+            packaged = cnotdihedral_table(qubit_num)
+            np.testing.assert_array_equal(table._keys, packaged._keys)
+            np.testing.assert_array_equal(table._gates, packaged._gates)
+            with tempfile.TemporaryDirectory() as tmpdir:
+                filename = os.path.join(tmpdir, 'table.npz')
+                table.save(filename)
+                loaded = CNOTDihedralTable.load(filename)
+            np.testing.assert_array_equal(table._keys, loaded._keys)
+            np.testing.assert_array_equal(table._gates, loaded._gates)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -20,6 +20,7 @@ Test the fitters
 
 import os
 import unittest
+from unittest import mock
 from test.utils import load_results_from_json
 import json
 
@@ -27,6 +28,9 @@ import numpy as np
 
 from qiskit.ignis.verification.randomized_benchmarking import \
     RBFitter, InterleavedRBFitter, PurityRBFitter, CNOTDihedralRBFitter
+from qiskit.ignis.verification.randomized_benchmarking import \
+    fitters as rb_fitters
+from qiskit.ignis.verification.tomography import marginal_counts
 
 
 class TestFitters(unittest.TestCase):
@@ -101,6 +105,222 @@ class TestFitters(unittest.TestCase):
             self.compare_results_and_excpected(ydata, tst_expected_results['ydata'], tst_index)
             self.compare_results_and_excpected(fit, tst_expected_results['fit'], tst_index)
 
+    def test_raw_data(self):
+        """ Test the raw data of simultaneous patterns """
+        results_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_results_1.json'))
+        xdata = np.array([[1, 21, 41, 61, 81, 101, 121, 141, 161, 181],
+                          [2, 42, 82, 122, 162, 202, 242, 282, 322, 362]])
+        rb_pattern = [[0, 1], [2]]
+        rb_fit = RBFitter(results_list, xdata, rb_pattern)
+
+        raw_data = rb_fit.raw_data
+        self.assertEqual(raw_data.shape, (2, len(rb_fit.seeds), 10))
+        for seedidx, seed in enumerate(rb_fit.seeds):
+            for k in range(10):
+                counts = {}
+                for result in results_list:
+                    name = 'rb_length_%d_seed_%d' % (k, seed)
+                    if any(exp.header.name == name for exp in result.results):
+                        for key, val in result.get_counts(name).items():
+                            counts[key] = counts.get(key, 0) + val
+                shots = sum(counts.values())
+                for patt_ind, qubits in enumerate([[0, 1], [2]]):
+                    marginal = marginal_counts(counts, qubits)
+                    self.assertAlmostEqual(
+                        raw_data[patt_ind, seedidx, k],
+                        marginal.get('0' * len(qubits), 0) / shots)
+        np.testing.assert_allclose(rb_fit.ydata[0]['mean'],
+                                   np.mean(raw_data[0], axis=0))
+        np.testing.assert_allclose(rb_fit.ydata[1]['std'],
+                                   np.std(raw_data[1], axis=0))
+
+    def test_purity_raw_data(self):
+        """ Test the purities against the Z-correlators of the counts """
+        purity_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_purity_results.json'))
+        xdata = np.array([[1, 21, 41, 61, 81, 101, 121, 141, 161, 181]])
+        rbfit_purity = PurityRBFitter(purity_list, 9, xdata, [[0, 1]])
+
+        for seedidx, seed in enumerate(rbfit_purity.seeds):
+            for k in range(10):
+                # the correlators of each Pauli, with I for unused qubits
+                corr = {}
+                for result in purity_list:
+                    name = result.results[0].header.name
+                    if not name.endswith('_length_0_seed_%d' % seed):
+                        continue
+                    name = name.replace('_length_0', '_length_%d' % k)
+                    bases = name.split('_')[2]
+                    counts = result.get_counts(name)
+                    shots = sum(counts.values())
+                    for used in range(4):
+                        label = ''.join(basis if used >> q & 1 else 'I'
+                                        for q, basis in enumerate(bases))
+                        value = sum(
+                            val * (-1) ** bin(int(key, 2) & used).count('1')
+                            for key, val in counts.items()) / shots
+                        corr.setdefault(label, []).append(value)
+                self.assertEqual(len(corr), 16)
+                purity = sum(np.mean(vals) ** 2 for vals in corr.values()) / 4
+                self.assertAlmostEqual(rbfit_purity.raw_data[0, seedidx, k],
+                                       purity)
+
+    def test_add_data(self):
+        """ Test adding results one at a time against a full recompute """
+        results_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_results_1.json'))
+        xdata = np.array([[1, 21, 41, 61, 81, 101, 121, 141, 161, 181],
+                          [2, 42, 82, 122, 162, 202, 242, 282, 322, 362]])
+        rb_pattern = [[0, 1], [2]]
+        rb_fit = RBFitter(results_list[:1], xdata, rb_pattern)
+        rb_fit.warm_start = True
+        for result in results_list[1:]:
+            rb_fit.add_data(result)
+        rb_fit_full = RBFitter(results_list, xdata, rb_pattern)
+
+        np.testing.assert_allclose(rb_fit.raw_data, rb_fit_full.raw_data)
+        for patt_ind in range(len(rb_pattern)):
+            np.testing.assert_allclose(rb_fit.ydata[patt_ind]['mean'],
+                                       rb_fit_full.ydata[patt_ind]['mean'])
+            np.testing.assert_allclose(rb_fit.ydata[patt_ind]['std'],
+                                       rb_fit_full.ydata[patt_ind]['std'])
+            self.assertAlmostEqual(rb_fit.fit[patt_ind]['epc'],
+                                   rb_fit_full.fit[patt_ind]['epc'], places=4)
+
+        # purity seeds are incomplete until all their circuits are added
+        purity_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_purity_results.json'))
+        xdata = np.array([[1, 21, 41, 61, 81, 101, 121, 141, 161, 181],
+                          [1, 21, 41, 61, 81, 101, 121, 141, 161, 181]])
+        rb_pattern = [[0, 1], [2, 3]]
+        rbfit_purity = PurityRBFitter(purity_list[:13], 9, xdata, rb_pattern)
+        self.assertTrue(np.all(np.isnan(rbfit_purity.raw_data[:, 1])))
+        rbfit_purity.add_data(purity_list[13:])
+        rbfit_purity_full = PurityRBFitter(purity_list, 9, xdata, rb_pattern)
+        np.testing.assert_allclose(rbfit_purity.raw_data,
+                                   rbfit_purity_full.raw_data)
+        for patt_ind in range(len(rb_pattern)):
+            np.testing.assert_allclose(
+                rbfit_purity.ydata[patt_ind]['mean'],
+                rbfit_purity_full.ydata[patt_ind]['mean'])
+
+    def test_wrapper_add_data(self):
+        """ Test that the wrapper fitters fit their inner fitters once """
+        original_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_original_results.json'))
+        interleaved_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_interleaved_results.json'))
+        xdata = np.array([[1, 11, 21, 31, 41, 51, 61, 71, 81, 91],
+                          [3, 33, 63, 93, 123, 153, 183, 213, 243, 273]])
+        rb_pattern = [[0, 2], [1]]
+        joint_rb_fit = InterleavedRBFitter(original_list[:1], interleaved_list[:1],
+                                           xdata, rb_pattern)
+        joint_rb_fit.warm_start = True
+        self.assertTrue(joint_rb_fit.rbfit_std.warm_start)
+        self.assertTrue(joint_rb_fit.rbfit_int.warm_start)
+
+        with mock.patch.object(RBFitter, 'fit_data',
+                               autospec=True,
+                               side_effect=RBFitter.fit_data) as fit_data:
+            joint_rb_fit.add_data(original_list[1:], interleaved_list[1:])
+        self.assertEqual(fit_data.call_count, 2)
+
+        joint_rb_fit_full = InterleavedRBFitter(original_list, interleaved_list,
+                                                xdata, rb_pattern)
+        for fit, expected in zip(joint_rb_fit.fit_int, joint_rb_fit_full.fit_int):
+            self.assertAlmostEqual(fit['epc_est'], expected['epc_est'], places=4)
+
+    def test_batch_fit(self):
+        """ Test fitting all the patterns together in a batch """
+        results_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_results_1.json'))
+        xdata = np.array([[1, 21, 41, 61, 81, 101, 121, 141, 161, 181],
+                          [2, 42, 82, 122, 162, 202, 242, 282, 322, 362]])
+        rb_pattern = [[0, 1], [2]]
+        rb_fit = RBFitter(results_list, xdata, rb_pattern)
+        expected_fit = rb_fit.fit
+        rb_fit.batch_fit = True
+        for num_processes in [1, 2]:
+            rb_fit.num_processes = num_processes
+            rb_fit.fit_data()
+            for fit, expected in zip(rb_fit.fit, expected_fit):
+                np.testing.assert_allclose(fit['params'], expected['params'],
+                                           rtol=1e-5)
+                np.testing.assert_allclose(fit['params_err'],
+                                           expected['params_err'], rtol=1e-4)
+                self.assertAlmostEqual(fit['epc'], expected['epc'], places=6)
+                self.assertAlmostEqual(fit['epc_err'], expected['epc_err'],
+                                       places=6)
+
+        original_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_original_results.json'))
+        interleaved_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_interleaved_results.json'))
+        xdata = np.array([[1, 11, 21, 31, 41, 51, 61, 71, 81, 91],
+                          [3, 33, 63, 93, 123, 153, 183, 213, 243, 273]])
+        rb_pattern = [[0, 2], [1]]
+        joint_rb_fit = InterleavedRBFitter(original_list, interleaved_list,
+                                           xdata, rb_pattern)
+        expected_fit = joint_rb_fit.fit_int
+        joint_rb_fit.batch_fit = True
+        joint_rb_fit.fit_data()
+        for fit, expected in zip(joint_rb_fit.fit_int, expected_fit):
+            self.assertAlmostEqual(fit['epc_est'], expected['epc_est'], places=6)
+            self.assertAlmostEqual(fit['epc_est_err'], expected['epc_est_err'],
+                                   places=6)
+
+    def test_bootstrap(self):
+        """ Test the bootstrap confidence intervals """
+        results_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_results_1.json'))
+        xdata = np.array([[1, 21, 41, 61, 81, 101, 121, 141, 161, 181],
+                          [2, 42, 82, 122, 162, 202, 242, 282, 322, 362]])
+        rb_fit = RBFitter(results_list, xdata, [[0, 1], [2]])
+
+        bootstrap = rb_fit.bootstrap(200, seed=7)
+        self.assertEqual(len(bootstrap), 2)
+        for patt_ind, patt_bootstrap in enumerate(bootstrap):
+            np.testing.assert_array_equal(patt_bootstrap['percentiles'],
+                                          [2.5, 50, 97.5])
+            self.assertEqual(len(patt_bootstrap['epc_samples']), 200)
+            low, _, high = patt_bootstrap['epc']
+            self.assertLess(low, rb_fit.fit[patt_ind]['epc'])
+            self.assertGreater(high, rb_fit.fit[patt_ind]['epc'])
+
+        # the samples depend only on the seed
+        for num_processes in [1, 2]:
+            same = rb_fit.bootstrap(200, seed=7, num_processes=num_processes)
+            for patt_ind in range(2):
+                np.testing.assert_array_equal(same[patt_ind]['epc_samples'],
+                                              bootstrap[patt_ind]['epc_samples'])
+
+        # resampling only the seeds is centered on the fit
+        bootstrap = rb_fit.bootstrap(200, percentiles=[50],
+                                     resample_shots=False, seed=7)
+        for patt_ind in range(2):
+            self.assertAlmostEqual(bootstrap[patt_ind]['epc'][0],
+                                   rb_fit.fit[patt_ind]['epc'], places=3)
+
+        # the purity fits start from the fitted decay of the squared purity
+        purity_list = load_results_from_json(
+            os.path.join(os.path.dirname(__file__), 'test_fitter_purity_results.json'))
+        xdata = np.array([[1, 21, 41, 61, 81, 101, 121, 141, 161, 181],
+                          [1, 21, 41, 61, 81, 101, 121, 141, 161, 181]])
+        rbfit_purity = PurityRBFitter(purity_list, 9, xdata, [[0, 1], [2, 3]])
+        with mock.patch.object(rb_fitters, '_fit_exponential_parallel',
+                               side_effect=rb_fitters._fit_exponential_parallel) \
+                as fit_exponential:
+            bootstrap = rbfit_purity.bootstrap(20, seed=7)
+        fit_guess = fit_exponential.call_args[0][3]
+        for patt_ind in range(2):
+            np.testing.assert_allclose(
+                fit_guess[20 * patt_ind:20 * (patt_ind + 1), 1],
+                rbfit_purity.fit[patt_ind]['params'][1] ** 2)
+            low, _, high = bootstrap[patt_ind]['pepc']
+            self.assertLessEqual(low, rbfit_purity.fit[patt_ind]['pepc'] + 1e-6)
+            self.assertGreaterEqual(high, rbfit_purity.fit[patt_ind]['pepc'])
+
     def test_interleaved_fitters(self):
         """ Test the interleaved fitters """
 
@@ -1009,6 +1009,159 @@ class TestRB(unittest.TestCase):
                                           rb_cnotdihedral_interleaved_X_circs[seed][circ_index],
                                           num_qubits, rb_opts, vec_len)
 
+    @data(1, 2, 3)
+    def test_rb_basis_gates(self, num_qubits):
+        """RB sequences emitted in a set of basis gates"""
+        basis_gates = ['rz', 'sx', 'x', 'cx']
+        rb_circs, _, rb_interleaved_circs = rb.randomized_benchmarking_seq(
+            nseeds=2, length_vector=[1, 4],
+            rb_pattern=[list(range(num_qubits))],
+            interleaved_elem=[qiskit.quantum_info.random_clifford(
+                num_qubits, seed=10)],
+            rand_seed=1234, basis_gates=basis_gates)
+        for circ in itertools.chain(*rb_circs, *rb_interleaved_circs):
+            self.assertTrue(
+                set(circ.count_ops()).issubset(basis_gates + ['barrier', 'measure']),
+                'Error: gates outside of the basis gates')
+            op = qiskit.quantum_info.Operator(
+                circ.remove_final_measurements(inplace=False))
+            self.assertTrue(op.equiv(np.eye(2 ** op.num_qubits)),
+                            'Error: sequence is not the identity')
+
+        # the group elements are translated once per basis
+        group = rb.RBgroup('Clifford', use_tables=True)
+        elem = group.random(num_qubits, 7)
+        # pylint: disable=protected-access
+        self.assertIs(group._to_circuit(elem, basis_gates),
+                      group._to_circuit(elem, list(reversed(basis_gates))))
+        # editing the returned circuits does not change the cache
+        circ = group.to_circuit(elem, basis_gates)
+        inv_circ = group.inverse(elem, basis_gates)
+        size = len(circ.data)
+        circ.x(0)
+        inv_circ.x(0)
+        self.assertEqual(len(group.to_circuit(elem, basis_gates).data), size)
+        self.assertEqual(group.to_circuit(elem, basis_gates),
+                         group._to_circuit(elem, basis_gates))
+        self.assertTrue(qiskit.quantum_info.Operator(
+            group.inverse(elem, basis_gates)).equiv(
+                qiskit.quantum_info.Operator(group.inverse(elem))))
+        self.assertTrue(qiskit.quantum_info.Operator(
+            group.inverse(elem, basis_gates)).equiv(
+                qiskit.quantum_info.Operator(group.inverse(elem))))
+
+    @data('Clifford', 'CNOT-Dihedral')
+    def test_rb_seed_offset(self, group_gates):
+        """RB seeds are independent of the other seeds and of the processes"""
+        rb_opts = {'length_vector': [1, 3], 'rb_pattern': [[0, 1], [2]],
+                   'group_gates': group_gates, 'rand_seed': 100}
+        rb_circs = rb.randomized_benchmarking_seq(nseeds=3, **rb_opts)[0]
+        rb_circs_offset = rb.randomized_benchmarking_seq(
+            nseeds=2, seed_offset=1, **rb_opts)[0]
+        rb_circs_parallel = rb.randomized_benchmarking_seq(
+            nseeds=3, num_processes=2, **rb_opts)[0]
+        self.assertEqual(rb_circs[1:], rb_circs_offset,
+                         'Error: seed_offset does not reproduce the seeds')
+        self.assertEqual(rb_circs, rb_circs_parallel,
+                         'Error: parallel seeds are not reproduced')
+
+    def test_iter_randomized_benchmarking_seq(self):
+        """Streaming RB circuits of the requested families"""
+        rb_opts = {'nseeds': 2, 'length_vector': [1, 3, 5],
+                   'rb_pattern': [[0, 1]], 'group_gates': 'CNOT-Dihedral',
+                   'interleaved_elem': [rb.random_cnotdihedral(2, seed=5)],
+                   'rand_seed': 10}
+        rb_circs, _, rb_cnotdihedral_circs, _, _ = \
+            rb.randomized_benchmarking_seq(**rb_opts)
+        streamed = list(rb.iter_randomized_benchmarking_seq(
+            families=['rb', 'cnotdihedral'], **rb_opts))
+        self.assertEqual([(seed, length_index) for seed, length_index, _
+                          in streamed],
+                         [(seed, length_index) for seed in range(2)
+                          for length_index in range(3)])
+        for seed, length_index, circs in streamed:
+            self.assertEqual(sorted(circs), ['cnotdihedral', 'rb'])
+            self.assertEqual(circs['rb'], rb_circs[seed][length_index])
+            self.assertEqual(circs['cnotdihedral'],
+                             rb_cnotdihedral_circs[seed][length_index])
+
+        # purity circuits are streamed per sequence
+        purity_circs, _, npurity = rb.randomized_benchmarking_seq(
+            nseeds=1, length_vector=[1, 2], rb_pattern=[[0], [1]],
+            is_purity=True, rand_seed=3)
+        for seed, length_index, circs in rb.iter_randomized_benchmarking_seq(
+                nseeds=1, length_vector=[1, 2], rb_pattern=[[0], [1]],
+                is_purity=True, rand_seed=3):
+            self.assertEqual(len(circs['purity']), npurity)
+            for d in range(npurity):
+                self.assertEqual(circs['purity'][d],
+                                 purity_circs[seed][d][length_index])
+
+        with self.assertRaises(ValueError):
+            next(rb.iter_randomized_benchmarking_seq(families=['interleaved']))
+
+    @data(False, True)
+    def test_plan_rb_layers(self, isolated):
+        """Layers of non-conflicting patterns of a coupling map"""
+        # a 3x4 grid
+        coupling_map = [[q, q + 1] for q in range(12) if q % 4 != 3] + \
+            [[q + 4, q] for q in range(8)]
+        edges = {tuple(sorted(edge)) for edge in coupling_map}
+        for pattern_size in [1, 2]:
+            layers = rb.plan_rb_layers(coupling_map, pattern_size,
+                                       isolated=isolated)
+            patterns = [tuple(pat) for layer in layers for pat in layer]
+            if pattern_size == 1:
+                self.assertEqual(sorted(patterns), [(q,) for q in range(12)])
+            else:
+                self.assertEqual(sorted(patterns), sorted(edges))
+            for layer in layers:
+                rb.randomized_benchmarking_seq(rb_pattern=layer,
+                                               length_vector=[1])
+                if isolated:
+                    for pat, other in itertools.permutations(layer, 2):
+                        self.assertFalse(
+                            any(tuple(sorted((q, r))) in edges
+                                for q in pat for r in other),
+                            'Error: patterns of a layer are coupled')
+        self.assertEqual(len(rb.plan_rb_layers(coupling_map, 1)), 1)
+        self.assertEqual(rb.plan_rb_layers(coupling_map, 2, qubits=[0, 1, 2]),
+                         [[[0, 1]], [[1, 2]]])
+        with self.assertRaises(ValueError):
+            rb.plan_rb_layers(coupling_map, 3)
+
+    @data('Clifford', 'CNOT-Dihedral')
+    def test_device_randomized_benchmarking_seq(self, group_gates):
+        """Device-scale RB sequences return the identity"""
+        rb_opts = {'length_vector': [1, 3], 'rb_pattern': [[0, 3], [2], [1]],
+                   'length_multiplier': [1, 2, 2], 'align_cliffs': True,
+                   'group_gates': group_gates, 'rand_seed': 100}
+        outputs = rb.device_randomized_benchmarking_seq(nseeds=3, **rb_opts)
+        expected = rb.randomized_benchmarking_seq(nseeds=3, **rb_opts)
+        self.assertEqual(len(outputs), len(expected))
+        np.testing.assert_array_equal(outputs[1], expected[1])
+        for circs, expected_circs in zip(outputs[:1] + outputs[2:],
+                                         expected[:1] + expected[2:]):
+            for circ, expected_circ in zip(itertools.chain(*circs),
+                                           itertools.chain(*expected_circs)):
+                self.assertEqual(circ.name, expected_circ.name)
+                self.assertEqual(circ.num_qubits, expected_circ.num_qubits)
+        for circ in itertools.chain(*outputs[0]):
+            op = qiskit.quantum_info.Operator(
+                circ.remove_final_measurements(inplace=False))
+            self.assertTrue(op.equiv(np.eye(2 ** op.num_qubits)),
+                            'Error: sequence is not the identity')
+
+        # the seeds are reproduced with an offset and in parallel
+        self.assertEqual(
+            rb.device_randomized_benchmarking_seq(
+                nseeds=2, seed_offset=1, **rb_opts)[0],
+            outputs[0][1:])
+        self.assertEqual(
+            rb.device_randomized_benchmarking_seq(
+                nseeds=3, num_processes=2, **rb_opts)[0],
+            outputs[0])
+
 
 class TestRBUtils(unittest.TestCase):
     """Test for RB utilities."""
@@ -1083,6 +1236,65 @@ class TestRBUtils(unittest.TestCase):
 
         self.assertAlmostEqual(gpc[0]['fake_gate'], 0)
 
+    def test_gates_per_clifford_num_processes(self):
+        """Test gate per Clifford of seeds counted in parallel."""
+        num_gates = [[6, 7, 5, 8], [10, 12, 8, 14]]
+        clifford_lengths = np.array([4, 8])
+        basis = ['u1', 'u2', 'u3', 'cx']
+
+        circs_list = [self.create_fake_circuits(num_gates),
+                      self.create_fake_circuits(num_gates[::-1])]
+        gpc = rb.rb_utils.gates_per_clifford(transpiled_circuits_list=circs_list,
+                                             clifford_lengths=clifford_lengths,
+                                             basis=basis, qubits=[0, 1])
+        gpc_parallel = rb.rb_utils.gates_per_clifford(
+            transpiled_circuits_list=circs_list, clifford_lengths=clifford_lengths,
+            basis=basis, qubits=[0, 1], num_processes=2)
+        self.assertEqual(gpc, gpc_parallel)
+
+        ncliffs = 2 * np.sum(clifford_lengths + 1)
+        self.assertAlmostEqual(gpc[1]['cx'],
+                               2 * (num_gates[0][3] + num_gates[1][3]) / ncliffs)
+        self.assertAlmostEqual(gpc[1]['u1'], 0)
+
+    def test_gates_per_clifford_from_group(self):
+        """Test expected gate per Clifford from the group tables."""
+        clifford_lengths = np.array([1, 10, 20])
+        gpc = rb.gates_per_clifford_from_group(clifford_lengths, qubits=[3])
+
+        # average over the decompositions of the 24 Cliffords
+        table = rb.clifford_table(1)
+        counts = {}
+        for index in range(len(table)):
+            for length, circuit in ((np.sum(clifford_lengths), table.to_circuit(index)),
+                                    (len(clifford_lengths), table.inverse_circuit(index))):
+                for instr, _, _ in circuit.data:
+                    counts[instr.name] = counts.get(instr.name, 0) + length
+        self.assertEqual(set(gpc[3]), set(counts))
+        for name, count in counts.items():
+            self.assertAlmostEqual(gpc[3][name],
+                                   count / len(table) / np.sum(clifford_lengths + 1))
+
+        # the counts of the table gate codes match the counts of the circuits
+        gpc = rb.gates_per_clifford_from_group(clifford_lengths, qubits=[0, 1],
+                                               group_gates='CNOT-Dihedral')
+        basis = sorted(gpc[0])
+        gpc_circuits = rb.gates_per_clifford_from_group(
+            clifford_lengths, qubits=[0, 1], basis=basis,
+            group_gates='CNOT-Dihedral', num_samples=500, seed=3)
+        gpc_samples = rb.gates_per_clifford_from_group(
+            clifford_lengths, qubits=[0, 1], group_gates='CNOT-Dihedral',
+            num_samples=500, seed=3)
+        for qubit in [0, 1]:
+            for name in basis:
+                self.assertAlmostEqual(gpc_circuits[qubit][name],
+                                       gpc_samples[qubit][name])
+                self.assertAlmostEqual(gpc_samples[qubit][name],
+                                       gpc[qubit][name], delta=0.2)
+
+        with self.assertRaises(QiskitError):
+            rb.gates_per_clifford_from_group(clifford_lengths, qubits=[0, 1, 2])
+
     def test_calculate_1q_epg(self):
         """Test calculating EPGs of single qubit gates."""
         gpc = {0: {'cx': 0, 'u1': 0.1, 'u2': 0.3, 'u3': 0.5}}